@@ -1,27 +1,32 @@
+import multiprocessing
 import sys
 import traceback
 
-print("🔧 [INFO] Iniciando o editor de spritesheets...")
+# Sem a guarda, os processos de exportação (spawn) reabririam a janela ao importar este arquivo
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
 
-try:
-    print("🎨 Carregando interface gráfica...")
-    from PySide6.QtWidgets import QApplication
+    print("🔧 [INFO] Iniciando o editor de spritesheets...")
 
-    print("🧠 Importando módulos principais...")
-    from src.app import SpritesheetApp
+    try:
+        print("🎨 Carregando interface gráfica...")
+        from PySide6.QtWidgets import QApplication
 
-    print("⚙️ Iniciando aplicação...")
-    app = QApplication(sys.argv)
+        print("🧠 Importando módulos principais...")
+        from src.app import SpritesheetApp
 
-    print("🖥️ Abrindo janela principal...")
-    window = SpritesheetApp()
-    window.show()
+        print("⚙️ Iniciando aplicação...")
+        app = QApplication(sys.argv)
 
-    print("▶️ Executando loop da aplicação...\n")
-    sys.exit(app.exec())
+        print("🖥️ Abrindo janela principal...")
+        window = SpritesheetApp()
+        window.show()
 
-except Exception as e:
-    print(f"❌ [ERRO CRÍTICO] {str(e)}")
-    print("🧾 Detalhes do erro:\n")
-    traceback.print_exc()
-    sys.exit(1)
+        print("▶️ Executando loop da aplicação...\n")
+        sys.exit(app.exec())
+
+    except Exception as e:
+        print(f"❌ [ERRO CRÍTICO] {str(e)}")
+        print("🧾 Detalhes do erro:\n")
+        traceback.print_exc()
+        sys.exit(1)
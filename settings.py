@@ -1 +1,29 @@
+# settings.py
 
+# Canvas usado pelo editor: "widget" (QWidget clássico) ou "graphics" (QGraphicsView,
+# indicado para milhares de seleções)
+CANVAS_BACKEND = "widget"
+
+# Escalas geradas a cada exportação; escalas diferentes de 1 viram 'nome@0.5x.png'
+EXPORT_SCALES = [1.0]
+
+# Compressão das exportações em .dds: "bc1" (sem alfa parcial), "bc3" ou "bc7" (melhor qualidade)
+DDS_FORMAT = "bc3"
+
+# Grava junto da spritesheet os metadados dos frames: 'sheet.json' (formato do
+# TexturePacker) e o índice binário 'sheet.atlas' (busca por nome em O(1) via mmap)
+EXPORT_ATLAS = True
+
+# Duração de cada frame, em ms, nas exportações animadas (.apng ou .gif)
+ANIMATION_FRAME_MS = 100
+
+# Memória máxima do histórico de desfazer/refazer, em MB
+HISTORY_MAX_MB = 64
+
+# Recorta cada frame aos pixels visíveis (após a remoção de fundo) antes de alinhar,
+# para que a área transparente da seleção não desloque o alinhamento
+EXPORT_TRIM = False
+
+# Processos usados para recortar e processar os frames na exportação:
+# None = número de CPUs, 1 = tudo em série no processo do editor
+EXPORT_WORKERS = None
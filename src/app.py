@@ -4,17 +4,23 @@ from PySide6.QtWidgets import (
     QMainWindow, QFileDialog, QMessageBox, QWidget, QHBoxLayout, QScrollArea
 )
 from PySide6.QtGui import QPixmap
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 import os
 import logging
 
+from settings import CANVAS_BACKEND, EXPORT_SCALES, DDS_FORMAT, HISTORY_MAX_MB, EXPORT_WORKERS, EXPORT_TRIM, ANIMATION_FRAME_MS, EXPORT_ATLAS
+
 print("🧠 [INFO] Carregando módulo: App...")
 logging.basicConfig(level=logging.INFO)
 
 
 class SpritesheetApp(QMainWindow):
-    def __init__(self):
+    def __init__(self, canvas_backend=None):
+        """
+        :param canvas_backend: "widget" ou "graphics"; padrão CANVAS_BACKEND de settings.py
+        """
         super().__init__()
+        self.canvas_backend = canvas_backend or CANVAS_BACKEND
 
         self.setWindowTitle("Editor de Spritesheets 🎮🖼️")
         self.setGeometry(100, 100, 1200, 800)
@@ -24,6 +30,15 @@ class SpritesheetApp(QMainWindow):
         # Atributos principais
         self.image_path = None
         self.pixmap = None
+        self.last_export_path = None  # Reexportado no modo observação
+        self.source_fingerprint = None  # Reaproveitado ao salvar o projeto
+
+        # Modo observação: polling da imagem aberta
+        self.recorder = None  # Gravação de interações para medir latência
+        self.watcher = None
+        self.watch_timer = QTimer(self)
+        self.watch_timer.setInterval(100)
+        self.watch_timer.timeout.connect(self.poll_watched_files)
 
         # Componentes
         self.sidebar = None
@@ -33,30 +48,42 @@ class SpritesheetApp(QMainWindow):
         self.init_ui()
 
     def init_ui(self):
-        from src.ui.canvas import Canvas
         from src.ui.sidebar import Sidebar
 
         # Primeiro criamos a Sidebar sem referência ao Canvas
         self.sidebar = Sidebar(canvas=None)
 
         # Agora criamos o Canvas com referência à Sidebar
-        self.canvas = Canvas(sidebar=self.sidebar, parent=self)
+        if self.canvas_backend == "graphics":
+            from src.ui.graphics_canvas import GraphicsCanvas
+            self.canvas = GraphicsCanvas(sidebar=self.sidebar, parent=self)
+        else:
+            from src.ui.canvas import Canvas
+            self.canvas = Canvas(sidebar=self.sidebar, parent=self)
 
         # Conectamos a Sidebar ao Canvas após ambos serem criados
         self.sidebar.canvas = self.canvas
+        self.canvas.history.max_bytes = HISTORY_MAX_MB * 1024 * 1024
 
         # Layout principal
         main_layout = QHBoxLayout()
         main_layout.setSpacing(0)
         main_layout.setContentsMargins(0, 0, 0, 0)
 
-        # Área de scroll apenas para o Canvas
-        scroll_area = QScrollArea()
-        scroll_area.setWidget(self.canvas)
-        scroll_area.setWidgetResizable(True)  # Permite rolagem dinâmica
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        scroll_area.setStyleSheet("border: none;")
+        # Área de scroll apenas para o Canvas (o QGraphicsView já rola sozinho)
+        if self.canvas_backend == "graphics":
+            scroll_area = self.canvas
+        else:
+            scroll_area = QScrollArea()
+            scroll_area.setWidget(self.canvas)
+            scroll_area.setWidgetResizable(True)  # Permite rolagem dinâmica
+            scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+            scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+            scroll_area.setStyleSheet("border: none;")
+
+        # HUD de desempenho sobreposto à área do canvas (F3)
+        from src.ui.performance_hud import PerformanceHud
+        self.hud = PerformanceHud(parent=scroll_area)
 
         # Adiciona widgets ao layout
         main_layout.addWidget(scroll_area, stretch=3)   # Canvas com scroll
@@ -80,14 +107,39 @@ class SpritesheetApp(QMainWindow):
         open_action = file_menu.addAction("📂 Abrir Imagem")
         open_action.triggered.connect(self.open_image_dialog)
 
+        import_folder_action = file_menu.addAction("🗂️ Montar Spritesheet de uma Pasta")
+        import_folder_action.triggered.connect(self.import_folder_dialog)
+
         save_action = file_menu.addAction("💾 Salvar Spritesheet")
         save_action.triggered.connect(self.save_spritesheet)
 
         file_menu.addSeparator()
 
+        open_project_action = file_menu.addAction("🗃️ Abrir Projeto")
+        open_project_action.triggered.connect(self.open_project_dialog)
+
+        save_project_action = file_menu.addAction("🗃️ Salvar Projeto")
+        save_project_action.triggered.connect(self.save_project_dialog)
+
+        self.watch_action = file_menu.addAction("👀 Modo Observação")
+        self.watch_action.setCheckable(True)
+        self.watch_action.toggled.connect(self.toggle_watch_mode)
+
+        self.record_action = file_menu.addAction("⏺️ Gravar Interações")
+        self.record_action.setCheckable(True)
+        self.record_action.toggled.connect(self.toggle_interaction_recording)
+
+        file_menu.addSeparator()
+
         exit_action = file_menu.addAction("❌ Sair")
         exit_action.triggered.connect(self.close)
 
+        view_menu = menu_bar.addMenu("🔍 Exibir")
+
+        hud_action = view_menu.addAction("📊 HUD de Desempenho")
+        hud_action.setShortcut("F3")
+        hud_action.triggered.connect(self.hud.toggle)
+
     def open_image_dialog(self):
         print("📂 [AÇÃO] Abrindo diálogo para selecionar imagem...")
         image_dir = os.path.join(os.getcwd(), "assets", "images")
@@ -112,7 +164,88 @@ class SpritesheetApp(QMainWindow):
         self.canvas.set_background(pixmap)
         self.setWindowTitle(f"Editor de Spritesheets - {os.path.basename(path)} 🎮🖼️")
         self.canvas.clear_selections()
+        self.canvas.history.clear()  # O histórico pertence à imagem anterior
         self.sidebar.update_status()
+        self.last_export_path = None
+        self.source_fingerprint = None
+
+        if self.watcher is not None:
+            from src.logic.watcher import FileWatcher
+            self.watcher = FileWatcher([path])
+
+    def open_project_dialog(self):
+        from src.logic.project import PROJECT_EXTENSION
+
+        file_name, _ = QFileDialog.getOpenFileName(
+            self,
+            "Abrir Projeto",
+            os.path.join(os.getcwd(), "output"),
+            f"Projeto SpriteMaster (*{PROJECT_EXTENSION})"
+        )
+        if file_name:
+            self.open_project(file_name)
+
+    def open_project(self, path):
+        """
+        Abre a imagem do projeto e restaura seleções e configurações.
+        As caixas de conteúdo salvas só são reaproveitadas se a origem e o recorte não mudaram.
+        """
+        from src.logic.project import load_project, current_fingerprint, derived_key
+
+        try:
+            project = load_project(path)
+            fingerprint = current_fingerprint(project["source"], project["fingerprint"])
+        except (OSError, ValueError) as e:
+            self.show_error(f"Erro ao abrir projeto:\n{e}")
+            return
+
+        self.load_image(project["source"])
+        if self.image_path != project["source"]:
+            return
+
+        if fingerprint["digest"] != project["fingerprint"]["digest"]:
+            logging.warning("⚠️ A imagem de origem mudou desde que o projeto foi salvo.")
+        derived_valid = derived_key(
+            fingerprint["digest"], project["remove_background"], project["bg_color"], project["erase_mask"]
+        ) == project["derived_key"]
+
+        self.canvas.apply_project_state(project, derived_valid=derived_valid)
+        self.canvas.history.clear()
+        self.source_fingerprint = fingerprint
+        print(f"🗃️ Projeto aberto: {path} ({len(project['rects'])} frames)")
+
+    def save_project_dialog(self):
+        from src.logic.project import PROJECT_EXTENSION
+
+        if not self.image_path:
+            self.show_info("Abra uma imagem antes de salvar o projeto.")
+            return
+
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Salvar Projeto",
+            os.path.splitext(self.image_path)[0] + PROJECT_EXTENSION,
+            f"Projeto SpriteMaster (*{PROJECT_EXTENSION})"
+        )
+        if file_path:
+            self.save_project(file_path)
+
+    def save_project(self, path):
+        from src.logic.project import save_project, current_fingerprint, derived_key
+
+        try:
+            self.source_fingerprint = current_fingerprint(self.image_path, self.source_fingerprint)
+            project = self.canvas.project_state()
+            project["source"] = os.path.abspath(self.image_path)
+            project["fingerprint"] = self.source_fingerprint
+            project["derived_key"] = derived_key(
+                self.source_fingerprint["digest"], project["remove_background"],
+                project["bg_color"], project["erase_mask"]
+            )
+            save_project(path, project)
+            print(f"🗃️ Projeto salvo em: {path}")
+        except OSError as e:
+            self.show_error(f"Erro ao salvar projeto:\n{e}")
 
     def save_spritesheet(self):
         selected_rects = self.canvas.selected_rects
@@ -126,33 +259,16 @@ class SpritesheetApp(QMainWindow):
             self,
             "Salvar Spritesheet",
             output_dir,
-            "PNG (*.png)"
+            "PNG (*.png);;DDS comprimido (*.dds);;APNG animado (*.apng);;GIF animado (*.gif)"
         )
 
         if file_path:
             try:
-                from src.logic.exporter import SpriteSheetExporter
-                exporter = SpriteSheetExporter(self.image_path)
-
-                bg_removal_config = self.canvas.get_bg_removal_config()
-                alignment_configs = getattr(self.canvas, "_individual_align_configs", None)
-
-                configs = []
-                for i, rect in enumerate(selected_rects):
-                    config = {
-                        "remove_background": bg_removal_config["remove_background"],
-                        "bg_color": bg_removal_config["bg_color"]
-                    }
-                    if alignment_configs and i < len(alignment_configs):
-                        config["align_config"] = alignment_configs[i]
-                    else:
-                        config["align_config"] = self.canvas.get_alignment_config()
-                    configs.append(config)
-
-                for rect, config in zip(selected_rects, configs):
-                    exporter.add_frame(rect, config)
-
-                success = exporter.export(file_path, layout="horizontal")
+                empty = int((self.canvas.selection_opaque_counts() == 0).sum())
+                if empty:
+                    logging.warning(f"⚠️ {empty} frame(s) selecionado(s) sem pixels visíveis.")
+
+                success = self.export_selections(file_path)
                 if success:
                     print(f"✅ Spritesheet salva em: {file_path}")
                     self.show_info(f"Spritesheet salva com sucesso:\n{file_path}")
@@ -164,6 +280,151 @@ class SpritesheetApp(QMainWindow):
                 print(error_msg)
                 self.show_error(error_msg)
 
+    def build_export_job(self, file_path):
+        """Descreve a exportação atual (seleções, alinhamentos e remoção de fundo) como job"""
+        from src.logic.job import make_job
+
+        bg_removal_config = self.canvas.get_bg_removal_config()
+        rects = self.canvas.selected_rects
+        return make_job(
+            self.image_path,
+            file_path,
+            rects,
+            [self.canvas.get_individual_alignment(i) for i in range(len(rects))],
+            remove_background=bg_removal_config["remove_background"],
+            bg_color=bg_removal_config["bg_color"],
+            scales=EXPORT_SCALES,
+            dds_format=DDS_FORMAT,
+            trim=EXPORT_TRIM,
+            frame_duration=ANIMATION_FRAME_MS,
+            atlas=EXPORT_ATLAS
+        )
+
+    def export_selections(self, file_path):
+        """
+        Exporta as seleções e salva o job ao lado da spritesheet
+        ('sheet.png' -> 'sheet.job.json'), usado pelo modo observação
+        """
+        from src.logic.job import run_job, save_job, job_path_for
+
+        job = self.build_export_job(file_path)
+        if not run_job(job, erase_mask=self.canvas.erase_mask, workers=EXPORT_WORKERS):
+            return False
+
+        save_job(job_path_for(file_path), job, erase_mask=self.canvas.erase_mask)
+        self.last_export_path = file_path
+        return True
+
+    def toggle_watch_mode(self, enabled):
+        """Liga/desliga a observação da imagem aberta"""
+        from src.logic.watcher import FileWatcher
+
+        if enabled:
+            self.watcher = FileWatcher([self.image_path] if self.image_path else [])
+            self.watch_timer.start()
+            print("👀 Modo observação ativado")
+        else:
+            self.watch_timer.stop()
+            self.watcher = None
+            print("👀 Modo observação desativado")
+
+    def toggle_interaction_recording(self, enabled):
+        """
+        Grava os eventos do canvas em output/sessao-<data>.jsonl, para reproduzir com
+        'python -m src.cli replay <arquivo> --image <imagem>'
+        """
+        if enabled:
+            from datetime import datetime
+            from src.ui.interaction_replay import InteractionRecorder
+
+            output_dir = os.path.join(os.getcwd(), "output")
+            os.makedirs(output_dir, exist_ok=True)
+            path = os.path.join(output_dir, f"sessao-{datetime.now():%Y%m%d-%H%M%S}.jsonl")
+            self.recorder = InteractionRecorder(self.canvas, path, window=self)
+            print(f"⏺️ Gravando interações em: {path}")
+        elif self.recorder is not None:
+            self.recorder.stop()
+            print(f"⏹️ Gravação salva: {self.recorder.path}")
+            self.recorder = None
+
+    def poll_watched_files(self):
+        """Recarrega a imagem alterada externamente e reexporta a última spritesheet"""
+        if self.watcher is None or not self.watcher.poll():
+            return
+
+        pixmap = QPixmap(self.image_path)
+        if pixmap.isNull():
+            return  # Arquivo ainda incompleto; a próxima gravação dispara de novo
+
+        self.pixmap = pixmap
+        self.canvas.reload_background(pixmap)
+        print(f"🔁 Imagem recarregada: {self.image_path}")
+
+        if self.last_export_path and self.canvas.selected_rects:
+            if self.export_selections(self.last_export_path):
+                print(f"🔁 Spritesheet reexportada: {self.last_export_path}")
+
+    def import_folder_dialog(self):
+        print("🗂️ [AÇÃO] Selecionando pasta de frames...")
+        folder = QFileDialog.getExistingDirectory(
+            self,
+            "Selecionar Pasta de Frames",
+            os.path.join(os.getcwd(), "assets", "images")
+        )
+        if not folder:
+            return
+
+        output_dir = os.path.join(os.getcwd(), "output")
+        os.makedirs(output_dir, exist_ok=True)
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Salvar Spritesheet",
+            output_dir,
+            "PNG (*.png);;DDS comprimido (*.dds);;APNG animado (*.apng);;GIF animado (*.gif)"
+        )
+        if file_path:
+            self.export_folder(folder, file_path)
+
+    def export_folder(self, folder, file_path):
+        """Monta uma spritesheet com todas as imagens da pasta, usando o recorte e alinhamento atuais"""
+        try:
+            from src.logic.exporter import SpriteSheetExporter
+            from src.logic.folder_import import load_frames
+
+            paths, frames = load_frames(folder)
+            if not frames:
+                self.show_info("Nenhuma imagem encontrada na pasta.")
+                return
+
+            bg_removal_config = self.canvas.get_bg_removal_config()
+            config = {
+                "remove_background": bg_removal_config["remove_background"],
+                "bg_color": bg_removal_config["bg_color"],
+                "trim": EXPORT_TRIM,
+                "align_config": self.canvas.get_alignment_config()
+            }
+
+            # Nome do arquivo vira o nome do frame no atlas ('walk_01.png' -> 'walk_01')
+            names = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+            if len(set(names)) != len(names):  # 'walk.png' e 'walk.gif' na mesma pasta
+                names = [None] * len(frames)
+
+            exporter = SpriteSheetExporter(dds_format=DDS_FORMAT)
+            for frame, name in zip(frames, names):
+                exporter.add_image(frame, config, name)
+
+            if exporter.export(file_path, layout="horizontal", scales=EXPORT_SCALES,
+                               frame_duration=ANIMATION_FRAME_MS, atlas=EXPORT_ATLAS):
+                print(f"✅ Spritesheet com {len(frames)} frames salva em: {file_path}")
+                self.show_info(f"Spritesheet salva com sucesso:\n{file_path}")
+            else:
+                self.show_error("Falha ao exportar spritesheet.")
+
+        except Exception as e:
+            error_msg = f"❌ Erro ao montar spritesheet da pasta:\n{str(e)}"
+            print(error_msg)
+            self.show_error(error_msg)
+
     def show_error(self, message):
         msg = QMessageBox()
         msg.setIcon(QMessageBox.Critical)
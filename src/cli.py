@@ -0,0 +1,149 @@
+# src/cli.py
+
+import argparse
+import logging
+import sys
+
+print("⌨️ [INFO] Carregando módulo: CLI...")
+logging.basicConfig(level=logging.INFO)
+
+
+def cmd_watch(args):
+    from src.logic.watcher import watch_jobs
+
+    try:
+        watch_jobs(args.jobs, interval=args.interval, debounce=args.debounce)
+    except KeyboardInterrupt:
+        print("👋 Modo observação encerrado.")
+    return 0
+
+
+def cmd_serve(args):
+    from src.logic.job_server import JobServer
+
+    server = JobServer(args.host, args.port, workers=args.workers, queue_size=args.queue)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+        print("👋 Servidor de exportação encerrado.")
+    return 0
+
+
+def cmd_submit(args):
+    from concurrent.futures import ThreadPoolExecutor
+    from src.logic.job import load_job
+    from src.logic.job_server import submit_job
+
+    # Caminhos relativos são resolvidos aqui, já que o servidor pode ter outro diretório atual
+    jobs = [load_job(path) for path in args.jobs]
+
+    with ThreadPoolExecutor(max_workers=args.parallel) as pool:
+        results = list(pool.map(lambda job: submit_job(job, args.server), jobs))
+
+    failed = 0
+    for path, result in zip(args.jobs, results):
+        if result.get("success"):
+            print(f"✅ {path}: fila {result['queue_ms']} ms, exportação {result['run_ms']} ms, "
+                  f"fila restante {result['queue_depth']}")
+        else:
+            failed += 1
+            print(f"❌ {path}: {result.get('error')}")
+    return 1 if failed else 0
+
+
+def cmd_replay(args):
+    import os
+    import json
+    import tempfile
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    from PySide6.QtWidgets import QApplication
+    from src.ui.interaction_replay import (
+        load_session, synthetic_session, replay_session, summarize, write_synthetic_sheet
+    )
+
+    header, events = load_session(args.session) if args.session else ({}, None)
+    if events is not None and not events:
+        print(f"❌ Sessão sem eventos: {args.session}")
+        return 1
+    backend = args.backend or header.get("backend")
+
+    image = args.image
+    if image is None:
+        width, height = (int(v) for v in args.synthetic.lower().split("x"))
+        image = write_synthetic_sheet(os.path.join(tempfile.gettempdir(), f"synthetic_{width}x{height}.png"), width, height)
+
+    app = QApplication.instance() or QApplication([])
+    from src.app import SpritesheetApp
+    window = SpritesheetApp(canvas_backend=backend)
+    window.resize(*header.get("window", (1200, 800)))
+    window.show()
+    window.load_image(image)
+    window.canvas.set_max_frames(10 ** 6)
+
+    if events is None:
+        pixmap = window.canvas.background
+        events = synthetic_session(min(pixmap.width(), 1000), min(pixmap.height(), 700))
+
+    summary = summarize(replay_session(window.canvas, events))
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"{'evento':<8} {'n':>5} {'handler p50':>12} {'handler p95':>12} {'paint p95':>10} {'total p95':>10} {'máx':>9}")
+        for kind, row in summary.items():
+            print(f"{kind:<8} {row['count']:>5} {row['handler_p50']:>12} {row['handler_p95']:>12} "
+                  f"{row['paint_p95']:>10} {row['total_p95']:>10} {row['total_max']:>9}")
+
+    if args.max_p95 is not None and summary["all"]["total_p95"] > args.max_p95:
+        print(f"❌ p95 de {summary['all']['total_p95']} ms acima do limite de {args.max_p95} ms")
+        return 1
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli",
+        description="Ferramentas de linha de comando do SpriteMaster"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    watch = commands.add_parser("watch", help="Reexporta jobs quando a imagem ou o job mudam")
+    watch.add_argument("jobs", nargs="+", help="Arquivos .job.json salvos pelo editor")
+    watch.add_argument("--interval", type=float, default=0.1, help="Segundos entre verificações")
+    watch.add_argument("--debounce", type=float, default=0.2, help="Silêncio exigido antes de reexportar")
+    watch.set_defaults(func=cmd_watch)
+
+    serve = commands.add_parser("serve", help="Servidor local de exportação com workers aquecidos")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--workers", type=int, default=None, help="Padrão: número de CPUs")
+    serve.add_argument("--queue", type=int, default=64, help="Jobs aguardando antes de recusar (HTTP 503)")
+    serve.set_defaults(func=cmd_serve)
+
+    submit = commands.add_parser("submit", help="Envia jobs ao servidor e espera o resultado")
+    submit.add_argument("jobs", nargs="+", help="Arquivos .job.json")
+    submit.add_argument("--server", default="http://127.0.0.1:8765")
+    submit.add_argument("--parallel", type=int, default=16, help="Jobs enviados ao mesmo tempo")
+    submit.set_defaults(func=cmd_submit)
+
+    replay = commands.add_parser("replay", help="Reproduz uma sessão gravada e mede a latência da interface")
+    replay.add_argument("session", nargs="?", help="Sessão .jsonl gravada no editor (padrão: sessão sintética)")
+    source = replay.add_mutually_exclusive_group()
+    source.add_argument("--image", help="Imagem aberta antes da reprodução")
+    source.add_argument("--synthetic", default="4096x4096", help="Gera uma spritesheet de teste LxA")
+    replay.add_argument("--backend", choices=("widget", "graphics"), help="Padrão: o da gravação ou de settings.py")
+    replay.add_argument("--max-p95", type=float, help="Falha (código 1) se o p95 total passar deste valor em ms")
+    replay.add_argument("--json", action="store_true", help="Imprime o resumo em JSON")
+    replay.set_defaults(func=cmd_replay)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
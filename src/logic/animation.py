@@ -0,0 +1,286 @@
+# src/logic/animation.py
+
+import struct
+import zlib
+import logging
+import numpy as np
+
+print("🎞️ [INFO] Carregando módulo: Animation...")
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# fcTL: o que fazer com a região do frame antes do próximo / como compor o frame
+DISPOSE_OP_NONE = 0
+DISPOSE_OP_BACKGROUND = 1
+DISPOSE_OP_PREVIOUS = 2
+BLEND_OP_SOURCE = 0
+BLEND_OP_OVER = 1
+
+ANIMATION_EXTENSIONS = (".apng", ".gif")
+
+# Bytes por pixel (RGBA 8 bits), usado nos filtros de linha do PNG
+_BPP = 4
+
+
+def _chunk(kind, data=b""):
+    """Chunk PNG: tamanho, tipo, dados e CRC do tipo + dados"""
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def filter_scanlines(pixels):
+    """
+    Aplica os filtros do PNG a todas as linhas de uma vez e escolhe, por linha,
+    o de menor soma de diferenças absolutas (heurística recomendada pela especificação)
+    :param pixels: Array (h, w, 4) uint8
+    :return: bytes com um byte de filtro seguido da linha filtrada, para cada linha
+    """
+    height, width = pixels.shape[:2]
+    raw = pixels.reshape(height, width * _BPP).astype(np.int16)
+    left = np.zeros_like(raw)
+    left[:, _BPP:] = raw[:, :-_BPP]
+    up = np.zeros_like(raw)
+    up[1:] = raw[:-1]
+    upleft = np.zeros_like(raw)
+    upleft[1:, _BPP:] = raw[:-1, :-_BPP]
+
+    # Paeth: o vizinho mais próximo de left + up - upleft
+    p = left + up - upleft
+    pa, pb, pc = np.abs(p - left), np.abs(p - up), np.abs(p - upleft)
+    paeth = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, upleft))
+
+    candidates = np.stack([
+        raw,                        # 0 None
+        raw - left,                 # 1 Sub
+        raw - up,                   # 2 Up
+        raw - ((left + up) >> 1),   # 3 Average
+        raw - paeth                 # 4 Paeth
+    ]).astype(np.uint8)
+
+    # Bytes vistos como int8: valores perto de zero comprimem melhor
+    cost = np.abs(candidates.view(np.int8).astype(np.int32)).sum(axis=2)
+    best = cost.argmin(axis=0)
+
+    out = np.empty((height, 1 + width * _BPP), dtype=np.uint8)
+    out[:, 0] = best
+    out[:, 1:] = candidates[best, np.arange(height)]
+    return out.tobytes()
+
+
+def _image_data(pixels, level):
+    return zlib.compress(filter_scanlines(pixels), level)
+
+
+def _delay(ms):
+    """Duração em ms -> (numerador, denominador) de 16 bits do fcTL"""
+    ms = max(0, int(round(ms)))
+    if ms <= 0xFFFF:
+        return ms, 1000
+    return min(0xFFFF, round(ms / 10)), 100
+
+
+def frame_deltas(frames, durations):
+    """
+    Reduz cada frame ao retângulo que mudou em relação ao anterior.
+    A comparação vê cada pixel RGBA como um uint32 (um teste por pixel).
+    Frames idênticos ao anterior somam a duração a ele em vez de virar um frame.
+    :param frames: Arrays (H, W, 4) uint8, todos do tamanho da animação
+    :param durations: Duração de cada frame em ms
+    :return: Lista de dicionários {x, y, pixels, blend, duration}
+    """
+    deltas = [{"x": 0, "y": 0, "pixels": frames[0], "blend": BLEND_OP_SOURCE, "duration": durations[0]}]
+    previous = np.ascontiguousarray(frames[0]).view(np.uint32)[..., 0]
+
+    for frame, duration in zip(frames[1:], durations[1:]):
+        current = np.ascontiguousarray(frame).view(np.uint32)[..., 0]
+        changed = current != previous
+        rows = np.flatnonzero(changed.any(axis=1))
+        if len(rows) == 0:
+            deltas[-1]["duration"] += duration
+            continue
+
+        cols = np.flatnonzero(changed.any(axis=0))
+        y0, y1, x0, x1 = int(rows[0]), int(rows[-1]) + 1, int(cols[0]), int(cols[-1]) + 1
+        region = frame[y0:y1, x0:x1]
+        region_changed = changed[y0:y1, x0:x1]
+
+        if (region[..., 3][region_changed] == 255).all():
+            # Tudo que mudou é opaco: compor por cima (OVER) deixa o resto
+            # transparente, o que comprime melhor que repetir os pixels iguais
+            pixels = np.where(region_changed[..., None], region, 0).astype(np.uint8)
+            blend = BLEND_OP_OVER
+        else:
+            # Algum pixel ficou (mais) transparente: só SOURCE consegue substituir
+            pixels = region
+            blend = BLEND_OP_SOURCE
+
+        deltas.append({"x": x0, "y": y0, "pixels": pixels, "blend": blend, "duration": duration})
+        previous = current
+    return deltas
+
+
+def write_apng(path, frames, durations, loop=0, level=9):
+    """
+    Grava um PNG animado com os chunks montados à mão (IHDR, acTL, fcTL,
+    IDAT/fdAT, IEND). O primeiro frame é a imagem padrão (para visualizadores
+    sem APNG); os demais são só os retângulos alterados, sem descarte (DISPOSE_OP_NONE).
+    :param frames: Arrays (H, W, 4) uint8 do mesmo tamanho
+    :param durations: Duração de cada frame em ms
+    :param loop: Repetições (0 = infinito)
+    :return: Número de frames gravados (após juntar frames repetidos)
+    """
+    height, width = frames[0].shape[:2]
+    deltas = frame_deltas(frames, durations)
+
+    parts = [
+        PNG_SIGNATURE,
+        _chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)),
+        _chunk(b"acTL", struct.pack(">II", len(deltas), loop))
+    ]
+
+    sequence = 0
+    for i, delta in enumerate(deltas):
+        pixels = delta["pixels"]
+        delay_num, delay_den = _delay(delta["duration"])
+        parts.append(_chunk(b"fcTL", struct.pack(
+            ">IIIIIHHBB", sequence, pixels.shape[1], pixels.shape[0], delta["x"], delta["y"],
+            delay_num, delay_den, DISPOSE_OP_NONE, delta["blend"]
+        )))
+        sequence += 1
+
+        data = _image_data(pixels, level)
+        if i == 0:
+            parts.append(_chunk(b"IDAT", data))
+        else:
+            parts.append(_chunk(b"fdAT", struct.pack(">I", sequence) + data))
+            sequence += 1
+
+    parts.append(_chunk(b"IEND"))
+    with open(path, "wb") as f:
+        f.write(b"".join(parts))
+
+    logging.info(f"🎞️ APNG com {len(deltas)} frames ({len(frames)} originais) salvo em: {path}")
+    return len(deltas)
+
+
+# Cores do GIF; a transparência usa o índice logo depois da última cor
+_GIF_COLORS = 255
+
+# Pixels amostrados para montar a paleta quando há mais de 255 cores
+_PALETTE_SAMPLES = 1 << 20
+
+
+def _pack_rgb(pixels):
+    """(..., 4) uint8 -> inteiro 0xRRGGBB por pixel"""
+    rgb = pixels[..., :3].astype(np.uint32)
+    return (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+
+
+def _indexed_frames(frames, opaque):
+    """
+    Converte os frames para índices de uma paleta única (sem tabela local por
+    frame no GIF). Com até 255 cores a conversão é exata, por busca vetorizada
+    nas cores distintas; acima disso a paleta vem do median cut do Pillow sobre
+    todos os frames. A transparência usa o índice seguinte à última cor.
+    :return: (paleta (n, 3) uint8, lista de arrays (H, W) uint8 de índices)
+    """
+    from PIL import Image
+
+    colors = np.unique(np.concatenate([_pack_rgb(f[mask]) for f, mask in zip(frames, opaque)]))
+    if len(colors) <= _GIF_COLORS:
+        palette = np.stack([(colors >> 16) & 255, (colors >> 8) & 255, colors & 255], axis=1).astype(np.uint8)
+        indexed = []
+        for frame, mask in zip(frames, opaque):
+            indices = np.full(frame.shape[:2], len(palette), dtype=np.uint8)
+            indices[mask] = np.searchsorted(colors, _pack_rgb(frame[mask]))
+            indexed.append(indices)
+        return palette, indexed
+
+    samples = np.concatenate([f[mask][:, :3] for f, mask in zip(frames, opaque)])
+    samples = samples[::max(1, len(samples) // _PALETTE_SAMPLES)]
+    quantized = Image.fromarray(samples[None], "RGB").quantize(_GIF_COLORS, method=Image.Quantize.MEDIANCUT)
+    palette = np.array(quantized.getpalette()[:_GIF_COLORS * 3], dtype=np.uint8).reshape(-1, 3)
+
+    indexed = []
+    for frame, mask in zip(frames, opaque):
+        rgb = Image.fromarray(np.ascontiguousarray(frame[..., :3]), "RGB")
+        indices = np.array(rgb.quantize(palette=quantized, dither=Image.Dither.NONE))
+        indices[~mask] = len(palette)
+        indexed.append(indices)
+    return palette, indexed
+
+
+def _bbox(mask):
+    rows = np.flatnonzero(mask.any(axis=1))
+    if len(rows) == 0:
+        return None
+    cols = np.flatnonzero(mask.any(axis=0))
+    return int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1
+
+
+def _contains(outer, inner):
+    return inner is None or (outer is not None and outer[0] <= inner[0] and outer[1] <= inner[1]
+                             and outer[2] >= inner[2] and outer[3] >= inner[3])
+
+
+def _gif_disposal(frames, opaque):
+    """
+    Disposal por frame, seguindo o retângulo que o Pillow grava: depois de um
+    frame com disposal 2 ele grava todo o conteúdo visível; depois de disposal 1,
+    só a caixa que mudou. GIF não deixa um pixel voltar a ser transparente por
+    cima, então quem some no frame seguinte precisa de disposal 2 (limpar a
+    própria caixa), e isso só funciona se essa caixa cobre todo o conteúdo do frame.
+    """
+    count = len(frames)
+    disposal = [1] * count
+    for i in range(count - 1):
+        if (opaque[i] & ~opaque[i + 1]).any():
+            disposal[i] = 2
+
+    # Caixa da diferença para o anterior cobre o conteúdo? Senão o anterior também limpa
+    for i in range(count - 1, 0, -1):
+        if disposal[i] != 2 or disposal[i - 1] == 2:
+            continue
+        changed = (frames[i].view(np.uint32)[..., 0] != frames[i - 1].view(np.uint32)[..., 0])
+        if not _contains(_bbox(changed), _bbox(opaque[i])):
+            disposal[i - 1] = 2
+    return disposal
+
+
+def write_gif(path, frames, durations, loop=0):
+    """
+    Grava um GIF pelo Pillow com paleta global única. Os frames ficam no lugar
+    (disposal 1) e o Pillow grava só o retângulo alterado; só quando o seguinte
+    apaga pixels o frame limpa a própria região (disposal 2, ver _gif_disposal).
+    Frames repetidos são juntados antes, como no APNG. Alfa vira 1 bit (corte em 128).
+    :return: Número de frames gravados
+    """
+    from PIL import Image
+
+    merged = []
+    for frame, duration in zip(frames, durations):
+        if merged and np.array_equal(merged[-1][0], frame):
+            merged[-1][1] += duration
+        else:
+            merged.append([frame, duration])
+
+    opaque = [frame[..., 3] >= 128 for frame, _ in merged]
+    palette, indexed = _indexed_frames([frame for frame, _ in merged], opaque)
+    transparent = len(palette)
+    flat_palette = palette.flatten().tolist() + [0, 0, 0]
+
+    images = []
+    for indices in indexed:
+        image = Image.fromarray(indices, "P")
+        image.putpalette(flat_palette)
+        images.append(image)
+
+    disposal = _gif_disposal([frame for frame, _ in merged], opaque)
+
+    images[0].save(
+        path, "GIF", save_all=True, append_images=images[1:],
+        duration=[duration for _, duration in merged], loop=loop,
+        disposal=disposal, transparency=transparent, optimize=False,
+        palette=bytes(flat_palette)  # Paleta global explícita: sem tabela local em cada frame
+    )
+    logging.info(f"🎞️ GIF com {len(merged)} frames ({len(frames)} originais) salvo em: {path}")
+    return len(merged)
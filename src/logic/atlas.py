@@ -0,0 +1,269 @@
+# src/logic/atlas.py
+
+import json
+import mmap
+import os
+import logging
+import numpy as np
+
+print("🗺️ [INFO] Carregando módulo: Atlas...")
+
+ATLAS_MAGIC = b"SMAT"
+ATLAS_VERSION = 1
+ATLAS_JSON_SUFFIX = ".json"
+ATLAS_INDEX_SUFFIX = ".atlas"
+
+# Cabeçalho do índice binário (little-endian, 32 bytes)
+HEADER_DTYPE = np.dtype([
+    ("magic", "S4"),
+    ("version", "<u2"),
+    ("record_size", "<u2"),
+    ("count", "<u4"),
+    ("slots", "<u4"),        # Tamanho da tabela hash (potência de 2)
+    ("width", "<u4"),        # Tamanho da spritesheet
+    ("height", "<u4"),
+    ("names_size", "<u4"),
+    ("reserved", "<u4"),
+])
+
+# Um registro de largura fixa por frame; depois do cabeçalho vêm os registros,
+# a tabela hash (slots x uint32, índice do registro + 1; 0 = vazio) e os nomes em UTF-8
+RECORD_DTYPE = np.dtype([
+    ("hash", "<u4"),         # FNV-1a 32 bits do nome
+    ("name_offset", "<u4"),
+    ("name_length", "<u4"),
+    ("x", "<u4"),            # Retângulo do conteúdo na spritesheet
+    ("y", "<u4"),
+    ("w", "<u4"),
+    ("h", "<u4"),
+    ("offset_x", "<i4"),     # Posição do conteúdo dentro do frame original
+    ("offset_y", "<i4"),
+    ("source_w", "<u4"),     # Tamanho do frame original
+    ("source_h", "<u4"),
+    ("pivot_x", "<f4"),      # Fração de source_w / source_h
+    ("pivot_y", "<f4"),
+])
+
+_FNV_OFFSET = 0x811C9DC5
+_FNV_PRIME = 0x01000193
+
+
+def fnv1a(data):
+    """Hash FNV-1a de 32 bits (fácil de reimplementar no loader da engine)"""
+    h = _FNV_OFFSET
+    for byte in data:
+        h = ((h ^ byte) * _FNV_PRIME) & 0xFFFFFFFF
+    return h
+
+
+def atlas_paths(sheet_path):
+    """'output/sheet.png' -> ('output/sheet.json', 'output/sheet.atlas')"""
+    root = os.path.splitext(sheet_path)[0]
+    return root + ATLAS_JSON_SUFFIX, root + ATLAS_INDEX_SUFFIX
+
+
+def atlas_json(entries, image, size, scale=1.0):
+    """
+    Metadados no formato JSON 'hash' do TexturePacker, lido pela maioria das engines
+    :param entries: Dicionários {name, frame (x, y, w, h), offset (x, y), source_size (w, h), pivot (x, y)}
+    :param image: Nome do arquivo da spritesheet
+    :param size: (largura, altura) da spritesheet
+    """
+    frames = {}
+    for entry in entries:
+        x, y, w, h = entry["frame"]
+        ox, oy = entry["offset"]
+        sw, sh = entry["source_size"]
+        frames[entry["name"]] = {
+            "frame": {"x": x, "y": y, "w": w, "h": h},
+            "rotated": False,
+            "trimmed": (ox, oy, w, h) != (0, 0, sw, sh),
+            "spriteSourceSize": {"x": ox, "y": oy, "w": w, "h": h},
+            "sourceSize": {"w": sw, "h": sh},
+            "pivot": {"x": entry["pivot"][0], "y": entry["pivot"][1]}
+        }
+
+    return {
+        "frames": frames,
+        "meta": {
+            "app": "SpriteMaster",
+            "version": str(ATLAS_VERSION),
+            "image": image,
+            "format": "RGBA8888",
+            "size": {"w": size[0], "h": size[1]},
+            "scale": f"{scale:g}"
+        }
+    }
+
+
+def write_atlas_json(path, entries, image, size, scale=1.0):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(atlas_json(entries, image, size, scale), f, indent=1, ensure_ascii=False)
+
+
+def write_atlas_index(path, entries, size):
+    """
+    Grava o índice binário: cabeçalho, registros de largura fixa, tabela hash
+    com endereçamento aberto (sondagem linear, ocupação até 50%) e nomes
+    :param entries: Mesmo formato de atlas_json; os nomes precisam ser únicos
+    """
+    names = [entry["name"].encode("utf-8") for entry in entries]
+    if len(set(names)) != len(names):
+        raise ValueError("Nomes de frames repetidos no atlas.")
+
+    count = len(entries)
+    records = np.zeros(count, dtype=RECORD_DTYPE)
+    lengths = np.array([len(name) for name in names], dtype=np.uint32)
+    records["name_length"] = lengths
+    records["name_offset"] = np.concatenate([[0], np.cumsum(lengths)[:-1]]) if count else []
+    records["hash"] = [fnv1a(name) for name in names]
+
+    for i, field in enumerate(("x", "y", "w", "h")):
+        records[field] = [entry["frame"][i] for entry in entries]
+    records["offset_x"] = [entry["offset"][0] for entry in entries]
+    records["offset_y"] = [entry["offset"][1] for entry in entries]
+    records["source_w"] = [entry["source_size"][0] for entry in entries]
+    records["source_h"] = [entry["source_size"][1] for entry in entries]
+    records["pivot_x"] = [entry["pivot"][0] for entry in entries]
+    records["pivot_y"] = [entry["pivot"][1] for entry in entries]
+
+    slots = 1
+    while slots < 2 * count:
+        slots *= 2
+    table = np.zeros(slots, dtype=np.uint32)
+    mask = slots - 1
+    for i, h in enumerate(records["hash"].tolist()):
+        slot = h & mask
+        while table[slot]:
+            slot = (slot + 1) & mask
+        table[slot] = i + 1
+
+    blob = b"".join(names)
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header[0] = (ATLAS_MAGIC, ATLAS_VERSION, RECORD_DTYPE.itemsize, count, slots, size[0], size[1], len(blob), 0)
+
+    with open(path, "wb") as f:
+        f.write(header.tobytes())
+        f.write(records.tobytes())
+        f.write(table.tobytes())
+        f.write(blob)
+
+
+def write_atlas(sheet_path, entries, size, scale=1.0):
+    """Grava 'sheet.json' e 'sheet.atlas' ao lado da spritesheet"""
+    json_path, index_path = atlas_paths(sheet_path)
+    write_atlas_json(json_path, entries, os.path.basename(sheet_path), size, scale)
+    write_atlas_index(index_path, entries, size)
+    logging.info(f"🗺️ Atlas com {len(entries)} frames salvo em: {json_path} e {index_path}")
+
+
+class AtlasIndex:
+    """
+    Leitura do índice binário por mmap: nada é decodificado ao abrir; os
+    registros e a tabela hash são views NumPy sobre o arquivo mapeado.
+    Busca por nome em O(1): index["hero_walk_003"]
+    Views tiradas de `records` continuam válidas depois de close(); o arquivo
+    fica mapeado até a última delas ser descartada.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < HEADER_DTYPE.itemsize:
+                raise ValueError(f"Índice de atlas truncado: {path}")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.records = self._table = None
+
+        # Campos copiados para ints: uma view do cabeçalho impediria fechar o mmap
+        header = np.frombuffer(self._map, dtype=HEADER_DTYPE, count=1)[0]
+        magic, version, record_size = bytes(header["magic"]), int(header["version"]), int(header["record_size"])
+        count, slots, names_size = int(header["count"]), int(header["slots"]), int(header["names_size"])
+        self.size = (int(header["width"]), int(header["height"]))
+        del header
+
+        if magic != ATLAS_MAGIC:
+            self.close()
+            raise ValueError("Arquivo não é um índice de atlas.")
+        if version != ATLAS_VERSION or record_size != RECORD_DTYPE.itemsize:
+            self.close()
+            raise ValueError(f"Versão de atlas não suportada: {version}")
+
+        # Registros, tabela e nomes precisam caber no arquivo; a tabela, ser potência de 2
+        # com ao menos um slot vazio (senão a sondagem em find() não termina)
+        expected = HEADER_DTYPE.itemsize + count * record_size + slots * 4 + names_size
+        if slots < 1 or slots & (slots - 1) or slots <= count or len(self._map) < expected:
+            self.close()
+            raise ValueError(f"Índice de atlas corrompido ou truncado: {path}")
+
+        self.count = count
+        self._mask = slots - 1
+
+        offset = HEADER_DTYPE.itemsize
+        self.records = np.frombuffer(self._map, dtype=RECORD_DTYPE, count=self.count, offset=offset)
+        offset += self.records.nbytes
+        self._table = np.frombuffer(self._map, dtype=np.uint32, count=slots, offset=offset)
+        self._names_offset = offset + self._table.nbytes
+
+    def close(self):
+        """
+        Solta as views e fecha o mmap. Se o chamador ainda segura uma view
+        (ex.: index.records), o mapeamento só é liberado quando ela for coletada.
+        """
+        self.records = self._table = None
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # Views externas vivas: o mmap fecha sozinho quando elas somem
+
+    def _check_open(self):
+        if self._table is None:
+            raise ValueError("índice fechado")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def name(self, i):
+        self._check_open()
+        record = self.records[i]
+        start = self._names_offset + int(record["name_offset"])
+        return self._map[start:start + int(record["name_length"])].decode("utf-8")
+
+    def find(self, name):
+        """:return: Índice do registro ou -1"""
+        self._check_open()
+        if not self.count:
+            return -1
+        data = name.encode("utf-8")
+        h = fnv1a(data)
+        slot = h & self._mask
+        while True:
+            entry = int(self._table[slot])
+            if entry == 0:
+                return -1
+            record = self.records[entry - 1]
+            if int(record["hash"]) == h and int(record["name_length"]) == len(data):
+                start = self._names_offset + int(record["name_offset"])
+                if self._map[start:start + len(data)] == data:
+                    return entry - 1
+            slot = (slot + 1) & self._mask
+
+    def __contains__(self, name):
+        return self.find(name) >= 0
+
+    def __getitem__(self, name):
+        i = self.find(name)
+        if i < 0:
+            raise KeyError(name)
+        record = self.records[i]
+        return {
+            "name": name,
+            "frame": (int(record["x"]), int(record["y"]), int(record["w"]), int(record["h"])),
+            "offset": (int(record["offset_x"]), int(record["offset_y"])),
+            "source_size": (int(record["source_w"]), int(record["source_h"])),
+            "pivot": (float(record["pivot_x"]), float(record["pivot_y"]))
+        }
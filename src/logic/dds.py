@@ -0,0 +1,438 @@
+# src/logic/dds.py
+
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+import numpy as np
+import struct
+import logging
+
+print("🧊 [INFO] Carregando módulo: DDS...")
+
+# Bytes por bloco 4x4 de cada formato
+BLOCK_BYTES = {"bc1": 8, "bc3": 16, "bc7": 16}
+
+# Blocos codificados por tarefa do pool (limita a memória dos temporários)
+_CHUNK_BLOCKS = 4096
+
+# Pesos de interpolação de 4 bits do BC7
+_BC7_WEIGHTS = np.array([0, 4, 9, 13, 17, 21, 26, 30, 34, 38, 43, 47, 51, 55, 60, 64], dtype=np.int32)
+
+_DDS_MAGIC = b"DDS "
+_DDSD_FLAGS = 0x1 | 0x2 | 0x4 | 0x1000 | 0x20000 | 0x80000  # CAPS|HEIGHT|WIDTH|PIXELFORMAT|MIPMAPCOUNT|LINEARSIZE
+_DDPF_FOURCC = 0x4
+_DDSCAPS_TEXTURE = 0x1000
+_DDSCAPS_MIPMAP = 0x8 | 0x400000  # COMPLEX | MIPMAP
+_FOURCC = {"bc1": b"DXT1", "bc3": b"DXT5"}
+_DXGI_BC7_UNORM = 98
+_DDS_ALPHA_MODE_STRAIGHT = 1
+_DDS_ALPHA_MODE_PREMULTIPLIED = 2
+
+
+# --- Preparação -------------------------------------------------------------
+
+def premultiply_alpha(rgba):
+    """Multiplica RGB pelo alfa (arredondado), como esperado por blending pré-multiplicado"""
+    out = rgba.copy()
+    alpha = rgba[..., 3:4].astype(np.uint16)
+    out[..., :3] = (rgba[..., :3] * alpha + 127) // 255
+    return out
+
+
+def build_mip_chain(rgba, premultiplied=True):
+    """
+    Gera a cadeia de mipmaps até 1x1 com filtro de área (BOX)
+    :param rgba: Array (H, W, 4) uint8
+    :param premultiplied: Os dados já estão pré-multiplicados
+    :return: Lista de arrays, do maior para o menor
+    """
+    # "RGBa" diz ao Pillow que os dados já estão pré-multiplicados
+    mode = "RGBa" if premultiplied else "RGBA"
+    image = Image.frombuffer(mode, (rgba.shape[1], rgba.shape[0]), np.ascontiguousarray(rgba), "raw", mode, 0, 1)
+
+    levels = [rgba]
+    while image.width > 1 or image.height > 1:
+        size = (max(1, image.width // 2), max(1, image.height // 2))
+        image = image.resize(size, Image.BOX)
+        levels.append(np.asarray(image).reshape(size[1], size[0], 4))
+    return levels
+
+
+def to_blocks(rgba):
+    """
+    Divide a imagem em blocos 4x4, repetindo a borda quando a medida não é múltipla de 4
+    :return: Array (N, 16, 4) uint8 em ordem de linhas de blocos
+    """
+    height, width = rgba.shape[:2]
+    pad_h, pad_w = (-height) % 4, (-width) % 4
+    if pad_h or pad_w:
+        rgba = np.pad(rgba, ((0, pad_h), (0, pad_w), (0, 0)), mode="edge")
+
+    by, bx = rgba.shape[0] // 4, rgba.shape[1] // 4
+    blocks = rgba.reshape(by, 4, bx, 4, 4).transpose(0, 2, 1, 3, 4)
+    return blocks.reshape(by * bx, 16, 4)
+
+
+def from_blocks(blocks, width, height):
+    """Inverso de to_blocks: remonta a imagem e descarta o preenchimento"""
+    by, bx = (height + 3) // 4, (width + 3) // 4
+    image = blocks.reshape(by, bx, 4, 4, 4).transpose(0, 2, 1, 3, 4).reshape(by * 4, bx * 4, 4)
+    return image[:height, :width]
+
+
+# --- Utilidades vetorizadas ------------------------------------------------
+
+def _principal_endpoints(colors, weights=None):
+    """
+    Extremos do segmento que melhor aproxima as cores de cada bloco (eixo principal)
+    :param colors: Array (N, 16, C) float32
+    :param weights: Máscara (N, 16) dos pixels considerados, ou None
+    :return: (low, high) com forma (N, C)
+    """
+    if weights is not None:
+        w = weights[..., None].astype(np.float32)
+        mean = (colors * w).sum(1) / np.maximum(w.sum(1), 1)
+        colors = np.where(weights[..., None], colors, mean[:, None, :])
+    else:
+        mean = colors.mean(1)
+
+    centered = colors - mean[:, None, :]
+    cov = np.einsum("nki,nkj->nij", centered, centered)
+
+    # Iteração de potência partindo da diagonal da caixa envolvente
+    axis = colors.max(1) - colors.min(1) + 1e-3
+    for _ in range(4):
+        axis = np.einsum("nij,nj->ni", cov, axis)
+        axis /= np.maximum(np.linalg.norm(axis, axis=1, keepdims=True), 1e-6)
+
+    proj = np.einsum("nkc,nc->nk", centered, axis)
+    low = mean + proj.min(1)[:, None] * axis
+    high = mean + proj.max(1)[:, None] * axis
+    return np.clip(low, 0, 255), np.clip(high, 0, 255)
+
+
+def _nearest(pixels, palette):
+    """Índice da entrada mais próxima da paleta: (N, 16, C) x (N, P, C) -> (N, 16)"""
+    diff = pixels[:, :, None, :] - palette[:, None, :, :]
+    return np.einsum("nkpc,nkpc->nkp", diff, diff).argmin(2)
+
+
+def _pack_indices(indices, bits):
+    """Concatena índices (N, K) de `bits` bits cada, o primeiro nos bits menos significativos"""
+    shifts = np.arange(indices.shape[1], dtype=np.uint64) * np.uint64(bits)
+    return np.bitwise_or.reduce(indices.astype(np.uint64) << shifts, axis=1)
+
+
+def _unpack_indices(value, count, bits):
+    shifts = np.arange(count, dtype=np.uint64) * np.uint64(bits)
+    return ((value[:, None] >> shifts) & np.uint64((1 << bits) - 1)).astype(np.int32)
+
+
+def _put_bits(lo, hi, value, offset, width):
+    """Grava `value` (width bits) no inteiro de 128 bits formado por (lo, hi)"""
+    value = value.astype(np.uint64) & np.uint64((1 << width) - 1)
+    if offset >= 64:
+        hi |= value << np.uint64(offset - 64)
+    else:
+        lo |= value << np.uint64(offset)
+        if offset + width > 64:
+            hi |= value >> np.uint64(64 - offset)
+
+
+def _get_bits(lo, hi, offset, width):
+    mask = np.uint64((1 << width) - 1)
+    if offset >= 64:
+        return ((hi >> np.uint64(offset - 64)) & mask).astype(np.int32)
+    value = lo >> np.uint64(offset)
+    if offset + width > 64:
+        value |= hi << np.uint64(64 - offset)
+    return (value & mask).astype(np.int32)
+
+
+# --- BC1 / BC3 -------------------------------------------------------------
+
+def _to565(rgb):
+    r = np.rint(rgb[:, 0] * 31 / 255).astype(np.uint16)
+    g = np.rint(rgb[:, 1] * 63 / 255).astype(np.uint16)
+    b = np.rint(rgb[:, 2] * 31 / 255).astype(np.uint16)
+    return (r << 11) | (g << 5) | b
+
+
+def _from565(color):
+    color = color.astype(np.int32)
+    r, g, b = color >> 11 & 31, color >> 5 & 63, color & 31
+    return np.stack([(r << 3) | (r >> 2), (g << 2) | (g >> 4), (b << 3) | (b >> 2)], axis=-1)
+
+
+def _bc1_palette(c0, c1, four_color):
+    """Paleta (N, 4, 4) RGBA decodificada a partir dos extremos 565"""
+    e0, e1 = _from565(c0), _from565(c1)
+    opaque = np.full(e0.shape[:1] + (1,), 255, dtype=np.int32)
+    e0, e1 = np.concatenate([e0, opaque], 1), np.concatenate([e1, opaque], 1)
+    four = (e0, e1, (2 * e0 + e1) // 3, (e0 + 2 * e1) // 3)
+    three = (e0, e1, (e0 + e1) // 2, np.zeros_like(e0))
+    return np.where(four_color[:, None, None], np.stack(four, 1), np.stack(three, 1))
+
+
+def _encode_bc1_colors(blocks, allow_transparent):
+    """
+    Codifica a parte de cor (8 bytes) de BC1/BC3
+    :return: Array uint64 (N,) com c0 | c1 << 16 | índices << 32
+    """
+    rgb = blocks[..., :3].astype(np.float32)
+    transparent = blocks[..., 3] < 128 if allow_transparent else np.zeros(blocks.shape[:2], dtype=bool)
+    has_transparent = transparent.any(1)
+
+    low, high = _principal_endpoints(rgb, ~transparent)
+    c0, c1 = _to565(high), _to565(low)
+
+    # Modo de 4 cores exige c0 > c1; o de 3 cores (com transparência) exige c0 <= c1
+    swap = np.where(has_transparent, c0 > c1, c0 < c1)
+    c0, c1 = np.where(swap, c1, c0), np.where(swap, c0, c1)
+    four_color = ~has_transparent & (c0 > c1)
+
+    palette = _bc1_palette(c0, c1, four_color)[..., :3].astype(np.float32)
+    if allow_transparent:
+        # Pixels opacos nunca usam a entrada 3 (preto transparente) no modo de 3 cores
+        palette[:, 3] = np.where(four_color[:, None], palette[:, 3], 1e6)
+    indices = _nearest(rgb, palette)
+    indices = np.where(transparent, 3, indices)
+    indices = np.where((c0 == c1)[:, None] & ~transparent, 0, indices)
+
+    return c0.astype(np.uint64) | (c1.astype(np.uint64) << np.uint64(16)) | (_pack_indices(indices, 2) << np.uint64(32))
+
+
+def _decode_bc1_colors(value, allow_transparent):
+    c0 = (value & np.uint64(0xFFFF)).astype(np.uint16)
+    c1 = (value >> np.uint64(16) & np.uint64(0xFFFF)).astype(np.uint16)
+    four_color = (c0 > c1) | (not allow_transparent)
+    palette = _bc1_palette(c0, c1, four_color)
+    indices = _unpack_indices(value >> np.uint64(32), 16, 2)
+    return np.take_along_axis(palette, indices[..., None], 1)
+
+
+def _encode_bc4_alpha(alpha):
+    """Bloco de alfa de 8 bytes do BC3 (modo de 8 valores interpolados)"""
+    alpha = alpha.astype(np.int32)
+    a0, a1 = alpha.max(1), alpha.min(1)
+    palette = _bc4_palette(a0, a1).astype(np.float32)
+    indices = _nearest(alpha[..., None].astype(np.float32), palette[..., None])
+    indices = np.where((a0 == a1)[:, None], 0, indices)
+    return a0.astype(np.uint64) | (a1.astype(np.uint64) << np.uint64(8)) | (_pack_indices(indices, 3) << np.uint64(16))
+
+
+def _bc4_palette(a0, a1):
+    steps = np.arange(1, 7, dtype=np.int32)
+    eight = [a0, a1] + [((7 - i) * a0 + i * a1) // 7 for i in steps]
+    six = [a0, a1] + [((5 - i) * a0 + i * a1) // 5 for i in steps[:4]] + [np.zeros_like(a0), np.full_like(a0, 255)]
+    return np.where((a0 > a1)[:, None], np.stack(eight, 1), np.stack(six, 1))
+
+
+def _decode_bc4_alpha(value):
+    a0 = (value & np.uint64(0xFF)).astype(np.int32)
+    a1 = (value >> np.uint64(8) & np.uint64(0xFF)).astype(np.int32)
+    indices = _unpack_indices(value >> np.uint64(16), 16, 3)
+    return np.take_along_axis(_bc4_palette(a0, a1), indices, 1)
+
+
+def _encode_bc1(blocks):
+    return _encode_bc1_colors(blocks, allow_transparent=True).view(np.uint8)
+
+
+def _encode_bc3(blocks):
+    out = np.empty((len(blocks), 2), dtype=np.uint64)
+    out[:, 0] = _encode_bc4_alpha(blocks[..., 3])
+    out[:, 1] = _encode_bc1_colors(blocks, allow_transparent=False)
+    return out.view(np.uint8)
+
+
+def _decode_bc1(data):
+    value = np.frombuffer(data, dtype="<u8")
+    return _decode_bc1_colors(value, allow_transparent=True)
+
+
+def _decode_bc3(data):
+    value = np.frombuffer(data, dtype="<u8").reshape(-1, 2)
+    pixels = _decode_bc1_colors(value[:, 1], allow_transparent=False)
+    pixels[..., 3] = _decode_bc4_alpha(value[:, 0])
+    return pixels
+
+
+# --- BC7 (modo 6: um subconjunto, RGBA 7.7.7.7 + p-bit, índices de 4 bits) ---
+
+def _bc7_quantize(endpoint):
+    """Quantiza um extremo RGBA para 7 bits + p-bit compartilhado, escolhendo o melhor p"""
+    best_q, best_p, best_err = None, None, None
+    for p in (0, 1):
+        q = np.clip(np.rint((endpoint - p) / 2), 0, 127)
+        err = ((2 * q + p - endpoint) ** 2).sum(1)
+        if best_err is None:
+            best_q, best_p, best_err = q, np.zeros(len(q), dtype=np.int32), err
+        else:
+            better = err < best_err
+            best_q = np.where(better[:, None], q, best_q)
+            best_p = np.where(better, 1, best_p)
+            best_err = np.minimum(err, best_err)
+    return best_q.astype(np.int32), best_p
+
+
+def _bc7_palette(e0, e1):
+    w = _BC7_WEIGHTS[None, :, None]
+    return ((64 - w) * e0[:, None, :] + w * e1[:, None, :] + 32) >> 6
+
+
+def _encode_bc7(blocks):
+    pixels = blocks.astype(np.float32)
+    low, high = _principal_endpoints(pixels)
+    q0, p0 = _bc7_quantize(low)
+    q1, p1 = _bc7_quantize(high)
+
+    palette = _bc7_palette(2 * q0 + p0[:, None], 2 * q1 + p1[:, None]).astype(np.float32)
+    indices = _nearest(pixels, palette)
+
+    # O primeiro índice (âncora) tem o bit mais alto implícito em 0
+    flip = indices[:, 0] >= 8
+    q0, q1 = np.where(flip[:, None], q1, q0), np.where(flip[:, None], q0, q1)
+    p0, p1 = np.where(flip, p1, p0), np.where(flip, p0, p1)
+    indices = np.where(flip[:, None], 15 - indices, indices)
+
+    lo = np.zeros(len(blocks), dtype=np.uint64)
+    hi = np.zeros(len(blocks), dtype=np.uint64)
+    _put_bits(lo, hi, np.full(len(blocks), 1 << 6), 0, 7)
+    offset = 7
+    for channel in range(4):
+        _put_bits(lo, hi, q0[:, channel], offset, 7)
+        _put_bits(lo, hi, q1[:, channel], offset + 7, 7)
+        offset += 14
+    _put_bits(lo, hi, p0, 63, 1)
+    _put_bits(lo, hi, p1, 64, 1)
+    _put_bits(lo, hi, indices[:, 0], 65, 3)
+    for k in range(1, 16):
+        _put_bits(lo, hi, indices[:, k], 68 + 4 * (k - 1), 4)
+
+    return np.stack([lo, hi], axis=1).astype("<u8").view(np.uint8)
+
+
+def _decode_bc7(data):
+    value = np.frombuffer(data, dtype="<u8").reshape(-1, 2)
+    lo, hi = value[:, 0].astype(np.uint64), value[:, 1].astype(np.uint64)
+    if not np.all(_get_bits(lo, hi, 0, 7) == 1 << 6):
+        raise ValueError("Apenas blocos BC7 no modo 6 são suportados.")
+
+    e0 = np.stack([_get_bits(lo, hi, 7 + 14 * c, 7) for c in range(4)], 1) * 2 + _get_bits(lo, hi, 63, 1)[:, None]
+    e1 = np.stack([_get_bits(lo, hi, 14 + 14 * c, 7) for c in range(4)], 1) * 2 + _get_bits(lo, hi, 64, 1)[:, None]
+    indices = np.stack(
+        [_get_bits(lo, hi, 65, 3)] + [_get_bits(lo, hi, 68 + 4 * (k - 1), 4) for k in range(1, 16)], 1
+    )
+    return np.take_along_axis(_bc7_palette(e0, e1), indices[..., None], 1)
+
+
+_ENCODERS = {"bc1": _encode_bc1, "bc3": _encode_bc3, "bc7": _encode_bc7}
+_DECODERS = {"bc1": _decode_bc1, "bc3": _decode_bc3, "bc7": _decode_bc7}
+
+
+# --- API -------------------------------------------------------------------
+
+def compress(rgba, fmt="bc3", pool=None):
+    """
+    Comprime uma imagem RGBA em blocos BCn
+    :param rgba: Array (H, W, 4) uint8
+    :param fmt: 'bc1', 'bc3' ou 'bc7'
+    :param pool: ThreadPoolExecutor opcional; os blocos são divididos em lotes entre as threads
+    :return: bytes com os blocos em ordem de linhas
+    """
+    encoder = _ENCODERS[fmt]
+    blocks = to_blocks(rgba)
+    chunks = [blocks[i:i + _CHUNK_BLOCKS] for i in range(0, len(blocks), _CHUNK_BLOCKS)]
+
+    if pool is None or len(chunks) == 1:
+        encoded = [encoder(chunk) for chunk in chunks]
+    else:
+        encoded = list(pool.map(encoder, chunks))
+    return b"".join(chunk.tobytes() for chunk in encoded)
+
+
+def decompress(data, width, height, fmt="bc3"):
+    """Decodifica blocos BCn de volta para um array (H, W, 4) uint8"""
+    pixels = _DECODERS[fmt](data)
+    return from_blocks(pixels.astype(np.uint8), width, height)
+
+
+def write_dds(path, rgba, fmt="bc3", premultiply=True, mipmaps=True):
+    """
+    Salva a imagem como textura DDS comprimida em blocos, pronta para a GPU.
+    BC1/BC3 usam o cabeçalho clássico (DXT1/DXT5); BC7 usa o cabeçalho DX10,
+    que também registra se o alfa é pré-multiplicado.
+    :param path: Caminho do arquivo .dds
+    :param rgba: Array (H, W, 4) uint8
+    :param fmt: 'bc1', 'bc3' ou 'bc7'
+    :param premultiply: Pré-multiplica RGB pelo alfa antes de comprimir
+    :param mipmaps: Gera a cadeia completa de mipmaps
+    """
+    if fmt not in BLOCK_BYTES:
+        raise ValueError(f"Formato DDS desconhecido: {fmt}")
+
+    height, width = rgba.shape[:2]
+    if premultiply:
+        rgba = premultiply_alpha(rgba)
+    levels = build_mip_chain(rgba, premultiplied=premultiply) if mipmaps else [rgba]
+
+    with ThreadPoolExecutor() as pool:
+        payload = [compress(level, fmt, pool) for level in levels]
+
+    linear_size = ((width + 3) // 4) * ((height + 3) // 4) * BLOCK_BYTES[fmt]
+    caps = _DDSCAPS_TEXTURE | (_DDSCAPS_MIPMAP if len(levels) > 1 else 0)
+    fourcc = b"DX10" if fmt == "bc7" else _FOURCC[fmt]
+
+    header = struct.pack(
+        "<7I44x8I5I",
+        124, _DDSD_FLAGS, height, width, linear_size, 0, len(levels),
+        32, _DDPF_FOURCC, struct.unpack("<I", fourcc)[0], 0, 0, 0, 0, 0,
+        caps, 0, 0, 0, 0
+    )
+
+    with open(path, "wb") as f:
+        f.write(_DDS_MAGIC + header)
+        if fmt == "bc7":
+            alpha_mode = _DDS_ALPHA_MODE_PREMULTIPLIED if premultiply else _DDS_ALPHA_MODE_STRAIGHT
+            f.write(struct.pack("<5I", _DXGI_BC7_UNORM, 3, 0, 1, alpha_mode))
+        for chunk in payload:
+            f.write(chunk)
+
+    logging.info(f"🧊 DDS {fmt.upper()} salvo: {path} ({width}x{height}, {len(levels)} mips)")
+
+
+def read_dds(path):
+    """
+    Lê um DDS gravado por write_dds e decodifica todos os níveis
+    :return: (fmt, lista de arrays (H, W, 4) uint8 do maior para o menor)
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if data[:4] != _DDS_MAGIC:
+        raise ValueError("Arquivo não é um DDS.")
+
+    fields = struct.unpack("<7I44x8I5I", data[4:128])
+    height, width, mip_count, fourcc = fields[2], fields[3], max(1, fields[6]), fields[9]
+    offset = 128
+
+    fourcc = struct.pack("<I", fourcc)
+    if fourcc == b"DX10":
+        dxgi = struct.unpack("<I", data[128:132])[0]
+        if dxgi != _DXGI_BC7_UNORM:
+            raise ValueError(f"DXGI_FORMAT não suportado: {dxgi}")
+        fmt = "bc7"
+        offset += 20
+    else:
+        fmt = {v: k for k, v in _FOURCC.items()}.get(fourcc)
+        if fmt is None:
+            raise ValueError(f"FourCC não suportado: {fourcc!r}")
+
+    levels = []
+    w, h = width, height
+    for _ in range(mip_count):
+        size = ((w + 3) // 4) * ((h + 3) // 4) * BLOCK_BYTES[fmt]
+        levels.append(decompress(data[offset:offset + size], w, h, fmt))
+        offset += size
+        w, h = max(1, w // 2), max(1, h // 2)
+    return fmt, levels
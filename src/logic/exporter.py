@@ -1,133 +1,398 @@
 # src/logic/exporter.py
 
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
 from PIL import Image
+import numpy as np
+import os
 import logging
 
+from src.logic.keying import color_to_rgb
+from src.logic.dds import write_dds
+from src.logic.animation import ANIMATION_EXTENSIONS, write_apng, write_gif
+from src.logic.atlas import write_atlas
+from src.logic.metrics import metrics
+from src.logic.frame_pool import process_frames
+from src.logic.pipeline import Pipeline, Crop, Erase, Key, Trim, Align, DEFAULT_ALIGN
+
 print("📦 [INFO] Carregando módulo: Exporter...")
 
+# Abaixo disso abrir os processos custa mais que recortar tudo em série
+MIN_PARALLEL_FRAMES = 32
+
+
+def _rect_tuple(rect):
+    """QRect ou tupla (x, y, w, h) -> tupla (x, y, w, h)"""
+    if hasattr(rect, "x"):
+        return rect.x(), rect.y(), rect.width(), rect.height()
+    x, y, width, height = rect
+    return int(x), int(y), int(width), int(height)
+
+
+def build_pipeline(config=None, erase_mask=None, crop=True):
+    """
+    Monta o pipeline de um frame a partir da configuração da exportação:
+    recorte, regiões apagadas, cor-chave, trim opcional, alinhamento e as
+    etapas extras em config["stages"]
+    :param config: Dicionário com remove_background, bg_color, trim, align_config e stages
+    :param crop: False quando a origem já é o próprio frame (add_image)
+    """
+    config = config or {}
+    stages = [Crop()] if crop else []
+    if erase_mask is not None:
+        stages.append(Erase(erase_mask))
+    if config.get("remove_background"):
+        stages.append(Key(config["bg_color"]))
+    if config.get("trim"):
+        stages.append(Trim())
+    stages.append(Align(config.get("align_config", DEFAULT_ALIGN)))
+    stages.extend(config.get("stages", ()))
+    return Pipeline(stages)
+
+
+def process_frame(source, rect, config=None, erase_mask=None, allocate=None):
+    """
+    Processa um frame da origem numa única passada.
+    Função de módulo para também rodar nos processos de process_frames.
+    :param source: Array (H, W, 4) uint8 da imagem de origem
+    :param rect: (x, y, w, h) do frame
+    :param allocate: Onde escrever o resultado (ver pipeline.render)
+    :return: (pixels (h, w, 4) uint8, metadados do frame)
+    """
+    pixels, plan = build_pipeline(config, erase_mask).run(source, rect, allocate)
+    return pixels, plan.info()
+
+
+def frame_capacity(source, rect, config=None):
+    """Bytes que o frame pode ocupar no máximo (antes do trim, que só reduz)"""
+    width, height = build_pipeline(config).max_size(source, rect)
+    return width * height * 4
+
+
 class SpriteSheetExporter:
-    def __init__(self, image_path):
+    def __init__(self, image_path=None, dds_format="bc3", stages=None):
+        """
+        :param image_path: Imagem de origem dos recortes; None quando os frames
+                           chegam prontos via add_image (ex.: pasta de imagens soltas)
+        :param dds_format: Compressão usada quando a saída termina em .dds ('bc1', 'bc3' ou 'bc7')
+        :param stages: Etapas extras do pipeline (src/logic/pipeline.py) aplicadas
+                       depois do alinhamento em todos os frames, ex.: [Pad(2), Extrude(1)]
+        """
         self.image_path = image_path
-        self.original_image = Image.open(image_path).convert("RGBA")
+        self.dds_format = dds_format
+        self.stages = list(stages or [])
+        self.original_image = None
+        self.source = None
         self.frames = []
+        self.frame_info = []  # Metadados de cada frame (retângulo, trim, conteúdo)
+        self.frame_names = []  # Nome de cada frame no atlas; None = 'sheet_000'
 
-        logging.info(f"🖼️ Imagem carregada: {image_path} ({self.original_image.size})")
+        if image_path:
+            self.original_image = Image.open(image_path).convert("RGBA")
+            self.source = np.asarray(self.original_image)
+            logging.info(f"🖼️ Imagem carregada: {image_path} ({self.original_image.size})")
 
-    def add_frame(self, rect, config=None):
+    def _frame_config(self, config):
+        config = dict(config or {})
+        if self.stages:
+            config["stages"] = list(config.get("stages", ())) + self.stages
+        return config
+
+    def add_frame(self, rect, config=None, name=None):
         """
         Adiciona um frame com base na seleção feita no Canvas
-        :param rect: QRect com as coordenadas em escala real
+        :param rect: QRect ou tupla (x, y, w, h) com as coordenadas em escala real
         :param config: Dicionário com configurações de fundo e alinhamento
+        :param name: Nome do frame no atlas (opcional)
         """
-        x = rect.x()
-        y = rect.y()
-        width = rect.width()
-        height = rect.height()
-        box = (x, y, x + width, y + height)
+        rect = _rect_tuple(rect)
 
         try:
-            frame = self.original_image.crop(box)
-
-            if config and config.get("remove_background"):
-                bg_color = config["bg_color"]
-                frame = self._remove_background(frame, bg_color)
+            config = self._frame_config(config)
+            pixels, info = process_frame(self.source, rect, config, config.get("erase_mask"))
+            self._append(pixels, info, name)
+            logging.debug(f"✂️ Frame adicionado: {rect}")
 
-            align_config = config.get("align_config", {
-                "horizontal": "center",
-                "vertical": "bottom",
-                "uniform": True
-            })
-
-            if align_config.get("uniform", False):
-                max_dim = max(frame.width, frame.height)
-                base = Image.new("RGBA", (max_dim, max_dim), (0, 0, 0, 0))
+        except Exception as e:
+            logging.error(f"❌ Erro ao adicionar frame: {e}", exc_info=True)
 
-                h_align = align_config.get("horizontal", "center")
-                v_align = align_config.get("vertical", "bottom")
+    def add_frames(self, rects, config=None, align_configs=None, workers=None, names=None):
+        """
+        Adiciona vários frames de uma vez. Com mais de um worker, o pipeline de
+        cada frame roda em processos que leem a imagem de memória compartilhada
+        (ver src/logic/frame_pool.py), no lugar de add_frame em série.
+        :param rects: QRects ou tuplas (x, y, w, h) em escala real
+        :param config: Configuração de fundo (e erase_mask) comum a todos os frames
+        :param align_configs: Um dicionário de alinhamento por frame; None usa o de config
+        :param workers: Número de processos; None = número de CPUs, 1 = em série
+        :param names: Nome de cada frame no atlas (opcional)
+        """
+        config = config or {}
+        rects = [_rect_tuple(rect) for rect in rects]
+        names = list(names) if names is not None else [None] * len(rects)
+        if align_configs is None:
+            configs = [config] * len(rects)
+        else:
+            configs = [dict(config, align_config=align) for align in align_configs]
 
-                # Cálculo das coordenadas com base no alinhamento
-                x_off = {
-                    "left": 0,
-                    "center": (max_dim - frame.width) // 2,
-                    "right": max_dim - frame.width
-                }[h_align]
+        workers = min(workers or os.cpu_count() or 1, len(rects))
+        with metrics.timed("export.frames"):
+            if workers > 1 and len(rects) >= MIN_PARALLEL_FRAMES:
+                try:
+                    self._add_frames_parallel(rects, configs, config.get("erase_mask"), workers, names)
+                    return
+                except Exception as e:
+                    logging.warning(f"⚠️ Processamento paralelo falhou, seguindo em série: {e}")
 
-                y_off = {
-                    "top": 0,
-                    "center": (max_dim - frame.height) // 2,
-                    "bottom": max_dim - frame.height
-                }[v_align]
+            for rect, frame_config, name in zip(rects, configs, names):
+                self.add_frame(rect, frame_config, name)
 
-                base.paste(frame, (x_off, y_off), frame)
-                frame = base
+    def _add_frames_parallel(self, rects, configs, erase_mask, workers, names):
+        # Só o que os workers usam: a máscara já vai por memória compartilhada
+        worker_configs = []
+        for frame_config in configs:
+            frame_config = {key: value for key, value in self._frame_config(frame_config).items()
+                            if key != "erase_mask"}
+            if "bg_color" in frame_config:
+                frame_config["bg_color"] = color_to_rgb(frame_config["bg_color"])
+            worker_configs.append(frame_config)
 
-            self.frames.append(frame)
-            logging.debug(f"✂️ Frame adicionado: {box}")
+        capacities = [frame_capacity(self.source, rect, frame_config)
+                      for rect, frame_config in zip(rects, worker_configs)]
 
-        except Exception as e:
-            logging.error(f"❌ Erro ao adicionar frame: {e}", exc_info=True)
+        results = process_frames(
+            self.source, rects, worker_configs, capacities,
+            process_frame, erase_mask=erase_mask, workers=workers
+        )
+        for (pixels, info), name in zip(results, names):
+            self._append(pixels, info, name)
+        logging.info(f"✂️ {len(results)} frames processados em {workers} processos")
 
-    def _remove_background(self, image, color):
+    def add_image(self, frame, config=None, name=None):
         """
-        Remove uma cor específica da imagem e substitui por transparência
-        :param image: Imagem PIL.Image
-        :param color: QColor com a cor a ser removida
+        Adiciona um frame já recortado, aplicando remoção de fundo e alinhamento
+        :param frame: PIL.Image do frame
+        :param config: Dicionário com configurações de fundo e alinhamento
+        :param name: Nome do frame no atlas (opcional)
         """
-        r, g, b = color.red(), color.green(), color.blue()
-        data = image.getdata()
-
-        new_data = []
-        for pixel in data:
-            if len(pixel) == 4:
-                pr, pg, pb, pa = pixel
-            else:
-                pr, pg, pb = pixel
-                pa = 255
-
-            if pr == r and pg == g and pb == b:
-                new_data.append((0, 0, 0, 0))  # Transparente
-            else:
-                new_data.append(pixel)
+        if frame.mode != "RGBA":
+            frame = frame.convert("RGBA")
+        pixels, plan = build_pipeline(self._frame_config(config), crop=False).run(np.asarray(frame))
+        self._append(pixels, plan.info(), name)
 
-        image = image.copy()
-        image.putdata(new_data)
-        return image
+    def _append(self, pixels, info, name=None):
+        # fromarray reaproveita o buffer do pipeline: nenhuma cópia a mais por frame
+        self.frames.append(Image.fromarray(pixels, "RGBA"))
+        self.frame_info.append(info)
+        self.frame_names.append(name)
 
-    def export(self, output_path, layout="horizontal"):
+    def export(self, output_path, layout="horizontal", scales=None, frame_duration=100, loop=0, atlas=True):
         """
         Exporta todos os frames como spritesheet
-        :param output_path: Caminho onde será salvo
+        :param output_path: Caminho onde será salvo; '.apng' ou '.gif' gera uma animação
         :param layout: 'horizontal' ou 'vertical'
+        :param scales: Fatores de escala gerados na mesma passada (ex.: [1, 0.5, 0.25]);
+                       escalas diferentes de 1 são salvas como 'nome@0.5x.png'
+        :param frame_duration: Duração de cada frame das animações, em ms (número ou lista)
+        :param loop: Repetições das animações (0 = infinito)
+        :param atlas: Grava também os metadados dos frames ('sheet.json' no formato
+                      do TexturePacker e o índice binário 'sheet.atlas', ver src/logic/atlas.py)
         """
+        if output_path.lower().endswith(ANIMATION_EXTENSIONS):
+            return self.export_animation(output_path, frame_duration, loop)
+
         count = len(self.frames)
         if count == 0:
             logging.warning("⚠️ Nenhum frame foi adicionado.")
             return False
 
-        max_width = max(f.width for f in self.frames)
-        max_height = max(f.height for f in self.frames)
-
-        sheet_size = (
-            max_width * count if layout == "horizontal" else max_width,
-            max_height if layout == "horizontal" else max_height * count
-        )
-
-        sheet = Image.new("RGBA", sheet_size, (0, 0, 0, 0))
+        scales = list(scales) if scales else [1.0]
 
         try:
-            if layout == "horizontal":
-                for i, frame in enumerate(self.frames):
-                    sheet.paste(frame, (i * max_width, 0), frame)
-            elif layout == "vertical":
-                for i, frame in enumerate(self.frames):
-                    sheet.paste(frame, (0, i * max_height), frame)
-            else:
+            if layout not in ("horizontal", "vertical"):
                 raise ValueError(f"Layout desconhecido: {layout}")
+            invalid = [scale for scale in scales if not scale > 0]
+            if invalid:
+                raise ValueError(f"Escalas precisam ser positivas: {invalid}")
+            # [1, 1.0] gravaria duas vezes o mesmo arquivo em paralelo
+            scales = list(dict.fromkeys(float(scale) for scale in scales))
+            # Nomes validados antes de gravar qualquer arquivo: nada de exportação pela metade
+            names = self._atlas_names(output_path) if atlas else None
+
+            with metrics.timed("export"), ThreadPoolExecutor() as pool:
+                # Reamostra cada frame (e não a folha pronta) para não vazar pixels entre células
+                scaled_jobs = {
+                    scale: [pool.submit(self._scale_frame, frame, scale) for frame in self.frames]
+                    for scale in scales
+                }
+
+                save_jobs = []
+                for scale in scales:
+                    frames = [job.result() for job in scaled_jobs[scale]]
+                    positions, sheet_size = self._cell_positions(len(frames), self._cell_size(scale), layout)
+                    sheet = self._compose_sheet(frames, positions, sheet_size)
+                    path = self._scaled_path(output_path, scale)
+                    save_jobs.append(pool.submit(self._save_sheet, sheet, path))
+                    if atlas:
+                        entries = self._atlas_entries(frames, positions, names)
+                        save_jobs.append(pool.submit(write_atlas, path, entries, sheet.size, scale))
+
+                for job in save_jobs:
+                    job.result()
 
-            sheet.save(output_path, "PNG")
-            logging.info(f"💾 Spritesheet salva em: {output_path}")
             return True
 
         except Exception as e:
             logging.error(f"❌ Erro ao salvar spritesheet: {e}", exc_info=True)
             return False
+
+    def export_animation(self, output_path, frame_duration=100, loop=0):
+        """
+        Exporta os frames como animação: APNG ('.apng') ou GIF ('.gif').
+        Cada frame ocupa o canto superior esquerdo de uma tela do tamanho do
+        maior frame, como as células da spritesheet, e é gravado só com o
+        retângulo que mudou em relação ao anterior (ver src/logic/animation.py).
+        :param frame_duration: Duração de cada frame em ms (número ou lista)
+        :param loop: Repetições (0 = infinito)
+        """
+        if not self.frames:
+            logging.warning("⚠️ Nenhum frame foi adicionado.")
+            return False
+
+        if isinstance(frame_duration, (list, tuple)):
+            durations = list(frame_duration)
+            if len(durations) != len(self.frames):
+                logging.error(f"❌ {len(durations)} durações para {len(self.frames)} frames.")
+                return False
+        else:
+            durations = [frame_duration] * len(self.frames)
+
+        try:
+            with metrics.timed("export"):
+                frames = self._animation_frames()
+                with metrics.timed("export.save"):
+                    if output_path.lower().endswith(".gif"):
+                        write_gif(output_path, frames, durations, loop)
+                    else:
+                        write_apng(output_path, frames, durations, loop)
+            return True
+
+        except Exception as e:
+            logging.error(f"❌ Erro ao salvar animação: {e}", exc_info=True)
+            return False
+
+    def _animation_frames(self):
+        """Frames como arrays RGBA do mesmo tamanho (o do maior frame)"""
+        width = max(f.width for f in self.frames)
+        height = max(f.height for f in self.frames)
+
+        frames = []
+        for frame in self.frames:
+            pixels = np.asarray(frame)
+            if frame.size != (width, height):
+                canvas = np.zeros((height, width, 4), dtype=np.uint8)
+                canvas[:frame.height, :frame.width] = pixels
+                pixels = canvas
+            frames.append(np.ascontiguousarray(pixels))
+        return frames
+
+    def _scale_frame(self, frame, scale):
+        """Reamostra um frame; reduções usam média por área (BOX), ampliações mantêm os pixels"""
+        if scale == 1:
+            return frame
+
+        size = (max(1, round(frame.width * scale)), max(1, round(frame.height * scale)))
+        resample = Image.BOX if scale < 1 else Image.NEAREST
+        return frame.resize(size, resample)
+
+    def _cell_size(self, scale=1.0):
+        """
+        Tamanho da célula na escala: o maior frame reescalado de uma vez (e não
+        cada frame arredondado por conta própria), então as folhas @Nx alinham com
+        a 1x. Como o arredondamento é monótono, todo frame reescalado cabe nela.
+        """
+        max_width = max(f.width for f in self.frames)
+        max_height = max(f.height for f in self.frames)
+        if scale == 1:
+            return max_width, max_height
+        return max(1, round(max_width * scale)), max(1, round(max_height * scale))
+
+    def _cell_positions(self, count, cell_size, layout):
+        """
+        Células do tamanho do maior frame, lado a lado (horizontal) ou empilhadas (vertical)
+        :return: (canto de cada frame na folha, tamanho da folha)
+        """
+        cell_width, cell_height = cell_size
+        if layout == "horizontal":
+            return [(i * cell_width, 0) for i in range(count)], (cell_width * count, cell_height)
+        return [(0, i * cell_height) for i in range(count)], (cell_width, cell_height * count)
+
+    def _compose_sheet(self, frames, positions, sheet_size):
+        """Cola os frames nas posições das células"""
+        with metrics.timed("export.compose"):
+            return self._paste_frames(frames, positions, sheet_size)
+
+    def _paste_frames(self, frames, positions, sheet_size):
+        sheet = Image.new("RGBA", sheet_size, (0, 0, 0, 0))
+        for frame, position in zip(frames, positions):
+            sheet.paste(frame, position)  # Células não se sobrepõem: copia RGBA sem compor
+        return sheet
+
+    def _atlas_names(self, output_path):
+        """
+        Nome de cada frame no atlas; sem nome, 'sheet_000', 'sheet_001'...
+        :raises ValueError: Nomes repetidos (o JSON perderia frames e o índice não os aceita)
+        """
+        stem = os.path.splitext(os.path.basename(output_path))[0]
+        names = [name or f"{stem}_{i:03d}" for i, name in enumerate(self.frame_names)]
+        repeated = sorted(name for name, count in Counter(names).items() if count > 1)
+        if repeated:
+            raise ValueError(f"Nomes de frames repetidos no atlas: {repeated[:5]}")
+        return names
+
+    def _atlas_entries(self, frames, positions, names):
+        """
+        Metadados de cada frame nesta escala: retângulo do conteúdo na folha,
+        deslocamento dele dentro do frame, tamanho do frame e pivot
+        :param frames: Frames já na escala da folha
+        :param names: Nomes únicos, de _atlas_names
+        """
+        entries = []
+        for i, (frame, (px, py), info) in enumerate(zip(frames, positions, self.frame_info)):
+            width, height = info["size"]
+            dx, dy, content_w, content_h = info["content"]
+            sx, sy = frame.width / width, frame.height / height
+
+            # Conteúdo reescalado junto com o frame, limitado ao frame
+            x0 = min(frame.width, max(0, round(dx * sx)))
+            y0 = min(frame.height, max(0, round(dy * sy)))
+            x1 = min(frame.width, max(x0, round((dx + content_w) * sx)))
+            y1 = min(frame.height, max(y0, round((dy + content_h) * sy)))
+
+            entries.append({
+                "name": names[i],
+                "frame": (px + x0, py + y0, x1 - x0, y1 - y0),
+                "offset": (x0, y0),
+                "source_size": (frame.width, frame.height),
+                "pivot": tuple(info["pivot"])
+            })
+        return entries
+
+    def _scaled_path(self, output_path, scale):
+        """'sheet.png' -> 'sheet@0.5x.png' para escalas diferentes de 1"""
+        if scale == 1:
+            return output_path
+        root, ext = os.path.splitext(output_path)
+        return f"{root}@{scale:g}x{ext}"
+
+    def _save_sheet(self, sheet, path):
+        with metrics.timed("export.save"):
+            self._write_sheet(sheet, path)
+        logging.info(f"💾 Spritesheet salva em: {path}")
+
+    def _write_sheet(self, sheet, path):
+        if path.lower().endswith(".dds"):
+            # Textura comprimida com alfa pré-multiplicado e cadeia de mipmaps
+            write_dds(path, np.asarray(sheet), self.dds_format)
+        else:
+            sheet.save(path, "PNG")
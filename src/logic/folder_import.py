@@ -0,0 +1,54 @@
+# src/logic/folder_import.py
+
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+import os
+import re
+import logging
+
+print("📂 [INFO] Carregando módulo: FolderImport...")
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def _natural_key(name):
+    """Ordena 'walk_2.png' antes de 'walk_10.png'"""
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r"(\d+)", name)]
+
+
+def list_frame_files(folder):
+    """
+    Lista as imagens de uma pasta em ordem natural de nome
+    :param folder: Pasta com um arquivo por frame
+    """
+    names = [
+        name for name in os.listdir(folder)
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    ]
+    names.sort(key=_natural_key)
+    return [os.path.join(folder, name) for name in names]
+
+
+def _decode(path):
+    # convert() força a decodificação dentro da thread (o Pillow libera o GIL)
+    with Image.open(path) as image:
+        return image.convert("RGBA")
+
+
+def load_frames(folder, max_workers=None):
+    """
+    Decodifica todas as imagens da pasta em paralelo, preservando a ordem
+    :param folder: Pasta com um arquivo por frame
+    :param max_workers: Threads de decodificação (padrão do ThreadPoolExecutor)
+    :return: (caminhos decodificados, lista de PIL.Image em RGBA), na mesma ordem
+    """
+    paths = list_frame_files(folder)
+    if not paths:
+        logging.warning(f"⚠️ Nenhuma imagem encontrada em: {folder}")
+        return [], []
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        frames = list(pool.map(_decode, paths))
+
+    logging.info(f"📂 {len(frames)} frames carregados de: {folder}")
+    return paths, frames
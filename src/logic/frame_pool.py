@@ -0,0 +1,175 @@
+# src/logic/frame_pool.py
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+import multiprocessing
+import threading
+import atexit
+import logging
+import numpy as np
+
+print("🧵 [INFO] Carregando módulo: FramePool...")
+
+# Blocos de tarefas por worker: divide a carga sem multiplicar as mensagens entre processos
+_CHUNKS_PER_WORKER = 4
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+# Estado de cada processo worker: segmentos do bloco em andamento
+_attached = {"segments": [], "source": None, "mask": None, "output": None}
+
+
+def _get_pool(workers):
+    """
+    Pool de processos reaproveitado entre exportações (workers já com NumPy e
+    Pillow importados). Usa 'spawn': fork de um processo com Qt e threads não é seguro.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown()
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+atexit.register(shutdown_pool)
+
+
+def _attach(header):
+    """Abre os segmentos compartilhados da exportação neste worker"""
+    segments = []
+
+    source_shm = shared_memory.SharedMemory(name=header["source"])
+    segments.append(source_shm)
+    source = np.ndarray(header["source_shape"], dtype=np.uint8, buffer=source_shm.buf)
+
+    mask = None
+    if header["mask"]:
+        mask_shm = shared_memory.SharedMemory(name=header["mask"])
+        segments.append(mask_shm)
+        mask = np.ndarray(header["source_shape"][:2], dtype=bool, buffer=mask_shm.buf)
+
+    output_shm = shared_memory.SharedMemory(name=header["output"])
+    segments.append(output_shm)
+
+    _attached.update(segments=segments, source=source, mask=mask, output=output_shm.buf)
+
+
+def _detach():
+    """
+    Fecha os segmentos ao fim de cada bloco: um worker ocioso do pool não
+    pode manter mapeada a cópia da imagem e o buffer de saída de uma exportação
+    que já terminou (o unlink do processo principal só libera o nome)
+    """
+    segments = _attached["segments"]
+    _attached.update(segments=[], source=None, mask=None, output=None)
+    for segment in segments:
+        try:
+            segment.close()
+        except BufferError:
+            pass  # Alguma view ainda viva (ex.: traceback de um erro): o GC libera depois
+
+
+def _run_chunk(header, chunk):
+    """Processa um bloco de frames no worker, renderizando direto na faixa reservada da saída"""
+    _attach(header)
+    try:
+        process = header["process"]
+        output = _attached["output"]
+
+        results = []
+        for rect, config, offset, capacity in chunk:
+            def allocate(shape):
+                if shape[0] * shape[1] * shape[2] > capacity:
+                    raise ValueError(f"Frame {rect} passa dos {capacity} bytes reservados")
+                return np.ndarray(shape, dtype=np.uint8, buffer=output, offset=offset)
+
+            pixels, info = process(_attached["source"], rect, config, _attached["mask"], allocate)
+            results.append((pixels.shape, info))
+            del pixels  # Não segura views do segmento compartilhado
+        return results
+    finally:
+        output = allocate = None
+        _detach()
+
+
+def _shared_copy(array):
+    """Copia um array para um segmento novo de memória compartilhada"""
+    shm = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    return shm
+
+
+def process_frames(source, rects, configs, capacities, process, erase_mask=None, workers=2):
+    """
+    Processa frames em paralelo sem serializar a imagem: a origem (e a máscara
+    de apagados) vão para memória compartilhada, os workers recebem só os
+    retângulos e escrevem cada resultado numa faixa reservada de um buffer de
+    saída também compartilhado.
+    :param source: Array (H, W, 4) uint8 da imagem de origem
+    :param rects: Retângulos (x, y, w, h) de cada frame
+    :param configs: Configuração por frame, repassada a `process` (precisa ser serializável)
+    :param capacities: Máximo de bytes que cada frame pode ocupar
+    :param process: Função de módulo (source, rect, config, mask, allocate) -> (pixels, metadados)
+    :param erase_mask: Máscara booleana (H, W) opcional
+    :return: Lista de (pixels (h, w, 4) uint8, metadados), na ordem dos retângulos
+    """
+    offsets = np.cumsum([0] + list(capacities))
+    segments = []
+    try:
+        source_shm = _shared_copy(np.ascontiguousarray(source, dtype=np.uint8))
+        segments.append(source_shm)
+        mask_shm = None
+        if erase_mask is not None:
+            mask_shm = _shared_copy(np.ascontiguousarray(erase_mask, dtype=bool))
+            segments.append(mask_shm)
+        output_shm = shared_memory.SharedMemory(create=True, size=max(1, int(offsets[-1])))
+        segments.append(output_shm)
+
+        header = {
+            "source": source_shm.name,
+            "source_shape": source.shape,
+            "mask": mask_shm.name if mask_shm else None,
+            "output": output_shm.name,
+            "process": process
+        }
+        tasks = [(tuple(rect), config, int(offset), int(capacity))
+                 for rect, config, offset, capacity in zip(rects, configs, offsets, capacities)]
+
+        chunk_size = max(1, -(-len(tasks) // (workers * _CHUNKS_PER_WORKER)))
+        try:
+            pool = _get_pool(workers)
+            jobs = [pool.submit(_run_chunk, header, tasks[i:i + chunk_size])
+                    for i in range(0, len(tasks), chunk_size)]
+            shapes = [result for job in jobs for result in job.result()]
+        except BrokenProcessPool:
+            shutdown_pool()  # Um worker morreu: a próxima exportação abre um pool novo
+            raise
+
+        # Copia os resultados para fora antes de liberar o segmento
+        output = np.frombuffer(output_shm.buf, dtype=np.uint8, count=int(offsets[-1]))
+        frames = []
+        for offset, (shape, info) in zip(offsets, shapes):
+            count = shape[0] * shape[1] * 4
+            frames.append((output[offset:offset + count].reshape(shape).copy(), info))
+        del output
+        logging.debug(f"🧵 {len(frames)} frames processados em {workers} processos")
+        return frames
+
+    finally:
+        for segment in segments:
+            segment.close()
+            segment.unlink()
@@ -0,0 +1,99 @@
+# src/logic/grid.py
+
+import numpy as np
+import logging
+
+print("🔲 [INFO] Carregando módulo: Grid...")
+
+
+def compute_grid(image_width, image_height, cell_width=0, cell_height=0,
+                 rows=0, cols=0, margin=0, spacing=0, offset_x=0, offset_y=0):
+    """
+    Calcula a posição das células de uma grade regular
+    :param image_width: Largura real da imagem
+    :param image_height: Altura real da imagem
+    :param cell_width: Largura da célula (usada quando cols == 0)
+    :param cell_height: Altura da célula (usada quando rows == 0)
+    :param rows: Número de linhas (0 = derivado de cell_height)
+    :param cols: Número de colunas (0 = derivado de cell_width)
+    :param margin: Borda ignorada em volta da grade
+    :param spacing: Espaço entre células vizinhas
+    :param offset_x: Deslocamento horizontal extra da grade
+    :param offset_y: Deslocamento vertical extra da grade
+    :return: (xs, ys, cell_width, cell_height) com os inícios de colunas e linhas
+    """
+    left = margin + offset_x
+    top = margin + offset_y
+    if left < 0 or top < 0:
+        raise ValueError("Grade inválida: deslocamento fora da imagem.")
+
+    avail_w = image_width - left - margin
+    avail_h = image_height - top - margin
+
+    if cols > 0:
+        cell_width = (avail_w - spacing * (cols - 1)) // cols
+    if rows > 0:
+        cell_height = (avail_h - spacing * (rows - 1)) // rows
+
+    if cell_width <= 0 or cell_height <= 0:
+        raise ValueError("Grade inválida: células sem área útil.")
+
+    # Apenas células inteiras dentro da imagem
+    cols = max(0, (avail_w + spacing) // (cell_width + spacing)) if cols <= 0 else cols
+    rows = max(0, (avail_h + spacing) // (cell_height + spacing)) if rows <= 0 else rows
+
+    xs = left + np.arange(cols, dtype=np.int64) * (cell_width + spacing)
+    ys = top + np.arange(rows, dtype=np.int64) * (cell_height + spacing)
+    return xs, ys, int(cell_width), int(cell_height)
+
+
+def cell_opaque_counts(opaque, xs, ys, cell_width, cell_height):
+    """
+    Conta os pixels opacos de cada célula numa única redução vetorizada
+    :param opaque: Máscara booleana (H, W) dos pixels visíveis
+    :param xs: Início de cada coluna (passo constante)
+    :param ys: Início de cada linha (passo constante)
+    :return: Array (rows, cols) com a contagem de pixels opacos
+    """
+    rows, cols = len(ys), len(xs)
+    if rows == 0 or cols == 0:
+        return np.zeros((rows, cols), dtype=np.int64)
+
+    pitch_y = int(ys[1] - ys[0]) if rows > 1 else cell_height
+    pitch_x = int(xs[1] - xs[0]) if cols > 1 else cell_width
+
+    # Vista 4D (linha, y na célula, coluna, x na célula) sem copiar nem incluir o espaçamento
+    base = opaque[int(ys[0]):, int(xs[0]):]
+    row_stride, col_stride = base.strides
+    cells = np.lib.stride_tricks.as_strided(
+        base,
+        shape=(rows, cell_height, cols, cell_width),
+        strides=(pitch_y * row_stride, row_stride, pitch_x * col_stride, col_stride),
+        writeable=False
+    )
+    return np.count_nonzero(cells, axis=(1, 3))
+
+
+def slice_grid(opaque, skip_empty=True, **grid_params):
+    """
+    Gera os retângulos (x, y, w, h) de uma grade, ignorando células vazias
+    :param opaque: Máscara booleana (H, W) dos pixels visíveis
+    :param skip_empty: Descarta células sem nenhum pixel opaco
+    :param grid_params: Parâmetros repassados para compute_grid
+    :return: Lista de tuplas (x, y, w, h) em ordem de leitura
+    """
+    height, width = opaque.shape
+    xs, ys, cell_width, cell_height = compute_grid(width, height, **grid_params)
+
+    keep = np.ones((len(ys), len(xs)), dtype=bool)
+    if skip_empty:
+        keep = cell_opaque_counts(opaque, xs, ys, cell_width, cell_height) > 0
+
+    row_pos, col_pos = np.nonzero(keep)
+    rects = [
+        (int(x), int(y), cell_width, cell_height)
+        for x, y in zip(xs[col_pos], ys[row_pos])
+    ]
+
+    logging.info(f"🔲 Grade {len(ys)}x{len(xs)}: {len(rects)} células com conteúdo")
+    return rects
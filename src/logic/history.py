@@ -0,0 +1,194 @@
+# src/logic/history.py
+
+from collections import deque
+import zlib
+import logging
+import numpy as np
+
+print("⏪ [INFO] Carregando módulo: History...")
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Custo fixo contabilizado por comando (objeto Python + referências)
+_COMMAND_OVERHEAD = 256
+
+
+class Command:
+    """
+    Operação reversível que já foi aplicada ao canvas.
+    Cada subclasse guarda só o necessário para desfazer e refazer.
+    """
+
+    label = ""
+
+    def undo(self, canvas):
+        raise NotImplementedError
+
+    def redo(self, canvas):
+        raise NotImplementedError
+
+    @property
+    def nbytes(self):
+        return _COMMAND_OVERHEAD
+
+
+class SelectionsCommand(Command):
+    """Troca seleções e alinhamentos entre dois snapshots em colunas (rects int32 + códigos uint8)"""
+
+    def __init__(self, label, before, after):
+        self.label = label
+        self.before = before
+        self.after = after
+
+    def undo(self, canvas):
+        canvas.restore_selections(self.before)
+
+    def redo(self, canvas):
+        canvas.restore_selections(self.after)
+
+    @property
+    def nbytes(self):
+        return _COMMAND_OVERHEAD + sum(a.nbytes for a in self.before + self.after)
+
+
+class AppendSelectionsCommand(Command):
+    """Seleções acrescentadas no fim da lista: guarda só as novas"""
+
+    def __init__(self, label, start, added):
+        self.label = label
+        self.start = start
+        self.added = added
+
+    def undo(self, canvas):
+        canvas.truncate_selections(self.start)
+
+    def redo(self, canvas):
+        canvas.truncate_selections(self.start)
+        canvas.append_selections(self.added)
+
+    @property
+    def nbytes(self):
+        return _COMMAND_OVERHEAD + sum(a.nbytes for a in self.added)
+
+
+class KeyingCommand(Command):
+    """
+    Troca de cor-chave ou de remoção de fundo. A imagem exibida é sempre
+    derivada da original, então bastam os parâmetros, nunca uma cópia dos pixels.
+    """
+
+    def __init__(self, label, before, after):
+        self.label = label
+        self.before = before  # (remove_background, (r, g, b))
+        self.after = after
+
+    def undo(self, canvas):
+        canvas.restore_keying(*self.before)
+
+    def redo(self, canvas):
+        canvas.restore_keying(*self.after)
+
+
+class MaskDeltaCommand(Command):
+    """
+    Alteração da máscara de regiões apagadas guardada como delta: o XOR entre
+    antes e depois, recortado na caixa que mudou e compactado (packbits + zlib).
+    Como o XOR é sua própria inversa, desfazer e refazer aplicam o mesmo delta.
+    """
+
+    def __init__(self, label, delta):
+        """
+        :param delta: Máscara booleana do tamanho da imagem com os pixels que mudaram
+        """
+        self.label = label
+        self.shape = delta.shape
+
+        rows = np.flatnonzero(delta.any(axis=1))
+        cols = np.flatnonzero(delta.any(axis=0))
+        if len(rows) == 0:
+            self.box = (0, 0, 0, 0)
+            self.data = b""
+            return
+
+        y0, y1, x0, x1 = int(rows[0]), int(rows[-1]) + 1, int(cols[0]), int(cols[-1]) + 1
+        self.box = (y0, y1, x0, x1)
+        self.data = zlib.compress(np.packbits(delta[y0:y1, x0:x1]).tobytes(), 1)
+
+    def _apply(self, canvas):
+        y0, y1, x0, x1 = self.box
+        if y1 == y0:
+            return
+
+        mask = canvas.erase_mask
+        if mask is None:
+            mask = np.zeros(self.shape, dtype=bool)
+        elif mask.shape != self.shape:
+            logging.warning("⚠️ Máscara com outro tamanho; delta ignorado.")
+            return
+
+        count = (y1 - y0) * (x1 - x0)
+        bits = np.unpackbits(np.frombuffer(zlib.decompress(self.data), dtype=np.uint8), count=count)
+        mask[y0:y1, x0:x1] ^= bits.view(bool).reshape(y1 - y0, x1 - x0)
+        canvas.restore_erase_mask(mask)
+
+    def undo(self, canvas):
+        self._apply(canvas)
+
+    def redo(self, canvas):
+        self._apply(canvas)
+
+    @property
+    def nbytes(self):
+        return _COMMAND_OVERHEAD + len(self.data)
+
+
+class History:
+    """
+    Pilhas de desfazer/refazer com teto de memória: ao passar do limite,
+    os comandos mais antigos são descartados
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._undo = deque()
+        self._redo = []
+        self.nbytes = 0
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def push(self, command):
+        """Registra um comando recém-aplicado e descarta o que havia para refazer"""
+        self.nbytes -= sum(c.nbytes for c in self._redo)
+        self._redo.clear()
+
+        self._undo.append(command)
+        self.nbytes += command.nbytes
+        while self.nbytes > self.max_bytes and len(self._undo) > 1:
+            self.nbytes -= self._undo.popleft().nbytes
+
+    def undo(self, canvas):
+        """:return: Rótulo do comando desfeito ou None"""
+        if not self._undo:
+            return None
+        command = self._undo.pop()
+        command.undo(canvas)
+        self._redo.append(command)
+        return command.label
+
+    def redo(self, canvas):
+        """:return: Rótulo do comando refeito ou None"""
+        if not self._redo:
+            return None
+        command = self._redo.pop()
+        command.redo(canvas)
+        self._undo.append(command)
+        return command.label
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self.nbytes = 0
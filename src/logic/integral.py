@@ -0,0 +1,74 @@
+# src/logic/integral.py
+
+import numpy as np
+import logging
+
+print("➕ [INFO] Carregando módulo: Integral...")
+
+
+class OpaqueIntegral:
+    def __init__(self, opaque):
+        """
+        Tabela de áreas somadas (imagem integral) dos pixels opacos
+        :param opaque: Máscara booleana (H, W) dos pixels visíveis
+        """
+        self.height, self.width = opaque.shape
+        dtype = np.int32 if opaque.size < 2 ** 31 else np.int64
+
+        # table[y, x] = pixels opacos no retângulo [0, x) x [0, y)
+        self.table = np.zeros((self.height + 1, self.width + 1), dtype=dtype)
+        np.cumsum(opaque, axis=0, dtype=dtype, out=self.table[1:, 1:])
+        np.cumsum(self.table[1:, 1:], axis=1, out=self.table[1:, 1:])
+
+        logging.debug(f"➕ Imagem integral criada: {self.width}x{self.height}")
+
+    def _clip(self, x, y, width, height):
+        """Limita o retângulo à imagem e devolve (x0, y0, x1, y1)"""
+        x0 = min(max(x, 0), self.width)
+        y0 = min(max(y, 0), self.height)
+        x1 = min(max(x + width, 0), self.width)
+        y1 = min(max(y + height, 0), self.height)
+        return x0, y0, max(x0, x1), max(y0, y1)
+
+    def count(self, x, y, width, height):
+        """Quantidade de pixels opacos no retângulo, em O(1)"""
+        x0, y0, x1, y1 = self._clip(x, y, width, height)
+        t = self.table
+        return int(t[y1, x1] - t[y0, x1] - t[y1, x0] + t[y0, x0])
+
+    def counts(self, rects):
+        """
+        Conta os pixels opacos de vários retângulos de uma vez
+        :param rects: Array (N, 4) com x, y, w, h
+        :return: Array (N,) com as contagens
+        """
+        rects = np.asarray(rects, dtype=np.int64).reshape(-1, 4)
+        x0 = np.clip(rects[:, 0], 0, self.width)
+        y0 = np.clip(rects[:, 1], 0, self.height)
+        x1 = np.clip(rects[:, 0] + rects[:, 2], x0, self.width)
+        y1 = np.clip(rects[:, 1] + rects[:, 3], y0, self.height)
+        t = self.table
+        return t[y1, x1] - t[y0, x1] - t[y1, x0] + t[y0, x0]
+
+    def is_empty(self, x, y, width, height):
+        return self.count(x, y, width, height) == 0
+
+    def content_bounds(self, x, y, width, height):
+        """
+        Menor retângulo que contém todos os pixels opacos da seleção
+        :return: Tupla (x, y, w, h) ou None se a seleção estiver vazia
+        """
+        x0, y0, x1, y1 = self._clip(x, y, width, height)
+        t = self.table
+        total = t[y1, x1] - t[y0, x1] - t[y1, x0] + t[y0, x0]
+        if total == 0:
+            return None
+
+        # Perfis acumulados por coluna e por linha são monotônicos: busca binária
+        cols = t[y1, x0:x1 + 1] - t[y0, x0:x1 + 1]
+        rows = t[y0:y1 + 1, x1] - t[y0:y1 + 1, x0]
+        left = x0 + int(np.searchsorted(cols, cols[0], side="right")) - 1
+        right = x0 + int(np.searchsorted(cols, cols[-1], side="left"))
+        top = y0 + int(np.searchsorted(rows, rows[0], side="right")) - 1
+        bottom = y0 + int(np.searchsorted(rows, rows[-1], side="left"))
+        return left, top, right - left, bottom - top
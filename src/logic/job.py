@@ -0,0 +1,155 @@
+# src/logic/job.py
+
+import json
+import os
+import logging
+import numpy as np
+
+from src.logic.exporter import SpriteSheetExporter
+from src.logic.keying import color_to_rgb
+
+print("📋 [INFO] Carregando módulo: Job...")
+
+JOB_VERSION = 1
+JOB_SUFFIX = ".job.json"
+MASK_SUFFIX = ".mask.npz"
+
+
+def make_job(source, output, rects, align_configs, remove_background=False, bg_color=(0, 0, 0),
+             layout="horizontal", scales=None, dds_format="bc3", trim=False, frame_duration=100,
+             atlas=True, names=None):
+    """
+    Descreve uma exportação completa, independente do Canvas
+    :param source: Imagem de origem
+    :param output: Caminho da spritesheet gerada
+    :param rects: Lista de QRect ou tuplas (x, y, w, h)
+    :param align_configs: Um dicionário de alinhamento por frame
+    :param bg_color: QColor ou tupla (r, g, b) removida quando remove_background
+    :param trim: Recorta cada frame aos pixels visíveis antes de alinhar
+    :param frame_duration: ms por frame quando a saída é uma animação (.apng ou .gif)
+    :param atlas: Grava 'sheet.json' e 'sheet.atlas' com os metadados dos frames
+    :param names: Nome de cada frame no atlas (opcional)
+    """
+    frames = []
+    names = names or [None] * len(rects)
+    for rect, align, name in zip(rects, align_configs, names):
+        if hasattr(rect, "x"):
+            rect = (rect.x(), rect.y(), rect.width(), rect.height())
+        frame = {"rect": [int(v) for v in rect], "align": dict(align)}
+        if name:
+            frame["name"] = name
+        frames.append(frame)
+
+    return {
+        "version": JOB_VERSION,
+        "source": os.path.abspath(source),
+        "output": os.path.abspath(output),
+        "layout": layout,
+        "scales": list(scales) if scales else [1.0],
+        "dds_format": dds_format,
+        "frame_duration": frame_duration,
+        "atlas": bool(atlas),
+        "remove_background": bool(remove_background),
+        "bg_color": list(color_to_rgb(bg_color)),
+        "trim": bool(trim),
+        "frames": frames
+    }
+
+
+def job_path_for(output_path):
+    """'output/sheet.png' -> 'output/sheet.job.json'"""
+    return os.path.splitext(output_path)[0] + JOB_SUFFIX
+
+
+def mask_path_for(job_path):
+    """'output/sheet.job.json' -> 'output/sheet.mask.npz'"""
+    root = job_path[:-len(JOB_SUFFIX)] if job_path.endswith(JOB_SUFFIX) else os.path.splitext(job_path)[0]
+    return root + MASK_SUFFIX
+
+
+def save_erase_mask(path, mask):
+    """Máscara de regiões apagadas em bits (packbits), como no arquivo de projeto"""
+    np.savez_compressed(path, shape=np.array(mask.shape, dtype=np.int64), bits=np.packbits(mask))
+
+
+def load_erase_mask(path):
+    with np.load(path, allow_pickle=False) as data:
+        shape = tuple(data["shape"].tolist())
+        return np.unpackbits(data["bits"], count=shape[0] * shape[1]).view(bool).reshape(shape)
+
+
+def save_job(path, job, erase_mask=None):
+    """
+    Grava o job; as regiões apagadas por preenchimento vão num arquivo ao lado
+    ('sheet.mask.npz'), referenciado pelo job, para o modo observação e o
+    servidor de exportação reproduzirem a mesma spritesheet
+    :param erase_mask: Máscara booleana do Canvas (None = nada apagado)
+    """
+    mask_path = mask_path_for(path)
+    job = dict(job)
+    if erase_mask is not None and erase_mask.any():
+        save_erase_mask(mask_path, erase_mask)
+        job["erase_mask"] = os.path.basename(mask_path)
+    else:
+        job.pop("erase_mask", None)
+        if os.path.exists(mask_path):
+            os.remove(mask_path)  # Máscara de uma exportação anterior
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(job, f, indent=2, ensure_ascii=False)
+    logging.info(f"📋 Configuração de exportação salva em: {path}")
+
+
+def load_job(path):
+    """
+    Lê um job salvo; caminhos relativos são resolvidos a partir da pasta do arquivo
+    """
+    with open(path, encoding="utf-8") as f:
+        job = json.load(f)
+
+    if job.get("version") != JOB_VERSION:
+        raise ValueError(f"Versão de job não suportada: {job.get('version')}")
+
+    base = os.path.dirname(os.path.abspath(path))
+    for key in ("source", "output", "erase_mask"):
+        if job.get(key):
+            job[key] = os.path.normpath(os.path.join(base, job[key]))
+    return job
+
+
+def run_job(job, erase_mask=None, workers=None):
+    """
+    Executa a exportação descrita pelo job
+    :param erase_mask: Máscara de regiões apagadas; None = a gravada com o job, se houver
+    :param workers: Processos usados nos frames; None = número de CPUs, 1 = em série
+    :return: True se a spritesheet foi salva
+    """
+    exporter = SpriteSheetExporter(job["source"], dds_format=job.get("dds_format", "bc3"))
+
+    if erase_mask is None and job.get("erase_mask"):
+        erase_mask = load_erase_mask(job["erase_mask"])
+        if erase_mask.shape != exporter.source.shape[:2]:
+            # A imagem mudou de tamanho: as regiões apagadas não valem mais (como no Canvas)
+            logging.warning(f"⚠️ Máscara de regiões apagadas ignorada (tamanho diferente da imagem): {job['erase_mask']}")
+            erase_mask = None
+
+    exporter.add_frames(
+        [tuple(frame["rect"]) for frame in job["frames"]],
+        {
+            "remove_background": job["remove_background"],
+            "bg_color": tuple(job["bg_color"]),
+            "trim": job.get("trim", False),
+            "erase_mask": erase_mask
+        },
+        align_configs=[frame["align"] for frame in job["frames"]],
+        workers=workers,
+        names=[frame.get("name") for frame in job["frames"]]
+    )
+
+    return exporter.export(
+        job["output"],
+        layout=job.get("layout", "horizontal"),
+        scales=job.get("scales"),
+        frame_duration=job.get("frame_duration", 100),
+        atlas=job.get("atlas", True)
+    )
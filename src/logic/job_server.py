@@ -0,0 +1,248 @@
+# src/logic/job_server.py
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from collections import deque
+import itertools
+import threading
+import queue
+import json
+import time
+import os
+import logging
+
+from src.logic.job import run_job
+
+print("🏭 [INFO] Carregando módulo: JobServer...")
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Latências guardadas para as estatísticas
+_LATENCY_WINDOW = 1000
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    # O padrão (5) derruba conexões quando um build dispara centenas de jobs de uma vez
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+class _PendingJob:
+    """Job na fila: o handler HTTP espera no evento até um worker terminar"""
+
+    def __init__(self, job_id, job):
+        self.id = job_id
+        self.job = job
+        self.submitted = time.perf_counter()
+        self.started = None
+        self.done = threading.Event()
+        self.result = None
+
+
+class JobServer:
+    """
+    Serviço local de exportação. Mantém workers aquecidos (Pillow e NumPy já
+    importados) em torno de run_job, com fila limitada: quando ela enche, novos
+    jobs são recusados com HTTP 503 para que o cliente tente de novo depois.
+
+    POST /jobs   corpo = job JSON (ver src/logic/job.py); responde ao terminar
+    GET  /stats  profundidade da fila, contadores e percentis de latência
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None, queue_size=64):
+        self.workers = workers or os.cpu_count() or 1
+        self.queue = queue.Queue(maxsize=queue_size)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=_LATENCY_WINDOW)
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+        self.httpd = _HTTPServer((host, port), self._make_handler())
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"export-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+
+    @property
+    def address(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Inicia os workers e atende requisições em segundo plano"""
+        self._start_workers()
+        threading.Thread(target=self.httpd.serve_forever, name="job-server", daemon=True).start()
+
+    def serve_forever(self):
+        """Inicia os workers e atende requisições nesta thread"""
+        self._start_workers()
+        self.httpd.serve_forever()
+
+    def _start_workers(self):
+        for thread in self._threads:
+            thread.start()
+        logging.info(f"🏭 Servidor de exportação em {self.address} ({self.workers} workers)")
+
+    def shutdown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def submit(self, job):
+        """
+        Enfileira um job sem bloquear
+        :return: _PendingJob, ou None se a fila estiver cheia
+        """
+        pending = _PendingJob(next(self._ids), job)
+        try:
+            self.queue.put_nowait(pending)
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            return None
+        return pending
+
+    def stats(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = {
+                "queue_depth": self.queue.qsize(),
+                "queue_size": self.queue.maxsize,
+                "workers": self.workers,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected
+            }
+        for name, q in (("p50_ms", 0.5), ("p95_ms", 0.95), ("max_ms", 1.0)):
+            stats[name] = round(latencies[min(len(latencies) - 1, int(q * len(latencies)))], 1) if latencies else None
+        return stats
+
+    def _worker(self):
+        while True:
+            pending = self.queue.get()
+            pending.started = time.perf_counter()
+            try:
+                # O paralelismo aqui é entre jobs; cada job processa seus frames em série
+                success = run_job(pending.job, workers=1)
+                error = None if success else "Falha ao exportar spritesheet."
+            except Exception as e:
+                success, error = False, str(e)
+                logging.error(f"❌ Job {pending.id} falhou: {e}", exc_info=True)
+
+            finished = time.perf_counter()
+            pending.result = {
+                "id": pending.id,
+                "success": success,
+                "error": error,
+                "output": pending.job.get("output"),
+                "queue_ms": round((pending.started - pending.submitted) * 1000, 1),
+                "run_ms": round((finished - pending.started) * 1000, 1),
+                "queue_depth": self.queue.qsize()
+            }
+            with self._lock:
+                self._latencies.append((finished - pending.submitted) * 1000)
+                if success:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+
+            pending.done.set()
+            self.queue.task_done()
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, status, payload, headers=None):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path == "/stats":
+                    self._reply(200, server.stats())
+                else:
+                    self._reply(404, {"error": "Rota desconhecida"})
+
+            def do_POST(self):
+                if self.path != "/jobs":
+                    return self._reply(404, {"error": "Rota desconhecida"})
+
+                try:
+                    length = int(self.headers.get("Content-Length", 0))
+                    job = json.loads(self.rfile.read(length))
+                    if not isinstance(job, dict) or "source" not in job or "frames" not in job:
+                        raise ValueError("Job sem 'source' ou 'frames'")
+                except ValueError as e:
+                    return self._reply(400, {"error": f"Job inválido: {e}"})
+
+                pending = server.submit(job)
+                if pending is None:
+                    return self._reply(
+                        503, {"error": "Fila cheia", "queue_depth": server.queue.qsize()}, {"Retry-After": "1"}
+                    )
+
+                pending.done.wait()
+                self._reply(200 if pending.result["success"] else 500, pending.result)
+
+            def log_message(self, format, *args):
+                logging.debug(f"🏭 {self.address_string()} {format % args}")
+
+        return Handler
+
+
+def submit_job(job, server=None, timeout=None, retries=50, connect_retries=3):
+    """
+    Envia um job ao servidor e espera o resultado, recuando quando a fila está cheia
+    :param server: URL base do servidor (padrão http://127.0.0.1:8765)
+    :param connect_retries: Tentativas quando o servidor não responde (ex.: ainda subindo)
+    :return: Dicionário com success, queue_ms, run_ms e queue_depth; em caso de
+             falha, success False e a mensagem em error
+    """
+    import urllib.request
+    import urllib.error
+
+    url = (server or f"http://{DEFAULT_HOST}:{DEFAULT_PORT}").rstrip("/") + "/jobs"
+    body = json.dumps(job).encode("utf-8")
+    delay = 0.05
+    failures = 0
+
+    for _ in range(retries):
+        request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            if e.code != 503:
+                return _error_result(e)
+        except OSError as e:
+            # URLError (conexão recusada, host inválido) ou timeout
+            failures += 1
+            if failures >= connect_retries:
+                reason = getattr(e, "reason", e)
+                return {"success": False, "error": f"Servidor de exportação indisponível em {url}: {reason}"}
+
+        time.sleep(delay)  # Backpressure: espera a fila esvaziar (ou o servidor subir)
+        delay = min(delay * 2, 1.0)
+
+    return {"success": False, "error": "Servidor de exportação continua com a fila cheia."}
+
+
+def _error_result(error):
+    """Resposta de erro do servidor; o corpo pode não ser JSON (ex.: proxy ou outro serviço na porta)"""
+    raw = error.read()
+    try:
+        result = json.loads(raw)
+    except ValueError:
+        result = None
+    if not isinstance(result, dict):
+        text = raw.decode("utf-8", "replace").strip()[:200]
+        result = {"error": f"HTTP {error.code}: {text or error.reason}"}
+    result.setdefault("success", False)
+    return result
@@ -0,0 +1,206 @@
+# src/logic/keying.py
+
+import numpy as np
+import logging
+
+print("🧪 [INFO] Carregando módulo: Keying...")
+
+# Máscara que zera o canal alfa quando os pixels RGBA são vistos como uint32
+_RGB_BITS = np.array([255, 255, 255, 0], dtype=np.uint8).view(np.uint32)[0]
+
+# Linhas processadas por bloco na comparação com tolerância
+_CHUNK_ROWS = 64
+
+# Máximo de pixels amostrados no histograma da imagem inteira
+_HISTOGRAM_SAMPLES = 1 << 21
+
+
+def color_to_rgb(color):
+    """
+    Normaliza uma cor para a tupla (r, g, b)
+    :param color: QColor ou sequência (r, g, b[, a])
+    """
+    if hasattr(color, "red"):
+        return color.red(), color.green(), color.blue()
+    r, g, b = color[:3]
+    return int(r), int(g), int(b)
+
+
+def color_mask(rgba, color, tolerance=0):
+    """
+    Retorna a máscara dos pixels cuja cor RGB está dentro da tolerância
+    :param rgba: Array numpy (H, W, 4) uint8 em ordem RGBA
+    :param color: QColor ou tupla (r, g, b)
+    :param tolerance: Diferença máxima permitida por canal (0 = cor exata)
+    :return: Array booleano (H, W)
+    """
+    r, g, b = color_to_rgb(color)
+
+    if tolerance <= 0:
+        # Compara os três canais de uma vez vendo cada pixel como uint32
+        key = np.array([r, g, b, 0], dtype=np.uint8).view(np.uint32)[0]
+        packed = rgba.view(np.uint32)[..., 0]
+        return (packed & _RGB_BITS) == key
+
+    lows = [np.uint8(max(0, v - tolerance)) for v in (r, g, b)]
+    spans = [np.uint8(min(255, v + tolerance) - max(0, v - tolerance)) for v in (r, g, b)]
+
+    # Processa blocos de linhas para manter os temporários dentro do cache
+    mask = np.empty(rgba.shape[:2], dtype=bool)
+    scratch = np.empty((_CHUNK_ROWS,) + rgba.shape[1:2], dtype=bool)
+    for y in range(0, rgba.shape[0], _CHUNK_ROWS):
+        block = rgba[y:y + _CHUNK_ROWS]
+        out = mask[y:y + _CHUNK_ROWS]
+        tmp = scratch[:len(block)]
+        for channel in range(3):
+            # Subtração com wrap-around: um único teste cobre o intervalo [low, high]
+            diff = block[..., channel] - lows[channel]
+            if channel == 0:
+                np.less_equal(diff, spans[channel], out=out)
+            else:
+                np.less_equal(diff, spans[channel], out=tmp)
+                out &= tmp
+    return mask
+
+
+def flood_fill_mask(rgba, seed, tolerance=0, connectivity=4):
+    """
+    Calcula a região contígua à semente com cor semelhante à do pixel clicado
+    :param rgba: Array numpy (H, W, 4) uint8 em ordem RGBA
+    :param seed: Tupla (x, y) em coordenadas reais da imagem
+    :param tolerance: Diferença máxima por canal em relação à cor da semente
+    :param connectivity: 4 ou 8 vizinhos
+    :return: Array booleano (H, W) com a região preenchida
+    """
+    height, width = rgba.shape[:2]
+    x, y = seed
+    if not (0 <= x < width and 0 <= y < height):
+        return np.zeros((height, width), dtype=bool)
+
+    similar = color_mask(rgba, rgba[y, x, :3], tolerance)
+    return connected_region(similar, seed, connectivity)
+
+
+def connected_region(mask, seed, connectivity=4):
+    """
+    Isola o componente conexo de uma máscara que contém a semente.
+    Trabalha sobre as sequências horizontais (runs) da máscara, ligando as que
+    se sobrepõem entre linhas vizinhas, sem laços Python por pixel.
+    :param mask: Array booleano (H, W)
+    :param seed: Tupla (x, y)
+    :param connectivity: 4 ou 8 vizinhos
+    :return: Array booleano (H, W)
+    """
+    height, width = mask.shape
+    x, y = seed
+    if not mask[y, x]:
+        return np.zeros((height, width), dtype=bool)
+
+    # Uma coluna falsa em cada lado garante que nenhuma run atravesse linhas
+    stride = width + 2
+    padded = np.zeros((height, stride), dtype=bool)
+    padded[:, 1:-1] = mask
+    flat = padded.ravel()
+
+    transitions = np.flatnonzero(flat[1:] != flat[:-1]) + 1
+    starts = transitions[0::2]  # Índice plano do primeiro pixel da run
+    ends = transitions[1::2]    # Índice plano logo após o último pixel
+    rows = starts // stride
+
+    # Runs da linha anterior que tocam cada run (searchsorted nas chaves planas)
+    reach = 1 if connectivity == 8 else 0
+    lower = np.searchsorted(ends, starts - stride - reach, side="right")
+    upper = np.searchsorted(starts, ends - stride + reach, side="left")
+    counts = np.maximum(upper - lower, 0)
+    counts[rows == 0] = 0
+
+    src = np.repeat(np.arange(len(starts)), counts)
+    offsets = np.arange(len(src)) - np.repeat(np.cumsum(counts) - counts, counts)
+    dst = np.repeat(lower, counts) + offsets
+
+    # União de componentes: hooking pelo menor rótulo + compressão de caminhos
+    labels = np.arange(len(starts))
+    while len(src):
+        a, b = labels[src], labels[dst]
+        pending = a != b
+        if not pending.any():
+            break
+        a, b = a[pending], b[pending]
+        np.minimum.at(labels, np.maximum(a, b), np.minimum(a, b))
+        while True:
+            compressed = labels[labels]
+            if np.array_equal(compressed, labels):
+                break
+            labels = compressed
+
+    seed_flat = y * stride + x + 1
+    seed_run = np.searchsorted(starts, seed_flat, side="right") - 1
+    selected = labels == labels[seed_run]
+
+    # Reconstrói a máscara expandindo segmentos alternados (fora/dentro da região)
+    bounds = np.empty(2 * int(selected.sum()) + 2, dtype=np.int64)
+    bounds[0], bounds[-1] = 0, flat.size
+    bounds[1:-1:2] = starts[selected]
+    bounds[2:-1:2] = ends[selected]
+    inside = np.zeros(len(bounds) - 1, dtype=bool)
+    inside[1::2] = True
+    region = np.repeat(inside, np.diff(bounds))
+
+    logging.debug(f"🪣 Região preenchida: {int(selected.sum())} runs")
+    return region.reshape(height, stride)[:, 1:-1]
+
+
+def dominant_colors(rgba, border=4, whole_image=False, top=3):
+    """
+    Propõe as cores de fundo mais frequentes com um histograma vetorizado.
+    Primeiro agrupa em 32768 faixas (5 bits altos por canal) e depois resolve a
+    cor exata mais comum dentro de cada faixa vencedora pelos 3 bits baixos.
+    :param rgba: Array numpy (H, W, 4) uint8 em ordem RGBA
+    :param border: Espessura da borda analisada, em pixels
+    :param whole_image: Analisa a imagem inteira em vez de só a borda
+    :param top: Quantidade de cores propostas
+    :return: Lista de ((r, g, b), fração) em ordem decrescente
+    """
+    height, width = rgba.shape[:2]
+    if whole_image or 2 * border >= min(height, width):
+        # Amostragem em grade: a proporção das cores dominantes não muda
+        step = max(1, int(np.ceil(np.sqrt(height * width / _HISTOGRAM_SAMPLES))))
+        pixels = rgba[::step, ::step].reshape(-1, 4)
+    else:
+        pixels = np.concatenate([
+            rgba[:border].reshape(-1, 4),
+            rgba[-border:].reshape(-1, 4),
+            rgba[border:-border, :border].reshape(-1, 4),
+            rgba[border:-border, -border:].reshape(-1, 4),
+        ])
+
+    # Faixa de 15 bits por pixel; os totalmente transparentes vão para uma faixa extra
+    bins = (pixels[:, 0] >> 3).astype(np.uint16) << 10
+    bins |= (pixels[:, 1] >> 3).astype(np.uint16) << 5
+    bins |= pixels[:, 2] >> 3
+    np.copyto(bins, 1 << 15, where=pixels[:, 3] == 0)
+    histogram = np.bincount(bins, minlength=(1 << 15) + 1)[:1 << 15]
+
+    visible = int(histogram.sum())
+    if visible == 0:
+        return []
+
+    # Bits baixos de cada canal: identificam a cor exata dentro da faixa
+    low_bits = (pixels[:, 0] & 7).astype(np.uint16) << 6
+    low_bits |= (pixels[:, 1] & 7).astype(np.uint16) << 3
+    low_bits |= pixels[:, 2] & 7
+
+    candidates = []
+    for bin_id in np.argsort(histogram)[::-1][:top]:
+        if histogram[bin_id] == 0:
+            break
+        sub = int(np.argmax(np.bincount(low_bits[bins == bin_id], minlength=512)))
+        color = (
+            (int(bin_id) >> 10 << 3) | (sub >> 6),
+            ((int(bin_id) >> 5 & 31) << 3) | (sub >> 3 & 7),
+            ((int(bin_id) & 31) << 3) | (sub & 7)
+        )
+        candidates.append((color, float(histogram[bin_id]) / visible))
+
+    logging.info(f"🪄 Cores de fundo propostas: {candidates}")
+    return candidates
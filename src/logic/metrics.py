@@ -0,0 +1,83 @@
+# src/logic/metrics.py
+
+from collections import deque
+from contextlib import contextmanager
+import time
+
+print("📊 [INFO] Carregando módulo: Metrics...")
+
+# Amostras guardadas por métrica
+_WINDOW = 240
+
+
+class MetricsRegistry:
+    """
+    Registro leve de métricas que qualquer parte do app pode publicar.
+    - Etapas (keying, exportação...): sempre guardam a última duração, custo de um dict.
+    - Amostras de alta frequência (pintura por frame): só quando `enabled`,
+      ou seja, com o HUD visível.
+    - Medidores de memória: funções avaliadas apenas quando alguém lê o snapshot.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._last = {}      # Nome -> última duração em ms
+        self._samples = {}   # Nome -> deque de durações em ms
+        self._ticks = {}     # Nome -> deque de instantes (para taxas por segundo)
+        self._gauges = {}    # Nome -> função sem argumentos
+
+    def record(self, name, ms):
+        """Guarda a duração de uma etapa; amostras só com o registro ativo"""
+        self._last[name] = ms
+        if self.enabled:
+            self._samples.setdefault(name, deque(maxlen=_WINDOW)).append(ms)
+
+    @contextmanager
+    def timed(self, name):
+        """Mede o bloco: with metrics.timed("keying"): ..."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def tick(self, name):
+        """Marca um acontecimento (ex.: um frame pintado) para calcular a taxa"""
+        if self.enabled:
+            self._ticks.setdefault(name, deque(maxlen=_WINDOW)).append(time.perf_counter())
+
+    def register_gauge(self, name, fn):
+        """:param fn: Função que devolve o valor atual (ex.: bytes em memória)"""
+        self._gauges[name] = fn
+
+    def last(self, name):
+        return self._last.get(name)
+
+    def average(self, name):
+        samples = self._samples.get(name)
+        return sum(samples) / len(samples) if samples else None
+
+    def rate(self, name, seconds=1.0):
+        """Acontecimentos por segundo na última janela"""
+        ticks = self._ticks.get(name)
+        if not ticks:
+            return 0.0
+        cutoff = time.perf_counter() - seconds
+        return sum(1 for t in ticks if t >= cutoff) / seconds
+
+    def gauges(self):
+        values = {}
+        for name, fn in self._gauges.items():
+            try:
+                values[name] = fn()
+            except Exception:
+                values[name] = None  # Ex.: objeto já destruído
+        return values
+
+    def clear_samples(self):
+        self._samples.clear()
+        self._ticks.clear()
+
+
+# Registro único do aplicativo
+metrics = MetricsRegistry()
@@ -0,0 +1,385 @@
+# src/logic/pipeline.py
+
+import numpy as np
+
+from src.logic.keying import color_mask, color_to_rgb
+
+print("🧬 [INFO] Carregando módulo: Pipeline...")
+
+DEFAULT_ALIGN = {
+    "horizontal": "center",
+    "vertical": "bottom",
+    "uniform": True
+}
+
+
+class FramePlan:
+    """
+    Descrição de um frame antes de tocar nos pixels. As etapas só alteram
+    a geometria e registram operações; os pixels são copiados uma única vez,
+    no render, direto para o buffer de saída.
+
+    - box: região (x0, y0, x1, y1) da origem usada como conteúdo (pode passar da borda)
+    - width, height: tamanho do buffer de saída
+    - dx, dy: onde o canto da box cai na saída
+    - scale: fator aplicado ao conteúdo (vizinho mais próximo)
+    """
+
+    def __init__(self, source, rect=None, bound_only=False):
+        """
+        :param source: Array (H, W, 4) uint8 RGBA
+        :param rect: (x, y, w, h) do frame na origem; None = origem inteira
+        :param bound_only: Só planejar o maior tamanho possível (etapas que
+                           dependem dos pixels, como Trim, não fazem nada)
+        """
+        self.source = source
+        height, width = source.shape[:2]
+        self.rect = tuple(int(v) for v in rect) if rect is not None else (0, 0, width, height)
+        self.bound_only = bound_only
+
+        self.box = (0, 0, width, height)
+        self.width, self.height = width, height
+        self.dx = self.dy = 0
+        self.scale = 1.0
+        self.trim_offset = (0, 0)
+        self.pivot = (0.5, 0.5)  # Âncora do frame, em fração da saída
+
+        self.clears = []  # fn(pixels, index) -> máscara de pixels que ficam transparentes
+        self.posts = []   # fn(out) -> altera o buffer de saída no lugar
+        self._edges = []  # Retângulos (x0, y0, x1, y1) de saída que as posts usam
+        self.geometry_changed = False
+
+    def set_box(self, box):
+        """Troca o conteúdo; a saída passa a ter exatamente o tamanho da box"""
+        x0, y0, x1, y1 = box
+        self.box = (x0, y0, x1, y1)
+        self.width, self.height = x1 - x0, y1 - y0
+        self.dx = self.dy = 0
+
+    def expand(self, left, top, right, bottom):
+        """Aumenta a saída em volta do que já existe (margens transparentes)"""
+        self.width += left + right
+        self.height += top + bottom
+        self.dx += left
+        self.dy += top
+        self._edges = [(x0 + left, y0 + top, x1 + left, y1 + top) for x0, y0, x1, y1 in self._edges]
+        self.geometry_changed = True
+
+    def resize(self, factor):
+        """Escala a saída inteira (conteúdo, deslocamentos e retângulos registrados)"""
+        self.width = max(1, round(self.width * factor))
+        self.height = max(1, round(self.height * factor))
+        self.dx = round(self.dx * factor)
+        self.dy = round(self.dy * factor)
+        self.scale *= factor
+        self._edges = [tuple(round(v * factor) for v in edge) for edge in self._edges]
+        self.geometry_changed = True
+
+    def canvas_rect(self):
+        """Retângulo da saída atual, registrado para acompanhar as próximas etapas"""
+        self._edges.append((0, 0, self.width, self.height))
+        return len(self._edges) - 1
+
+    def edge(self, handle):
+        return self._edges[handle]
+
+    @property
+    def content_size(self):
+        x0, y0, x1, y1 = self.box
+        return max(0, round((x1 - x0) * self.scale)), max(0, round((y1 - y0) * self.scale))
+
+    def content_mask(self, box):
+        """
+        Pixels com conteúdo (alfa > 0 e não limpos pelas etapas anteriores)
+        dentro de uma caixa já limitada à origem
+        """
+        x0, y0, x1, y1 = box
+        index = (slice(y0, y1), slice(x0, x1))
+        pixels = self.source[index]
+        mask = pixels[..., 3] > 0
+        for clear in self.clears:
+            mask &= ~clear(pixels, index)
+        return mask
+
+    def info(self):
+        """Metadados do frame pronto (ex.: para o índice do atlas)"""
+        x, y, w, h = self.rect
+        content_w, content_h = self.content_size
+        return {
+            "rect": [x, y, w, h],
+            "trim_offset": list(self.trim_offset),
+            "content": [self.dx, self.dy, content_w, content_h],
+            "size": [self.width, self.height],
+            "pivot": list(self.pivot)
+        }
+
+
+class Stage:
+    """
+    Etapa do pipeline. Subclasses alteram o FramePlan em `plan` e, se
+    precisarem mexer em pixels, registram uma função em plan.clears (pixels que
+    viram transparentes, avaliada sobre a região copiada) ou plan.posts
+    (alteração no lugar do buffer de saída). Nenhuma etapa aloca imagens.
+    As etapas precisam ser serializáveis (pickle) para rodar nos workers.
+    """
+
+    name = ""
+
+    def plan(self, plan):
+        raise NotImplementedError
+
+
+class Crop(Stage):
+    """Usa o retângulo do frame como conteúdo; o que passar da borda fica transparente"""
+
+    name = "crop"
+
+    def plan(self, plan):
+        x, y, w, h = plan.rect
+        plan.set_box((x, y, x + w, y + h))
+
+
+class Erase(Stage):
+    """Limpa os pixels marcados na máscara de regiões apagadas (do tamanho da origem)"""
+
+    name = "erase"
+
+    def __init__(self, mask):
+        self.mask = mask
+
+    def plan(self, plan):
+        if self.mask is not None:
+            plan.clears.append(self._clear)
+
+    def _clear(self, pixels, index):
+        return self.mask[index]
+
+
+class Key(Stage):
+    """Torna transparente a cor-chave (com tolerância opcional por canal)"""
+
+    name = "key"
+
+    def __init__(self, color, tolerance=0):
+        self.color = color_to_rgb(color)
+        self.tolerance = tolerance
+
+    def plan(self, plan):
+        plan.clears.append(self._clear)
+
+    def _clear(self, pixels, index):
+        return color_mask(pixels, self.color, self.tolerance)
+
+
+class Trim(Stage):
+    """
+    Reduz o conteúdo à caixa dos pixels visíveis, considerando o que as etapas
+    anteriores limpam. Deve vir antes de Align, Pad, Scale e Extrude.
+    """
+
+    name = "trim"
+
+    def plan(self, plan):
+        if plan.geometry_changed:
+            raise ValueError("Trim precisa vir antes das etapas que mudam a geometria.")
+        if plan.bound_only:
+            return
+
+        x0, y0, x1, y1 = plan.box
+        height, width = plan.source.shape[:2]
+        cx0, cy0, cx1, cy1 = max(x0, 0), max(y0, 0), min(x1, width), min(y1, height)
+        if cx0 >= cx1 or cy0 >= cy1:
+            return
+
+        mask = plan.content_mask((cx0, cy0, cx1, cy1))
+        rows = np.flatnonzero(mask.any(axis=1))
+        if len(rows) == 0:
+            return  # Frame vazio mantém o tamanho, para não sumir da folha
+        cols = np.flatnonzero(mask.any(axis=0))
+
+        box = (cx0 + int(cols[0]), cy0 + int(rows[0]), cx0 + int(cols[-1]) + 1, cy0 + int(rows[-1]) + 1)
+        plan.trim_offset = (box[0] - x0, box[1] - y0)
+        plan.set_box(box)
+
+
+# Alinhamento -> posição do pivot (fração da largura / altura)
+_PIVOTS = {"left": 0.0, "top": 0.0, "center": 0.5, "right": 1.0, "bottom": 1.0}
+
+
+class Align(Stage):
+    """
+    Com 'uniform', centraliza a saída num quadrado do maior lado, conforme o
+    alinhamento. O pivot do frame segue o alinhamento (ex.: centro-baixo = pés do sprite).
+    """
+
+    name = "align"
+
+    def __init__(self, align_config=None):
+        self.align_config = align_config or DEFAULT_ALIGN
+
+    def plan(self, plan):
+        h_align = self.align_config.get("horizontal", "center")
+        v_align = self.align_config.get("vertical", "bottom")
+        plan.pivot = (_PIVOTS[h_align], _PIVOTS[v_align])
+
+        if not self.align_config.get("uniform", False):
+            return
+
+        max_dim = max(plan.width, plan.height)
+
+        # Cálculo das coordenadas com base no alinhamento
+        x_off = {
+            "left": 0,
+            "center": (max_dim - plan.width) // 2,
+            "right": max_dim - plan.width
+        }[h_align]
+
+        y_off = {
+            "top": 0,
+            "center": (max_dim - plan.height) // 2,
+            "bottom": max_dim - plan.height
+        }[v_align]
+
+        plan.expand(x_off, y_off, max_dim - plan.width - x_off, max_dim - plan.height - y_off)
+
+
+class Pad(Stage):
+    """Margem transparente em volta da saída"""
+
+    name = "pad"
+
+    def __init__(self, pixels):
+        self.pixels = pixels
+
+    def plan(self, plan):
+        plan.expand(self.pixels, self.pixels, self.pixels, self.pixels)
+
+
+class Scale(Stage):
+    """
+    Escala por vizinho mais próximo, feita na própria cópia para a saída.
+    Reduções com média (BOX) ficam para as escalas da exportação.
+    """
+
+    name = "scale"
+
+    def __init__(self, factor):
+        self.factor = factor
+
+    def plan(self, plan):
+        if self.factor != 1:
+            plan.resize(self.factor)
+
+
+class Extrude(Stage):
+    """
+    Repete as bordas da saída por `pixels` para fora, evitando que a filtragem
+    bilinear na GPU puxe a cor do frame vizinho no atlas
+    """
+
+    name = "extrude"
+
+    def __init__(self, pixels):
+        self.pixels = pixels
+
+    def plan(self, plan):
+        if self.pixels <= 0:
+            return
+        handle = plan.canvas_rect()
+        plan.expand(self.pixels, self.pixels, self.pixels, self.pixels)
+        plan.posts.append(lambda out: _extrude(out, plan.edge(handle), self.pixels))
+
+
+def _extrude(out, rect, n):
+    x0, y0, x1, y1 = rect
+    if x0 >= x1 or y0 >= y1:
+        return
+    out[y0 - n:y0, x0:x1] = out[y0:y0 + 1, x0:x1]
+    out[y1:y1 + n, x0:x1] = out[y1 - 1:y1, x0:x1]
+    out[y0 - n:y1 + n, x0 - n:x0] = out[y0 - n:y1 + n, x0:x0 + 1]
+    out[y0 - n:y1 + n, x1:x1 + n] = out[y0 - n:y1 + n, x1 - 1:x1]
+
+
+def _source_span(start, count, extent, source_size, dest_offset, dest_size):
+    """
+    Índices de origem de cada pixel do conteúdo na saída e o trecho válido
+    (dentro da origem e da saída)
+    :return: (índices, j0, j1) ou None se nada é visível
+    """
+    if count <= 0 or extent <= 0:
+        return None
+    index = start + (np.arange(count) * extent) // count
+    valid = (index >= 0) & (index < source_size)
+    dest = dest_offset + np.arange(count)
+    valid &= (dest >= 0) & (dest < dest_size)
+    hits = np.flatnonzero(valid)
+    if len(hits) == 0:
+        return None
+    return index, int(hits[0]), int(hits[-1]) + 1
+
+
+def render(plan, allocate=None):
+    """
+    Executa o plano: aloca o buffer de saída (única alocação de imagem do
+    frame), copia o conteúdo já escalado e aplica as limpezas e as posts no lugar
+    :param allocate: Função opcional shape -> array uint8 onde escrever (ex.: uma
+                     faixa de memória compartilhada); o conteúdo anterior é zerado
+    :return: Array (height, width, 4) uint8
+    """
+    shape = (plan.height, plan.width, 4)
+    if allocate is None:
+        out = np.zeros(shape, dtype=np.uint8)
+    else:
+        out = allocate(shape)
+        out[...] = 0
+    source = plan.source
+    x0, y0, x1, y1 = plan.box
+    content_w, content_h = plan.content_size
+
+    cols = _source_span(x0, content_w, x1 - x0, source.shape[1], plan.dx, plan.width)
+    rows = _source_span(y0, content_h, y1 - y0, source.shape[0], plan.dy, plan.height)
+    if cols is not None and rows is not None:
+        col_index, j0, j1 = cols
+        row_index, i0, i1 = rows
+
+        if plan.scale == 1:
+            # Sem escala os índices são contíguos: fatias (views) em vez de gather
+            index = (slice(int(row_index[i0]), int(row_index[i1 - 1]) + 1),
+                     slice(int(col_index[j0]), int(col_index[j1 - 1]) + 1))
+        else:
+            index = (row_index[i0:i1, None], col_index[None, j0:j1])
+
+        region = out[plan.dy + i0:plan.dy + i1, plan.dx + j0:plan.dx + j1]
+        region[...] = source[index]
+        for clear in plan.clears:
+            region[clear(region, index)] = 0
+
+    for post in plan.posts:
+        post(out)
+    return out
+
+
+class Pipeline:
+    """
+    Sequência declarativa de etapas, ex.:
+        Pipeline([Crop(), Key((0, 255, 0)), Trim(), Align(config), Extrude(1)])
+    """
+
+    def __init__(self, stages):
+        self.stages = list(stages)
+
+    def plan(self, source, rect=None, bound_only=False):
+        plan = FramePlan(source, rect, bound_only)
+        for stage in self.stages:
+            stage.plan(plan)
+        return plan
+
+    def run(self, source, rect=None, allocate=None):
+        """:return: (pixels, plan)"""
+        plan = self.plan(source, rect)
+        return render(plan, allocate), plan
+
+    def max_size(self, source, rect=None):
+        """Maior (w, h) que o frame pode ter, sem ler pixels"""
+        plan = self.plan(source, rect, bound_only=True)
+        return plan.width, plan.height
@@ -0,0 +1,145 @@
+# src/logic/project.py
+
+import hashlib
+import os
+import logging
+import numpy as np
+
+print("🗃️ [INFO] Carregando módulo: Project...")
+
+PROJECT_VERSION = 1
+PROJECT_EXTENSION = ".smproj"
+
+# Alinhamentos gravados como códigos uint8 (coluna por campo)
+H_ALIGN = ("left", "center", "right")
+V_ALIGN = ("top", "center", "bottom")
+
+_HASH_BLOCK = 1 << 20
+
+
+def fingerprint(path):
+    """
+    Identifica o conteúdo da imagem de origem
+    :return: Dicionário com size, mtime_ns e digest (BLAKE2b do arquivo)
+    """
+    st = os.stat(path)
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+            digest.update(block)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "digest": digest.hexdigest()}
+
+
+def current_fingerprint(path, known=None):
+    """
+    Fingerprint atual da origem; reaproveita `known` (sem reler o arquivo)
+    quando tamanho e mtime não mudaram
+    """
+    st = os.stat(path)
+    if known and st.st_size == known["size"] and st.st_mtime_ns == known["mtime_ns"]:
+        return known
+    return fingerprint(path)
+
+
+def derived_key(digest, remove_background, bg_color, erase_mask):
+    """Hash de tudo que determina os dados derivados (caixas de recorte do conteúdo)"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(digest.encode())
+    h.update(bytes([int(remove_background), *bg_color]))
+    if erase_mask is not None:
+        h.update(np.asarray(erase_mask.shape, dtype=np.int64).tobytes())
+        h.update(np.packbits(erase_mask).tobytes())
+    return h.hexdigest()
+
+
+def encode_alignments(configs):
+    """Lista de dicionários -> array (N, 3) uint8: horizontal, vertical, uniform"""
+    h_codes = {name: i for i, name in enumerate(H_ALIGN)}
+    v_codes = {name: i for i, name in enumerate(V_ALIGN)}
+    codes = np.empty((len(configs), 3), dtype=np.uint8)
+    for i, config in enumerate(configs):
+        codes[i] = (
+            h_codes[config.get("horizontal", "center")],
+            v_codes[config.get("vertical", "bottom")],
+            bool(config.get("uniform", True))
+        )
+    return codes
+
+
+def decode_alignments(codes):
+    """Inverso de encode_alignments; um dicionário independente por frame"""
+    if len(codes) == 0:
+        return []
+    packed = codes[:, 0].astype(np.int32) * 6 + codes[:, 1].astype(np.int32) * 2 + codes[:, 2]
+    unique, inverse = np.unique(packed, return_inverse=True)
+    templates = [
+        {"horizontal": H_ALIGN[u // 6], "vertical": V_ALIGN[u // 2 % 3], "uniform": bool(u % 2)}
+        for u in unique.tolist()
+    ]
+    return [templates[i].copy() for i in inverse.tolist()]
+
+
+def save_project(path, project):
+    """
+    Grava o projeto como arquivo .npz de colunas (sem milhares de dicionários)
+    :param project: Dicionário com source, fingerprint, rects (N, 4), align_configs,
+                    alignment, remove_background, bg_color, max_frames, erase_mask,
+                    trim_boxes (N, 4) e derived_key
+    """
+    erase_mask = project.get("erase_mask")
+    columns = {
+        "version": np.array(PROJECT_VERSION),
+        "source": np.array(project["source"]),
+        "fingerprint": np.array([project["fingerprint"]["size"], project["fingerprint"]["mtime_ns"]], dtype=np.int64),
+        "digest": np.array(project["fingerprint"]["digest"]),
+        "rects": np.asarray(project["rects"], dtype=np.int32).reshape(-1, 4),
+        "align": encode_alignments(project["align_configs"]),
+        "default_align": encode_alignments([project["alignment"]])[0],
+        "keying": np.array([int(project["remove_background"]), *project["bg_color"]], dtype=np.uint8),
+        "max_frames": np.array(project["max_frames"], dtype=np.int64),
+        "trim_boxes": np.asarray(project["trim_boxes"], dtype=np.int32).reshape(-1, 4),
+        "derived_key": np.array(project["derived_key"]),
+    }
+    if erase_mask is not None:
+        columns["erase_shape"] = np.array(erase_mask.shape, dtype=np.int64)
+        columns["erase_bits"] = np.packbits(erase_mask)
+
+    # np.savez acrescentaria '.npz' a caminhos com outra extensão
+    with open(path, "wb") as f:
+        np.savez_compressed(f, **columns)
+    logging.info(f"🗃️ Projeto salvo: {path} ({len(columns['rects'])} frames)")
+
+
+def load_project(path):
+    """
+    Lê um projeto salvo por save_project
+    :return: Dicionário no mesmo formato, com erase_mask reconstruída (ou None)
+    """
+    with np.load(path, allow_pickle=False) as data:
+        if int(data["version"]) != PROJECT_VERSION:
+            raise ValueError(f"Versão de projeto não suportada: {int(data['version'])}")
+
+        size, mtime_ns = data["fingerprint"].tolist()
+        keying = data["keying"].tolist()
+        erase_mask = None
+        if "erase_shape" in data:
+            shape = tuple(data["erase_shape"].tolist())
+            erase_mask = np.unpackbits(data["erase_bits"], count=shape[0] * shape[1]).view(bool).reshape(shape)
+
+        source = str(data["source"])
+        if not os.path.isabs(source):
+            source = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(path)), source))
+
+        return {
+            "source": source,
+            "fingerprint": {"size": size, "mtime_ns": mtime_ns, "digest": str(data["digest"])},
+            "rects": data["rects"],
+            "align_configs": decode_alignments(data["align"]),
+            "alignment": decode_alignments(data["default_align"][None])[0],
+            "remove_background": bool(keying[0]),
+            "bg_color": tuple(keying[1:4]),
+            "max_frames": int(data["max_frames"]),
+            "erase_mask": erase_mask,
+            "trim_boxes": data["trim_boxes"],
+            "derived_key": str(data["derived_key"])
+        }
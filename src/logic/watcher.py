@@ -0,0 +1,113 @@
+# src/logic/watcher.py
+
+import os
+import time
+import logging
+
+print("👀 [INFO] Carregando módulo: Watcher...")
+
+# Intervalo entre verificações e tempo de silêncio exigido antes de reagir
+POLL_INTERVAL = 0.1
+DEBOUNCE = 0.2
+
+
+def _stamp(path):
+    """Assinatura barata do arquivo; None enquanto ele não existe (ex.: salvamento atômico)"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class FileWatcher:
+    """
+    Observa arquivos por polling de os.stat (mtime + tamanho), sem dependências
+    externas. Uma rajada de gravações só é reportada depois de `debounce`
+    segundos sem novas mudanças, para não reagir a arquivos pela metade.
+    """
+
+    def __init__(self, paths=(), debounce=DEBOUNCE):
+        self.debounce = debounce
+        self._stamps = {}
+        self._pending = {}  # Caminho -> instante da última mudança vista
+        for path in paths:
+            self.add(path)
+
+    @property
+    def paths(self):
+        return list(self._stamps)
+
+    def add(self, path):
+        path = os.path.abspath(path)
+        if path not in self._stamps:
+            self._stamps[path] = _stamp(path)
+
+    def remove(self, path):
+        path = os.path.abspath(path)
+        self._stamps.pop(path, None)
+        self._pending.pop(path, None)
+
+    def poll(self, now=None):
+        """
+        Verifica os arquivos uma vez
+        :return: Caminhos cuja mudança já se estabilizou e que existem no disco
+        """
+        now = time.monotonic() if now is None else now
+
+        for path, old in self._stamps.items():
+            stamp = _stamp(path)
+            if stamp != old:
+                self._stamps[path] = stamp
+                self._pending[path] = now
+
+        ready = [path for path, seen in self._pending.items() if now - seen >= self.debounce]
+        for path in ready:
+            del self._pending[path]
+        return [path for path in ready if self._stamps[path] is not None]
+
+
+def watch_jobs(job_paths, interval=POLL_INTERVAL, debounce=DEBOUNCE, should_stop=None):
+    """
+    Reexporta jobs quando o arquivo do job ou a imagem de origem mudam.
+    Só os jobs afetados por cada mudança são executados.
+    :param job_paths: Arquivos .job.json a observar
+    :param should_stop: Função opcional; o laço termina quando ela retorna True
+    """
+    from src.logic.job import load_job, run_job
+
+    jobs = {}
+    watcher = FileWatcher(debounce=debounce)
+    for path in job_paths:
+        path = os.path.abspath(path)
+        jobs[path] = load_job(path)
+        watcher.add(path)
+        watcher.add(jobs[path]["source"])
+
+    logging.info(f"👀 Observando {len(jobs)} job(s) e {len(watcher.paths) - len(jobs)} imagem(ns)")
+
+    while not (should_stop and should_stop()):
+        affected = set()
+        for path in watcher.poll():
+            if path in jobs:
+                try:
+                    jobs[path] = load_job(path)
+                    watcher.add(jobs[path]["source"])
+                    affected.add(path)
+                except (OSError, ValueError) as e:
+                    logging.error(f"❌ Job inválido ignorado ({path}): {e}")
+            affected.update(job_path for job_path, job in jobs.items() if job["source"] == path)
+
+        for job_path in sorted(affected):
+            start = time.perf_counter()
+            try:
+                success = run_job(jobs[job_path])
+            except Exception as e:
+                # Ex.: imagem ainda incompleta; a próxima gravação dispara de novo
+                logging.error(f"❌ Falha ao reexportar {job_path}: {e}")
+                continue
+            if success:
+                elapsed = (time.perf_counter() - start) * 1000
+                logging.info(f"🔁 Reexportado: {jobs[job_path]['output']} ({elapsed:.0f} ms)")
+
+        time.sleep(interval)
@@ -1,29 +1,25 @@
 # src/ui/canvas.py
 
 from PySide6.QtWidgets import QWidget
-from PySide6.QtGui import QPainter, QPixmap, QColor, QPen, QTransform, QBrush, QImage
+from PySide6.QtGui import QPainter, QPixmap, QColor, QPen, QTransform
 from PySide6.QtCore import Qt, QPoint, QRect
 import logging
+import time
+
+from src.ui.canvas_state import CanvasStateMixin
+from src.logic.metrics import metrics
 
 print("🖼️ [INFO] Carregando módulo: Canvas...")
 
 
-class Canvas(QWidget):
+class Canvas(QWidget, CanvasStateMixin):
     def __init__(self, sidebar=None, parent=None):
         super().__init__(parent)
 
-        self.background = None  # QPixmap original (com fundo)
-        self.background_image_size = None  # Tamanho real da imagem
+        self._init_canvas_state(sidebar)
         self.selection_start = None
         self.selection_end = None
-        self.selected_rects = []  # Seleções em escala real
         self.drawing = False
-        self.max_frames = 4
-
-        # Configurações de fundo
-        self.remove_background = False
-        self.bg_color = QColor(Qt.GlobalColor.green)  # Cor do fundo a ser removida
-        self.sidebar = sidebar  # Referência ao Sidebar
 
         # Zoom
         self.zoom_level = 1.0
@@ -36,16 +32,12 @@ class Canvas(QWidget):
         self.setStyleSheet("background-color: #1e1e1e;")
         self.setFocusPolicy(Qt.StrongFocus)
 
-        # Alinhamento individual dos frames
-        self.individual_alignment_configs = []
-
     def set_background(self, pixmap: QPixmap):
         """Define a imagem de fundo e aplica o zoom"""
         if pixmap.isNull():
             return
 
-        self.background = pixmap.copy()
-        self.background_image_size = pixmap.size()
+        self._load_source(pixmap)
 
         # Aplica remoção de fundo e xadrez apenas uma vez
         if self.remove_background and not self.checkered_applied:
@@ -58,28 +50,7 @@ class Canvas(QWidget):
 
     def _apply_removal_and_checkered(self):
         """Remove cor de fundo e aplica fundo xadrez translúcido apenas uma vez"""
-        image = self.background.toImage().convertToFormat(QImage.Format_ARGB32)
-
-        r, g, b = self.bg_color.red(), self.bg_color.green(), self.bg_color.blue()
-
-        # Remove pixels com a cor de fundo
-        for y in range(image.height()):
-            for x in range(image.width()):
-                pixel_color = QColor(image.pixel(x, y))
-                if pixel_color.red() == r and pixel_color.green() == g and pixel_color.blue() == b:
-                    image.setPixelColor(x, y, QColor(0, 0, 0, 0))  # Transparente
-
-        # Converte para QPixmap
-        temp_pixmap = QPixmap.fromImage(image)
-
-        # Cria um novo QPixmap com o xadrez como fundo visual
-        self.background_display = QPixmap(temp_pixmap.size())
-        self.background_display.fill(Qt.transparent)
-
-        painter = QPainter(self.background_display)
-        self.draw_checkered_background(painter)
-        painter.drawPixmap(0, 0, temp_pixmap)
-        painter.end()
+        self.background_display = self.render_keyed_pixmap()
 
         # Marca que o xadrez foi aplicado
         self.checkered_applied = True
@@ -88,20 +59,6 @@ class Canvas(QWidget):
         self.background = self.background_display.copy(self.background_display.rect())
         self._apply_zoom_and_update()
 
-    def draw_checkered_background(self, painter):
-        """Desenha o fundo xadrez translúcido diretamente no painter"""
-        checkered_size = 16
-        color1 = QColor(200, 200, 200, 100)  # Cinza translúcido
-        color2 = QColor(240, 240, 240, 100)  # Branco translúcido
-
-        rect = self.background_display.rect()
-        width, height = rect.width(), rect.height()
-
-        for y in range(0, height, checkered_size):
-            for x in range(0, width, checkered_size):
-                color = color1 if ((x + y) // checkered_size) % 2 == 0 else color2
-                painter.fillRect(x, y, checkered_size, checkered_size, QBrush(color))
-
     def _apply_zoom_and_update(self):
         """Aplica o zoom à imagem final (já com xadrez aplicado)"""
         if not self.background:
@@ -138,6 +95,7 @@ class Canvas(QWidget):
         if not self.background:
             return
 
+        start = time.perf_counter()
         painter = QPainter(self)
         world_transform = painter.worldTransform()
         painter.setWorldTransform(QTransform())
@@ -168,6 +126,14 @@ class Canvas(QWidget):
             painter.drawRect(rect)
 
         painter.setWorldTransform(world_transform)
+        metrics.record("paint", (time.perf_counter() - start) * 1000)
+        metrics.tick("paint")
+
+    def _scaled_pixmap_nbytes(self):
+        """Cada pintura gera uma cópia do pixmap no tamanho do zoom"""
+        if not self.background:
+            return 0
+        return int(self.background.width() * self.zoom_level) * int(self.background.height() * self.zoom_level) * 4
 
     def _get_selection_rect(self):
         start = self.selection_start
@@ -181,7 +147,10 @@ class Canvas(QWidget):
             self.update()
 
         elif event.button() == Qt.RightButton and not self.background.isNull():
-            self.pick_color_from_image(event.position().toPoint())
+            if self.fill_erase_mode:
+                self.fill_erase_at(event.position().toPoint())
+            else:
+                self.pick_color_from_image(event.position().toPoint())
 
     def mouseMoveEvent(self, event):
         if self.drawing:
@@ -193,32 +162,21 @@ class Canvas(QWidget):
             self.selection_end = event.position().toPoint()
             rect_on_canvas = self._get_selection_rect()
             rect_real = self.get_original_rect(rect_on_canvas)
-
-            if len(self.selected_rects) < self.max_frames:
-                self.selected_rects.append(rect_real)
-                while len(self.individual_alignment_configs) < len(self.selected_rects):
-                    self.individual_alignment_configs.append({
-                        "horizontal": "center",
-                        "vertical": "bottom",
-                        "uniform": True
-                    })
+            self.add_selection(rect_real)
 
             self.drawing = False
             self.selection_start = None
             self.selection_end = None
             self.update()
-            self.update_status()
 
     def keyPressEvent(self, event):
-        """Desfaz última seleção com Ctrl+Z"""
+        """Desfaz com Ctrl+Z e refaz com Ctrl+Y ou Ctrl+Shift+Z"""
         if event.key() == Qt.Key_Z and event.modifiers() == Qt.ControlModifier:
-            if self.selected_rects:
-                self.selected_rects.pop()
-                if len(self.individual_alignment_configs) > len(self.selected_rects):
-                    self.individual_alignment_configs.pop()
-                self.update_status()
-                self.update()
-                print("⏮️ Seleção desfeita com Ctrl+Z")
+            self.undo()
+        elif (event.key() == Qt.Key_Y and event.modifiers() == Qt.ControlModifier) or (
+            event.key() == Qt.Key_Z and event.modifiers() == (Qt.ControlModifier | Qt.ShiftModifier)
+        ):
+            self.redo()
         else:
             super().keyPressEvent(event)
 
@@ -239,74 +197,15 @@ class Canvas(QWidget):
         if not self.background:
             return
 
-        try:
-            image = self.background.toImage()
-            x = int(pos.x() / self.zoom_level)
-            y = int(pos.y() / self.zoom_level)
-            pixel = image.pixel(x, y)
-            color = QColor(pixel)
-
-            self.bg_color = color
-            if self.sidebar:
-                self.sidebar.update_bg_button_color(color)
-            self.update()
+        x = int(pos.x() / self.zoom_level)
+        y = int(pos.y() / self.zoom_level)
+        self.pick_color_at(x, y)
 
-            # Se remover fundo estiver ativo, atualiza a imagem com fundo xadrez translúcido
-            if self.remove_background:
-                self.checkered_applied = False  # Força reaplicação da transparência
-                self._apply_removal_and_checkered()
-
-        except Exception as e:
-            logging.error(f"❌ Erro ao pegar cor da imagem: {e}")
-
-    def update_status(self):
-        if self.sidebar:
-            self.sidebar.update_status()
-
-    def get_alignment_config(self):
-        return getattr(self, "_alignment_config", {
-            "horizontal": "center",
-            "vertical": "bottom",
-            "uniform": True
-        })
-
-    def set_alignment_config(self, config):
-        self._alignment_config = config
-        self.individual_alignment_configs = [
-            config.copy() for _ in self.selected_rects
-        ]
-        self.update()
-
-    def get_individual_alignment(self, index):
-        if 0 <= index < len(self.individual_alignment_configs):
-            return self.individual_alignment_configs[index]
-        return self.get_alignment_config()
-
-    def set_individual_alignment(self, index, config):
-        if 0 <= index < len(self.selected_rects):
-            if index >= len(self.individual_alignment_configs):
-                self.individual_alignment_configs.extend([
-                    self.get_alignment_config() for _ in range(index - len(self.individual_alignment_configs) + 1)
-                ])
-            self.individual_alignment_configs[index] = config
-            self.update()
-
-    def get_bg_removal_config(self):
-        return {
-            "remove_background": self.remove_background,
-            "bg_color": self.bg_color
-        }
-
-    def clear_selections(self):
-        self.selected_rects.clear()
-        self.individual_alignment_configs.clear()
-        self.update()
-        self.update_status()
-
-    def set_max_frames(self, value):
-        self.max_frames = max(1, value)
-        self.update_status()
-        self.update()
+    def fill_erase_at(self, pos):
+        """Apaga apenas a região contígua ao pixel clicado (flood fill)"""
+        x = int(pos.x() / self.zoom_level)
+        y = int(pos.y() / self.zoom_level)
+        self.erase_region_at(x, y)
 
     def _apply_zoom_to_rect(self, rect):
         return QRect(
@@ -314,4 +213,4 @@ class Canvas(QWidget):
             int(rect.y() * self.zoom_level),
             int(rect.width() * self.zoom_level),
             int(rect.height() * self.zoom_level)
-        )
\ No newline at end of file
+        )
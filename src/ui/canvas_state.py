@@ -0,0 +1,602 @@
+# src/ui/canvas_state.py
+
+from PySide6.QtGui import QPainter, QPixmap, QColor, QBrush, QImage
+from PySide6.QtCore import Qt, QRect
+import numpy as np
+
+from src.logic.keying import color_mask, color_to_rgb, dominant_colors, flood_fill_mask
+from src.logic.integral import OpaqueIntegral
+from src.logic.grid import slice_grid
+from src.logic.history import (
+    History, SelectionsCommand, AppendSelectionsCommand, KeyingCommand, MaskDeltaCommand
+)
+from src.logic.project import encode_alignments, decode_alignments
+from src.logic.metrics import metrics
+
+print("🗂️ [INFO] Carregando módulo: CanvasState...")
+
+
+class CanvasStateMixin:
+    """
+    Estado compartilhado pelos canvases: seleções, alinhamento e recorte de fundo.
+    A classe concreta herda também de um QWidget e implementa
+    _apply_removal_and_checkered para exibir a imagem recortada.
+    """
+
+    def _init_canvas_state(self, sidebar=None):
+        self.background = None  # QPixmap exibido (com fundo ou xadrez)
+        self.background_image_size = None  # Tamanho real da imagem
+        self.selected_rects = []  # Seleções em escala real
+        self.max_frames = 4
+
+        # Configurações de fundo
+        self.remove_background = False
+        self.bg_color = QColor(Qt.GlobalColor.green)  # Cor do fundo a ser removida
+        self.sidebar = sidebar  # Referência ao Sidebar
+
+        # Alinhamento individual dos frames
+        self.individual_alignment_configs = []
+
+        # Apagar por preenchimento (clique direito remove só a região contígua)
+        self.source_pixels = None  # Cópia RGBA (numpy) da imagem original
+        self.erase_mask = None  # Máscara booleana das regiões apagadas
+        self.fill_erase_mode = False
+        self.fill_tolerance = 0
+        self.fill_connectivity = 4
+        self.erase_mask_version = 0  # Incrementado a cada alteração da máscara
+
+        # Ajuste ao conteúdo: imagem integral refeita só quando o recorte muda
+        self.snap_to_content = True
+        self._content_index = None
+        self._content_index_key = None
+
+        # Caixas do conteúdo por seleção, válidas enquanto o recorte não muda
+        self._trim_boxes = {}
+        self._trim_boxes_key = None
+
+        # Desfazer/refazer (Ctrl+Z / Ctrl+Y)
+        self.history = History()
+
+        # Memória exibida no HUD de desempenho (avaliada só quando ele lê)
+        metrics.register_gauge("mem.source", lambda: self.source_pixels.nbytes if self.source_pixels is not None else 0)
+        metrics.register_gauge("mem.background", lambda: pixmap_nbytes(self.background))
+        metrics.register_gauge("mem.scaled", self._scaled_pixmap_nbytes)
+        metrics.register_gauge("mem.erase_mask", lambda: self.erase_mask.nbytes if self.erase_mask is not None else 0)
+        metrics.register_gauge(
+            "mem.content_index", lambda: self._content_index.table.nbytes if self._content_index is not None else 0
+        )
+        metrics.register_gauge("mem.history", lambda: self.history.nbytes)
+
+    def _load_source(self, pixmap):
+        """Guarda a imagem original e reinicia o estado derivado dela"""
+        self.background = pixmap.copy()
+        self.background_image_size = pixmap.size()
+        self.source_pixels = qimage_to_array(pixmap.toImage())
+        self.erase_mask = None
+        self.erase_mask_version += 1
+        self._content_index = None
+
+    def reload_background(self, pixmap):
+        """
+        Recarrega a imagem aberta no lugar (ex.: salva num editor externo),
+        mantendo as seleções e, se o tamanho não mudou, as regiões apagadas
+        """
+        erase_mask = self.erase_mask
+        self.set_background(pixmap)
+        if erase_mask is not None and erase_mask.shape == self.source_pixels.shape[:2]:
+            self.erase_mask = erase_mask
+        elif erase_mask is not None:
+            self.history.clear()  # Deltas de máscara não valem para outro tamanho
+        if self.remove_background or self.erase_mask is not None:
+            self._apply_removal_and_checkered()
+        self._selections_changed()
+
+    def _selections_changed(self):
+        """Chamado sempre que a lista de seleções muda"""
+        self.update()
+
+    def _scaled_pixmap_nbytes(self):
+        """Memória de cópias com zoom do pixmap; o canvas concreto sobrescreve se as tiver"""
+        return 0
+
+    def render_keyed_pixmap(self):
+        """Gera o QPixmap com o fundo removido sobre o xadrez translúcido"""
+        with metrics.timed("keying"):
+            return self._render_keyed_pixmap()
+
+    def _render_keyed_pixmap(self):
+        pixels = self.source_pixels.copy()
+        packed = pixels.view(np.uint32)[..., 0]
+
+        # Remove pixels com a cor de fundo e as regiões apagadas por preenchimento
+        if self.remove_background:
+            np.copyto(packed, 0, where=color_mask(pixels, self.bg_color))
+        if self.erase_mask is not None:
+            np.copyto(packed, 0, where=self.erase_mask)
+
+        # Converte para QPixmap
+        temp_pixmap = QPixmap.fromImage(array_to_qimage(pixels))
+
+        # Cria um novo QPixmap com o xadrez como fundo visual
+        display = QPixmap(temp_pixmap.size())
+        display.fill(Qt.transparent)
+
+        painter = QPainter(display)
+        self.draw_checkered_background(painter, display.rect())
+        painter.drawPixmap(0, 0, temp_pixmap)
+        painter.end()
+        return display
+
+    def draw_checkered_background(self, painter, rect):
+        """Desenha o fundo xadrez translúcido diretamente no painter"""
+        checkered_size = 16
+        color1 = QColor(200, 200, 200, 100)  # Cinza translúcido
+        color2 = QColor(240, 240, 240, 100)  # Branco translúcido
+
+        # Um ladrilho 2x2 repetido pelo pincel evita um fillRect por casa
+        tile = QPixmap(checkered_size * 2, checkered_size * 2)
+        tile.fill(Qt.transparent)
+        tile_painter = QPainter(tile)
+        tile_painter.fillRect(0, 0, checkered_size, checkered_size, color1)
+        tile_painter.fillRect(checkered_size, checkered_size, checkered_size, checkered_size, color1)
+        tile_painter.fillRect(checkered_size, 0, checkered_size, checkered_size, color2)
+        tile_painter.fillRect(0, checkered_size, checkered_size, checkered_size, color2)
+        tile_painter.end()
+
+        painter.fillRect(rect, QBrush(tile))
+
+    def pick_color_at(self, x, y):
+        """
+        Define a cor de fundo a partir do pixel (x, y) em escala real.
+        Lê o espelho RGBA em memória, sem baixar o pixmap a cada clique.
+        :param x: Coluna na imagem original
+        :param y: Linha na imagem original
+        """
+        if self.source_pixels is None:
+            return
+
+        height, width = self.source_pixels.shape[:2]
+        if not (0 <= x < width and 0 <= y < height):
+            return
+
+        r, g, b = (int(c) for c in self.source_pixels[y, x, :3])
+        self.set_bg_color(QColor(r, g, b))
+
+    def set_bg_color(self, color):
+        """Troca a cor-chave, atualiza a Sidebar e recorta de novo se necessário"""
+        before = self._keying_state()
+        self.bg_color = color
+        self._record_keying("Cor de fundo", before)
+        if self.sidebar:
+            self.sidebar.sync_keying(self.remove_background, color)
+        self.update()
+
+        # Se remover fundo estiver ativo, atualiza a imagem com fundo xadrez translúcido
+        if self.remove_background and self.source_pixels is not None:
+            self.checkered_applied = False  # Força reaplicação da transparência
+            self._apply_removal_and_checkered()
+
+    def set_remove_background(self, enabled):
+        """Liga/desliga a remoção da cor de fundo e atualiza a imagem exibida"""
+        before = self._keying_state()
+        self.remove_background = enabled
+        self._record_keying("Remover fundo", before)
+        self.checkered_applied = False
+        if self.source_pixels is not None:  # Sem imagem carregada só guarda a opção
+            self._apply_removal_and_checkered()
+
+    def _keying_state(self):
+        return self.remove_background, color_to_rgb(self.bg_color)
+
+    def _record_keying(self, label, before):
+        after = self._keying_state()
+        if after != before:
+            self.history.push(KeyingCommand(label, before, after))
+
+    def restore_keying(self, remove_background, rgb):
+        """Aplica parâmetros de recorte vindos do histórico"""
+        self.remove_background = remove_background
+        self.bg_color = QColor(*rgb)
+        if self.sidebar:
+            self.sidebar.sync_keying(remove_background, self.bg_color)
+        self.checkered_applied = False
+        if self.source_pixels is not None:
+            self._apply_removal_and_checkered()
+
+    def auto_detect_bg_color(self, whole_image=False):
+        """
+        Detecta a cor de fundo pelo histograma da borda da imagem.
+        Se a borda não tiver uma cor claramente dominante, analisa a imagem inteira.
+        :param whole_image: Força a análise da imagem inteira
+        :return: Lista de ((r, g, b), fração) com as cores propostas
+        """
+        if self.source_pixels is None:
+            return []
+
+        candidates = dominant_colors(self.source_pixels, whole_image=whole_image)
+        if not whole_image and (not candidates or candidates[0][1] < 0.5):
+            candidates = dominant_colors(self.source_pixels, whole_image=True)
+
+        if candidates:
+            self.set_bg_color(QColor(*candidates[0][0]))
+        return candidates
+
+    def erase_region_at(self, x, y):
+        """Apaga apenas a região contígua ao pixel (x, y) em escala real (flood fill)"""
+        if self.source_pixels is None:
+            return
+
+        with metrics.timed("flood_fill"):
+            region = flood_fill_mask(
+                self.source_pixels, (x, y),
+                tolerance=self.fill_tolerance,
+                connectivity=self.fill_connectivity
+            )
+        if self.erase_mask is not None:
+            region &= ~self.erase_mask  # Só os pixels que realmente mudam
+        if not region.any():
+            return
+
+        self.history.push(MaskDeltaCommand("Apagar região", region))
+        if self.erase_mask is None:
+            self.erase_mask = region
+        else:
+            self.erase_mask |= region
+        self.erase_mask_version += 1
+
+        self.checkered_applied = False
+        self._apply_removal_and_checkered()
+        print(f"🪣 Região apagada a partir de ({x}, {y}): {int(region.sum())} pixels")
+
+    def clear_erase_mask(self):
+        """Restaura as regiões apagadas por preenchimento"""
+        if self.erase_mask is None:
+            return
+
+        self.history.push(MaskDeltaCommand("Restaurar regiões", self.erase_mask))
+        self.erase_mask = None
+        self.erase_mask_version += 1
+        self.checkered_applied = False
+        self._apply_removal_and_checkered()
+
+    def restore_erase_mask(self, mask):
+        """Aplica uma máscara vinda do histórico"""
+        self.erase_mask = mask if mask.any() else None
+        self.erase_mask_version += 1
+        self.checkered_applied = False
+        self._apply_removal_and_checkered()
+
+    def opaque_mask(self):
+        """Máscara dos pixels visíveis após remover o fundo e as regiões apagadas"""
+        if self.source_pixels is None:
+            return None
+
+        opaque = self.source_pixels[..., 3] > 0
+        if self.remove_background:
+            opaque &= ~color_mask(self.source_pixels, self.bg_color)
+        if self.erase_mask is not None:
+            opaque &= ~self.erase_mask
+        return opaque
+
+    def content_index(self):
+        """
+        Imagem integral dos pixels opacos para o recorte atual.
+        Só é reconstruída quando a cor-chave, a remoção de fundo ou a máscara mudam.
+        """
+        if self.source_pixels is None:
+            return None
+
+        key = self._content_key()
+        if self._content_index is None or self._content_index_key != key:
+            self._content_index = OpaqueIntegral(self.opaque_mask())
+            self._content_index_key = key
+        return self._content_index
+
+    def _content_key(self):
+        """Tudo que muda quais pixels são visíveis (a troca de imagem incrementa a versão)"""
+        return self.remove_background, color_to_rgb(self.bg_color), self.erase_mask_version
+
+    def selection_trim_boxes(self):
+        """
+        Caixa do conteúdo visível de cada seleção, em cache por retângulo
+        :return: Array (N, 4) int32 com (x, y, w, h); zeros para seleções vazias
+        """
+        key = self._content_key()
+        if self._trim_boxes_key != key:
+            self._trim_boxes = {}
+            self._trim_boxes_key = key
+
+        boxes = np.zeros((len(self.selected_rects), 4), dtype=np.int32)
+        index = None
+        for i, rect in enumerate(self.selected_rects):
+            rect = (rect.x(), rect.y(), rect.width(), rect.height())
+            box = self._trim_boxes.get(rect)
+            if box is None:
+                index = index or self.content_index()
+                if index is None:
+                    break
+                box = index.content_bounds(*rect) or (0, 0, 0, 0)
+                self._trim_boxes[rect] = box
+            boxes[i] = box
+        return boxes
+
+    def project_state(self):
+        """Seleções, alinhamentos, recorte e dados derivados para salvar em projeto"""
+        return {
+            "rects": np.array(
+                [(r.x(), r.y(), r.width(), r.height()) for r in self.selected_rects], dtype=np.int32
+            ).reshape(-1, 4),
+            "align_configs": [self.get_individual_alignment(i) for i in range(len(self.selected_rects))],
+            "alignment": self.get_alignment_config(),
+            "remove_background": self.remove_background,
+            "bg_color": color_to_rgb(self.bg_color),
+            "max_frames": self.max_frames,
+            "erase_mask": self.erase_mask,
+            "trim_boxes": self.selection_trim_boxes()
+        }
+
+    def apply_project_state(self, project, derived_valid=False):
+        """
+        Restaura um projeto sobre a imagem já carregada
+        :param project: Dicionário de src.logic.project.load_project
+        :param derived_valid: As caixas de conteúdo salvas ainda valem (mesma origem e recorte)
+        """
+        self.remove_background = project["remove_background"]
+        self.bg_color = QColor(*project["bg_color"])
+        self._alignment_config = project["alignment"]
+
+        erase_mask = project["erase_mask"]
+        if erase_mask is not None and erase_mask.shape == self.source_pixels.shape[:2]:
+            self.erase_mask = erase_mask
+            self.erase_mask_version += 1
+
+        rects = project["rects"].tolist()
+        self.selected_rects = [QRect(*rect) for rect in rects]
+        self.individual_alignment_configs = project["align_configs"]
+        self.max_frames = max(project["max_frames"], len(rects), 1)
+
+        if derived_valid:
+            self._trim_boxes = dict(zip(map(tuple, rects), map(tuple, project["trim_boxes"].tolist())))
+            self._trim_boxes_key = self._content_key()
+
+        if self.sidebar:
+            self.sidebar.sync_keying(self.remove_background, self.bg_color)
+            self.sidebar.sync_frame_limit(self.max_frames)
+        if self.remove_background or self.erase_mask is not None:
+            self._apply_removal_and_checkered()
+
+        self._selections_changed()
+        self.update_status()
+
+    def snap_rect_to_content(self, rect):
+        """
+        Encolhe a seleção até os limites do conteúdo visível
+        :param rect: QRect em escala real
+        :return: QRect ajustado ou None se a seleção estiver vazia
+        """
+        index = self.content_index()
+        if index is None:
+            return rect
+
+        bounds = index.content_bounds(rect.x(), rect.y(), rect.width(), rect.height())
+        if bounds is None:
+            print("⚠️ Seleção vazia ignorada (nenhum pixel visível).")
+            return None
+        return QRect(*bounds)
+
+    def selection_opaque_counts(self):
+        """Pixels visíveis de cada seleção, consultados na imagem integral"""
+        index = self.content_index()
+        if index is None or not self.selected_rects:
+            return np.zeros(len(self.selected_rects), dtype=np.int64)
+
+        rects = [(r.x(), r.y(), r.width(), r.height()) for r in self.selected_rects]
+        return index.counts(rects)
+
+    def add_selection(self, rect_real):
+        """Adiciona uma seleção desenhada pelo usuário, respeitando o limite de frames"""
+        if self.snap_to_content:
+            rect_real = self.snap_rect_to_content(rect_real)
+
+        if rect_real is not None and len(self.selected_rects) < self.max_frames:
+            self.selected_rects.append(rect_real)
+            while len(self.individual_alignment_configs) < len(self.selected_rects):
+                self.individual_alignment_configs.append({
+                    "horizontal": "center",
+                    "vertical": "bottom",
+                    "uniform": True
+                })
+            self._record_append("Seleção", len(self.selected_rects) - 1)
+            self._selections_changed()
+        self.update_status()
+
+    def undo_last_selection(self):
+        """Remove a última seleção"""
+        if self.selected_rects:
+            before = self.selection_snapshot()
+            self.selected_rects.pop()
+            if len(self.individual_alignment_configs) > len(self.selected_rects):
+                self.individual_alignment_configs.pop()
+            self.history.push(SelectionsCommand("Remover seleção", before, self.selection_snapshot()))
+            self.update_status()
+            self._selections_changed()
+            print("⏮️ Última seleção removida")
+
+    def undo(self):
+        """Desfaz a última operação (Ctrl+Z)"""
+        label = self.history.undo(self)
+        if label:
+            print(f"⏮️ Desfeito: {label}")
+
+    def redo(self):
+        """Refaz a última operação desfeita (Ctrl+Y / Ctrl+Shift+Z)"""
+        label = self.history.redo(self)
+        if label:
+            print(f"⏭️ Refeito: {label}")
+
+    def selection_snapshot(self, start=0):
+        """Seleções e alinhamentos a partir de `start` em colunas numpy (rects, códigos)"""
+        rects = np.array(
+            [(r.x(), r.y(), r.width(), r.height()) for r in self.selected_rects[start:]], dtype=np.int32
+        ).reshape(-1, 4)
+        aligns = encode_alignments(
+            [self.get_individual_alignment(i) for i in range(start, len(self.selected_rects))]
+        )
+        return rects, aligns
+
+    def restore_selections(self, snapshot):
+        """Substitui seleções e alinhamentos por um snapshot do histórico"""
+        self.selected_rects = []
+        self.individual_alignment_configs = []
+        self.append_selections(snapshot)
+
+    def truncate_selections(self, count):
+        """Mantém só as `count` primeiras seleções"""
+        del self.selected_rects[count:]
+        del self.individual_alignment_configs[count:]
+        self._selections_changed()
+        self.update_status()
+
+    def append_selections(self, snapshot):
+        """Acrescenta as seleções de um snapshot do histórico"""
+        rects, aligns = snapshot
+        while len(self.individual_alignment_configs) < len(self.selected_rects):
+            self.individual_alignment_configs.append(self.get_alignment_config().copy())
+        self.selected_rects.extend(QRect(*rect) for rect in rects.tolist())
+        self.individual_alignment_configs.extend(decode_alignments(aligns))
+        self._selections_changed()
+        self.update_status()
+
+    def _record_append(self, label, start):
+        self.history.push(AppendSelectionsCommand(label, start, self.selection_snapshot(start)))
+
+    def record_selections(self, label, before):
+        self.history.push(SelectionsCommand(label, before, self.selection_snapshot()))
+
+    def apply_grid_slice(self, grid_params, skip_empty=True, replace=True):
+        """
+        Gera seleções em lote a partir de uma grade regular
+        :param grid_params: Parâmetros de src.logic.grid.compute_grid
+        :param skip_empty: Ignora células sem pixels visíveis
+        :param replace: Substitui as seleções atuais
+        :return: Número de células adicionadas
+        """
+        opaque = self.opaque_mask()
+        if opaque is None:
+            return 0
+
+        rects = slice_grid(opaque, skip_empty=skip_empty, **grid_params)
+        if replace:
+            before = self.selection_snapshot()
+            self.selected_rects.clear()
+            self.individual_alignment_configs.clear()
+            self.add_rects([QRect(*rect) for rect in rects], record=False)
+            self.record_selections("Fatiar em grade", before)
+        else:
+            self.add_rects([QRect(*rect) for rect in rects])
+        return len(rects)
+
+    def add_rects(self, rects, record=True):
+        """Adiciona várias seleções de uma vez, ampliando o limite de frames se preciso"""
+        start = len(self.selected_rects)
+        self.selected_rects.extend(rects)
+        default_config = self.get_alignment_config()
+        while len(self.individual_alignment_configs) < len(self.selected_rects):
+            self.individual_alignment_configs.append(default_config.copy())
+        if record:
+            self._record_append("Seleções", start)
+
+        if len(self.selected_rects) > self.max_frames:
+            self.max_frames = len(self.selected_rects)
+            if self.sidebar:
+                self.sidebar.sync_frame_limit(self.max_frames)
+
+        self._selections_changed()
+        self.update_status()
+
+    def update_status(self):
+        if self.sidebar:
+            self.sidebar.update_status()
+
+    def get_alignment_config(self):
+        return getattr(self, "_alignment_config", {
+            "horizontal": "center",
+            "vertical": "bottom",
+            "uniform": True
+        })
+
+    def set_alignment_config(self, config):
+        before = self.selection_snapshot()
+        self._alignment_config = config
+        self.individual_alignment_configs = [
+            config.copy() for _ in self.selected_rects
+        ]
+        self.record_selections("Alinhamento", before)
+        self.update()
+
+    def get_individual_alignment(self, index):
+        if 0 <= index < len(self.individual_alignment_configs):
+            return self.individual_alignment_configs[index]
+        return self.get_alignment_config()
+
+    def set_individual_alignment(self, index, config):
+        if 0 <= index < len(self.selected_rects):
+            if index >= len(self.individual_alignment_configs):
+                self.individual_alignment_configs.extend([
+                    self.get_alignment_config() for _ in range(index - len(self.individual_alignment_configs) + 1)
+                ])
+            before = self.selection_snapshot()
+            self.individual_alignment_configs[index] = config
+            self.record_selections("Alinhamento do frame", before)
+            self.update()
+
+    def get_bg_removal_config(self):
+        return {
+            "remove_background": self.remove_background,
+            "bg_color": self.bg_color,
+            "erase_mask": self.erase_mask
+        }
+
+    def clear_selections(self):
+        before = self.selection_snapshot() if self.selected_rects else None
+        self.selected_rects.clear()
+        self.individual_alignment_configs.clear()
+        if before is not None:
+            self.record_selections("Limpar seleções", before)
+        self._selections_changed()
+        self.update_status()
+
+    def set_max_frames(self, value):
+        self.max_frames = max(1, value)
+        self.update_status()
+        self.update()
+
+
+def pixmap_nbytes(pixmap):
+    """Memória aproximada de um QPixmap (0 se não houver)"""
+    if pixmap is None or pixmap.isNull():
+        return 0
+    return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+
+def qimage_to_array(image):
+    """
+    Copia um QImage para um array numpy (H, W, 4) uint8 em ordem RGBA
+    :param image: QImage em qualquer formato
+    """
+    image = image.convertToFormat(QImage.Format_RGBA8888)
+    width, height = image.width(), image.height()
+    buffer = np.frombuffer(image.constBits(), dtype=np.uint8)
+    rows = buffer[:image.bytesPerLine() * height].reshape(height, image.bytesPerLine())
+    return rows[:, :width * 4].reshape(height, width, 4).copy()
+
+
+def array_to_qimage(pixels):
+    """
+    Cria um QImage independente a partir de um array (H, W, 4) uint8 RGBA
+    :param pixels: Array numpy contíguo
+    """
+    height, width = pixels.shape[:2]
+    pixels = np.ascontiguousarray(pixels)
+    image = QImage(pixels.data, width, height, width * 4, QImage.Format_RGBA8888)
+    return image.copy()  # Desvincula do buffer numpy
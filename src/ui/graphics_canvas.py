@@ -0,0 +1,240 @@
+# src/ui/graphics_canvas.py
+
+from PySide6.QtWidgets import (
+    QGraphicsView, QGraphicsScene, QGraphicsPixmapItem, QGraphicsRectItem, QGraphicsItem
+)
+from PySide6.QtGui import QPainter, QPixmap, QColor, QPen, QBrush
+from PySide6.QtCore import Qt, QRect, QRectF
+import time
+
+from src.ui.canvas_state import CanvasStateMixin
+from src.logic.metrics import metrics
+
+print("🗺️ [INFO] Carregando módulo: GraphicsCanvas...")
+
+
+class SelectionItem(QGraphicsRectItem):
+    """Seleção como item da cena: indexada pela árvore BSP e com renderização em cache"""
+
+    PEN = QPen(QColor(0, 255, 0, 200), 2, Qt.SolidLine)
+    BRUSH = QBrush(QColor(0, 255, 0, 50))
+    HOVER_BRUSH = QBrush(QColor(0, 255, 0, 110))
+    PEN.setCosmetic(True)  # Espessura constante em qualquer zoom
+
+    def __init__(self, rect, cache_mode=QGraphicsItem.DeviceCoordinateCache):
+        super().__init__(QRectF(rect))
+        self.setPen(self.PEN)
+        self.setBrush(self.BRUSH)
+        self.setZValue(1)
+        self.setAcceptHoverEvents(True)
+        self.setCacheMode(cache_mode)
+
+    def hoverEnterEvent(self, event):
+        self.setBrush(self.HOVER_BRUSH)
+
+    def hoverLeaveEvent(self, event):
+        self.setBrush(self.BRUSH)
+
+
+class GraphicsCanvas(QGraphicsView, CanvasStateMixin):
+    """
+    Canvas alternativo baseado em QGraphicsView.
+    O zoom é feito pela transformação da view (sem reamostrar o pixmap) e as
+    seleções são itens da cena, então só o que está visível é redesenhado.
+    """
+
+    def __init__(self, sidebar=None, parent=None):
+        super().__init__(parent)
+
+        self._init_canvas_state(sidebar)
+        self.checkered_applied = False
+        metrics.register_gauge("mem.item_cache", self._item_cache_nbytes)
+
+        # Zoom
+        self.zoom_level = 1.0
+        self.min_zoom = 0.05
+        self.max_zoom = 32.0
+
+        # Cena com índice BSP para consultas rápidas de itens visíveis/hover
+        self._scene = QGraphicsScene(self)
+        self._scene.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+        self.setScene(self._scene)
+
+        self.pixmap_item = QGraphicsPixmapItem()
+        self.pixmap_item.setTransformationMode(Qt.FastTransformation)
+        self.pixmap_item.setShapeMode(QGraphicsPixmapItem.BoundingRectShape)
+        self._scene.addItem(self.pixmap_item)
+
+        self.rubber_item = None  # Seleção em andamento
+        self.selection_start = None
+        self._selection_items = []
+        self._pan_origin = None
+
+        self.setBackgroundBrush(QColor("#1e1e1e"))
+        self.setCacheMode(QGraphicsView.CacheBackground)
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        self.setOptimizationFlags(
+            QGraphicsView.DontSavePainterState | QGraphicsView.DontAdjustForAntialiasing
+        )
+        self.setRenderHint(QPainter.SmoothPixmapTransform, False)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.setMouseTracking(True)
+        self.setFocusPolicy(Qt.StrongFocus)
+        self.setStyleSheet("border: none;")
+
+    def set_background(self, pixmap: QPixmap):
+        """Define a imagem de fundo exibida na cena"""
+        if pixmap.isNull():
+            return
+
+        self._load_source(pixmap)
+        if self.remove_background:
+            self._apply_removal_and_checkered()
+        else:
+            self.pixmap_item.setPixmap(self.background)
+        self._scene.setSceneRect(QRectF(self.background.rect()))
+
+    def _apply_removal_and_checkered(self):
+        """Remove cor de fundo e exibe a imagem sobre o xadrez translúcido"""
+        self.background = self.render_keyed_pixmap()
+        self.checkered_applied = True
+        self.pixmap_item.setPixmap(self.background)
+
+    def paintEvent(self, event):
+        start = time.perf_counter()
+        super().paintEvent(event)
+        metrics.record("paint", (time.perf_counter() - start) * 1000)
+        metrics.tick("paint")
+
+    def _item_cache_nbytes(self):
+        """Estimativa do cache por item: seleções visíveis no tamanho em pixels de tela"""
+        if self._item_cache_mode() == QGraphicsItem.NoCache:
+            return 0
+        visible = self.mapToScene(self.viewport().rect()).boundingRect()
+        area = sum(
+            item.rect().width() * item.rect().height()
+            for item in self._scene.items(visible) if isinstance(item, SelectionItem)
+        )
+        return int(area * self.zoom_level ** 2 * 4)
+
+    def _selections_changed(self):
+        """Sincroniza os itens da cena com selected_rects"""
+        items = self._selection_items
+        rects = self.selected_rects
+
+        # Só o trecho entre o prefixo e o sufixo em comum mudou (acréscimo,
+        # remoção, desfazer...): os itens fora dele ficam intocados na cena
+        common = min(len(items), len(rects))
+        start = 0
+        while start < common and items[start].rect().toRect() == rects[start]:
+            start += 1
+        end = 0
+        while end < common - start and items[-1 - end].rect().toRect() == rects[-1 - end]:
+            end += 1
+
+        old = items[start:len(items) - end]
+        new = rects[start:len(rects) - end]
+
+        # Reaproveita os itens do trecho alterado; remove ou cria só a diferença
+        for item, rect in zip(old, new):
+            item.setRect(QRectF(rect))
+        for item in old[len(new):]:
+            self._scene.removeItem(item)
+
+        cache_mode = self._item_cache_mode()
+        added = []
+        for rect in new[len(old):]:
+            item = SelectionItem(rect, cache_mode)
+            self._scene.addItem(item)
+            added.append(item)
+
+        items[start:len(items) - end] = old[:len(new)] + added
+
+    def _item_cache_mode(self):
+        """
+        Cache por item só compensa com zoom de perto (poucos itens grandes na tela);
+        afastado, milhares de pixmaps em cache custam mais que desenhar os retângulos.
+        """
+        if self.zoom_level >= 1.0:
+            return QGraphicsItem.DeviceCoordinateCache
+        return QGraphicsItem.NoCache
+
+    def _image_pos(self, event):
+        """Posição do evento em coordenadas reais da imagem"""
+        point = self.mapToScene(event.position().toPoint())
+        return int(point.x()), int(point.y())
+
+    def mousePressEvent(self, event):
+        if self.background is None:
+            return super().mousePressEvent(event)
+
+        if event.button() == Qt.LeftButton:
+            self.selection_start = self.mapToScene(event.position().toPoint())
+            pen = QPen(QColor(0, 150, 255, 200), 2, Qt.DashLine)
+            pen.setCosmetic(True)
+            self.rubber_item = self._scene.addRect(
+                QRectF(self.selection_start, self.selection_start), pen, QColor(0, 150, 255, 70)
+            )
+            self.rubber_item.setZValue(2)
+
+        elif event.button() == Qt.RightButton:
+            x, y = self._image_pos(event)
+            if self.fill_erase_mode:
+                self.erase_region_at(x, y)
+            else:
+                self.pick_color_at(x, y)
+
+        elif event.button() == Qt.MiddleButton:
+            self._pan_origin = event.position().toPoint()
+            self.setCursor(Qt.ClosedHandCursor)
+
+    def mouseMoveEvent(self, event):
+        if self.rubber_item is not None:
+            end = self.mapToScene(event.position().toPoint())
+            self.rubber_item.setRect(QRectF(self.selection_start, end).normalized())
+        elif self._pan_origin is not None:
+            delta = event.position().toPoint() - self._pan_origin
+            self._pan_origin = event.position().toPoint()
+            self.horizontalScrollBar().setValue(self.horizontalScrollBar().value() - delta.x())
+            self.verticalScrollBar().setValue(self.verticalScrollBar().value() - delta.y())
+        else:
+            super().mouseMoveEvent(event)  # Mantém o hover dos itens
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.LeftButton and self.rubber_item is not None:
+            rect_real = self.rubber_item.rect().toRect()
+            self._scene.removeItem(self.rubber_item)
+            self.rubber_item = None
+            self.selection_start = None
+            self.add_selection(QRect(rect_real))
+
+        elif event.button() == Qt.MiddleButton:
+            self._pan_origin = None
+            self.unsetCursor()
+
+    def keyPressEvent(self, event):
+        """Desfaz com Ctrl+Z e refaz com Ctrl+Y ou Ctrl+Shift+Z"""
+        if event.key() == Qt.Key_Z and event.modifiers() == Qt.ControlModifier:
+            self.undo()
+        elif (event.key() == Qt.Key_Y and event.modifiers() == Qt.ControlModifier) or (
+            event.key() == Qt.Key_Z and event.modifiers() == (Qt.ControlModifier | Qt.ShiftModifier)
+        ):
+            self.redo()
+        else:
+            super().keyPressEvent(event)
+
+    def wheelEvent(self, event):
+        """Zoom pela transformação da view (Ctrl + rolar)"""
+        if event.modifiers() == Qt.ControlModifier:
+            factor = 1.15 if event.angleDelta().y() > 0 else 1 / 1.15
+            new_zoom = min(max(self.zoom_level * factor, self.min_zoom), self.max_zoom)
+            old_cache_mode = self._item_cache_mode()
+            self.scale(new_zoom / self.zoom_level, new_zoom / self.zoom_level)
+            self.zoom_level = new_zoom
+
+            cache_mode = self._item_cache_mode()
+            if cache_mode != old_cache_mode:
+                for item in self._selection_items:
+                    item.setCacheMode(cache_mode)
+        else:
+            super().wheelEvent(event)
@@ -0,0 +1,96 @@
+# src/ui/grid_dialog.py
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QSpinBox, QComboBox,
+    QCheckBox, QPushButton, QFormLayout
+)
+
+print("🔲 [INFO] Carregando módulo: GridDialog...")
+
+
+class GridDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self.setWindowTitle("🔲 Fatiar em Grade")
+        self.setStyleSheet("background-color: #2d2d2d; color: white;")
+        self.layout = QVBoxLayout(self)
+
+        # Modo: tamanho da célula ou linhas x colunas
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItems(["Tamanho da célula", "Linhas x Colunas"])
+        self.mode_combo.currentIndexChanged.connect(self.update_mode)
+        self.layout.addWidget(self.mode_combo)
+
+        form = QFormLayout()
+        self.cell_width = self._spin(1, 32)
+        self.cell_height = self._spin(1, 32)
+        self.rows = self._spin(1, 4)
+        self.cols = self._spin(1, 4)
+        self.margin = self._spin(0, 0)
+        self.spacing = self._spin(0, 0)
+        self.offset_x = self._spin(0, 0)
+        self.offset_y = self._spin(0, 0)
+
+        form.addRow("Largura da célula:", self.cell_width)
+        form.addRow("Altura da célula:", self.cell_height)
+        form.addRow("Linhas:", self.rows)
+        form.addRow("Colunas:", self.cols)
+        form.addRow("Margem:", self.margin)
+        form.addRow("Espaçamento:", self.spacing)
+        form.addRow("Deslocamento X:", self.offset_x)
+        form.addRow("Deslocamento Y:", self.offset_y)
+        self.layout.addLayout(form)
+
+        self.skip_empty_checkbox = QCheckBox("🚫 Ignorar células vazias")
+        self.skip_empty_checkbox.setChecked(True)
+        self.layout.addWidget(self.skip_empty_checkbox)
+
+        self.replace_checkbox = QCheckBox("♻️ Substituir seleções atuais")
+        self.replace_checkbox.setChecked(True)
+        self.layout.addWidget(self.replace_checkbox)
+
+        # Botões OK / Cancelar
+        btn_layout = QHBoxLayout()
+        confirm_btn = QPushButton("✔️ Fatiar")
+        cancel_btn = QPushButton("❌ Cancelar")
+        confirm_btn.clicked.connect(self.accept)
+        cancel_btn.clicked.connect(self.reject)
+        btn_layout.addWidget(confirm_btn)
+        btn_layout.addWidget(cancel_btn)
+        self.layout.addLayout(btn_layout)
+
+        self.update_mode()
+
+    def _spin(self, minimum, value):
+        spin = QSpinBox()
+        spin.setRange(minimum, 16384)
+        spin.setValue(value)
+        return spin
+
+    def update_mode(self):
+        by_cell = self.mode_combo.currentIndex() == 0
+        self.cell_width.setEnabled(by_cell)
+        self.cell_height.setEnabled(by_cell)
+        self.rows.setEnabled(not by_cell)
+        self.cols.setEnabled(not by_cell)
+
+    def get_grid_params(self):
+        """Parâmetros no formato de src.logic.grid.compute_grid"""
+        by_cell = self.mode_combo.currentIndex() == 0
+        return {
+            "cell_width": self.cell_width.value() if by_cell else 0,
+            "cell_height": self.cell_height.value() if by_cell else 0,
+            "rows": 0 if by_cell else self.rows.value(),
+            "cols": 0 if by_cell else self.cols.value(),
+            "margin": self.margin.value(),
+            "spacing": self.spacing.value(),
+            "offset_x": self.offset_x.value(),
+            "offset_y": self.offset_y.value()
+        }
+
+    def skip_empty(self):
+        return self.skip_empty_checkbox.isChecked()
+
+    def replace_selections(self):
+        return self.replace_checkbox.isChecked()
@@ -0,0 +1,209 @@
+# src/ui/interaction_replay.py
+
+from PySide6.QtWidgets import QApplication, QAbstractScrollArea
+from PySide6.QtGui import QMouseEvent, QWheelEvent, QKeyEvent
+from PySide6.QtCore import QObject, QEvent, QPointF, QPoint, Qt
+import json
+import time
+import logging
+import numpy as np
+
+print("⏺️ [INFO] Carregando módulo: InteractionReplay...")
+
+SESSION_VERSION = 1
+
+_MOUSE_EVENTS = {
+    QEvent.MouseButtonPress: "press",
+    QEvent.MouseMove: "move",
+    QEvent.MouseButtonRelease: "release",
+}
+_EVENT_TYPES = {name: kind for kind, name in _MOUSE_EVENTS.items()}
+
+
+def _input_widget(canvas):
+    """Widget que recebe mouse e roda: o viewport no QGraphicsView, o próprio canvas no QWidget"""
+    return canvas.viewport() if isinstance(canvas, QAbstractScrollArea) else canvas
+
+
+class InteractionRecorder(QObject):
+    """
+    Grava os eventos de entrada do canvas num arquivo JSONL: uma linha de
+    cabeçalho (backend e tamanho da janela) seguida de um evento por linha
+    """
+
+    def __init__(self, canvas, path, window=None):
+        super().__init__(canvas)
+        self.canvas = canvas
+        self.path = path
+        self._file = open(path, "w", encoding="utf-8")
+        self._start = time.perf_counter()
+        self.count = 0
+
+        size = window.size() if window is not None else canvas.size()
+        self._write({
+            "type": "session",
+            "version": SESSION_VERSION,
+            "backend": "graphics" if isinstance(canvas, QAbstractScrollArea) else "widget",
+            "window": [size.width(), size.height()]
+        })
+
+        _input_widget(canvas).installEventFilter(self)
+        canvas.installEventFilter(self)  # Teclas chegam ao próprio canvas
+
+    def _write(self, record):
+        self._file.write(json.dumps(record) + "\n")
+
+    def eventFilter(self, obj, event):
+        kind = event.type()
+        record = None
+        if kind in _MOUSE_EVENTS and obj is _input_widget(self.canvas):
+            pos = event.position()
+            record = {
+                "type": _MOUSE_EVENTS[kind],
+                "x": pos.x(), "y": pos.y(),
+                "button": event.button().value,
+                "buttons": event.buttons().value,
+                "modifiers": event.modifiers().value
+            }
+        elif kind == QEvent.Wheel and obj is _input_widget(self.canvas):
+            pos = event.position()
+            record = {
+                "type": "wheel",
+                "x": pos.x(), "y": pos.y(),
+                "delta": event.angleDelta().y(),
+                "modifiers": event.modifiers().value
+            }
+        elif kind == QEvent.KeyPress and obj is self.canvas:
+            record = {"type": "key", "key": event.key(), "modifiers": event.modifiers().value}
+
+        if record is not None:
+            record["t"] = round(time.perf_counter() - self._start, 4)
+            self._write(record)
+            self.count += 1
+        return False  # Nunca consome o evento
+
+    def stop(self):
+        _input_widget(self.canvas).removeEventFilter(self)
+        self.canvas.removeEventFilter(self)
+        self._file.close()
+        logging.info(f"⏺️ {self.count} eventos gravados em: {self.path}")
+
+
+def load_session(path):
+    """:return: (cabeçalho, lista de eventos)"""
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    if not records or records[0].get("type") != "session":
+        raise ValueError("Arquivo de sessão sem cabeçalho.")
+    return records[0], records[1:]
+
+
+def synthetic_session(width, height, drags=50, zooms=20, picks=5, seed=0):
+    """
+    Sessão sintética para quando não há gravação: arrastos de seleção,
+    zoom com Ctrl+roda e cliques direitos (cor-chave), em coordenadas do canvas
+    """
+    rng = np.random.default_rng(seed)
+    left, right, ctrl = Qt.LeftButton.value, Qt.RightButton.value, Qt.ControlModifier.value
+    events = []
+    for _ in range(drags):
+        x0, y0 = rng.uniform(0, width * 0.8), rng.uniform(0, height * 0.8)
+        x1, y1 = x0 + rng.uniform(8, width * 0.2), y0 + rng.uniform(8, height * 0.2)
+        events.append({"type": "press", "x": x0, "y": y0, "button": left, "buttons": left, "modifiers": 0})
+        for step in np.linspace(0, 1, 10)[1:]:
+            events.append({"type": "move", "x": x0 + (x1 - x0) * step, "y": y0 + (y1 - y0) * step,
+                           "button": 0, "buttons": left, "modifiers": 0})
+        events.append({"type": "release", "x": x1, "y": y1, "button": left, "buttons": 0, "modifiers": 0})
+    for i in range(zooms):
+        events.append({"type": "wheel", "x": width / 4, "y": height / 4,
+                       "delta": 120 if i % 2 == 0 else -120, "modifiers": ctrl})
+    for _ in range(picks):
+        x, y = rng.uniform(0, width / 2), rng.uniform(0, height / 2)
+        events.append({"type": "press", "x": x, "y": y, "button": right, "buttons": right, "modifiers": 0})
+        events.append({"type": "release", "x": x, "y": y, "button": right, "buttons": 0, "modifiers": 0})
+    events.append({"type": "key", "key": Qt.Key_Z.value, "modifiers": ctrl})
+    return events
+
+
+def write_synthetic_sheet(path, width, height, cell=32):
+    """Gera uma spritesheet grande de teste: sprites coloridos sobre fundo verde sólido"""
+    from PIL import Image
+
+    yy, xx = np.mgrid[:height, :width]
+    pixels = np.zeros((height, width, 4), dtype=np.uint8)
+    pixels[...] = (0, 255, 0, 255)
+    inside = (xx % cell >= cell // 4) & (xx % cell < cell - cell // 4) & (yy % cell >= cell // 8)
+    pixels[inside, 0] = (xx[inside] * 7) % 256
+    pixels[inside, 1] = 40
+    pixels[inside, 2] = (yy[inside] * 5) % 256
+    Image.fromarray(pixels, "RGBA").save(path)
+    return path
+
+
+def _build_event(record):
+    modifiers = Qt.KeyboardModifier(record.get("modifiers", 0))
+    if record["type"] == "key":
+        return QKeyEvent(QEvent.KeyPress, record["key"], modifiers)
+
+    pos = QPointF(record["x"], record["y"])
+    if record["type"] == "wheel":
+        return QWheelEvent(
+            pos, pos, QPoint(), QPoint(0, record["delta"]),
+            Qt.MouseButton(0), modifiers, Qt.NoScrollPhase, False
+        )
+    return QMouseEvent(
+        _EVENT_TYPES[record["type"]], pos, pos,
+        Qt.MouseButton(record["button"]), Qt.MouseButton(record["buttons"]), modifiers
+    )
+
+
+def replay_session(canvas, events):
+    """
+    Reproduz os eventos no canvas, medindo cada um separadamente
+    :return: Lista de (tipo, handler_ms, paint_ms); paint_ms é o tempo para
+             processar as repinturas pendentes que o evento agendou
+    """
+    app = QApplication.instance()
+    mouse_target = _input_widget(canvas)
+    app.processEvents()
+
+    timings = []
+    for record in events:
+        event = _build_event(record)
+        target = canvas if record["type"] == "key" else mouse_target
+
+        start = time.perf_counter()
+        app.sendEvent(target, event)
+        handled = time.perf_counter()
+        app.processEvents()  # Executa o paintEvent agendado por update()
+        painted = time.perf_counter()
+
+        timings.append((record["type"], (handled - start) * 1000, (painted - handled) * 1000))
+    return timings
+
+
+def summarize(timings):
+    """
+    Percentis por tipo de evento e no total
+    :return: Dicionário tipo -> {count, handler_p50, handler_p95, paint_p95, total_p95, total_max}
+    """
+    groups = {}
+    for kind, handler, paint in timings:
+        groups.setdefault(kind, []).append((handler, paint))
+    groups["all"] = [(h, p) for _, h, p in timings]
+
+    summary = {}
+    for kind, values in groups.items():
+        if not values:
+            continue
+        data = np.array(values)
+        total = data.sum(axis=1)
+        summary[kind] = {
+            "count": len(values),
+            "handler_p50": round(float(np.percentile(data[:, 0], 50)), 2),
+            "handler_p95": round(float(np.percentile(data[:, 0], 95)), 2),
+            "paint_p95": round(float(np.percentile(data[:, 1], 95)), 2),
+            "total_p95": round(float(np.percentile(total, 95)), 2),
+            "total_max": round(float(total.max()), 2)
+        }
+    return summary
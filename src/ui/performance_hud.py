@@ -0,0 +1,109 @@
+# src/ui/performance_hud.py
+
+from PySide6.QtWidgets import QWidget
+from PySide6.QtGui import QPainter, QColor, QFont, QFontMetrics
+from PySide6.QtCore import Qt, QTimer
+
+from src.logic.metrics import metrics
+
+print("📊 [INFO] Carregando módulo: PerformanceHud...")
+
+# Etapas exibidas (nome no registro, rótulo)
+_STAGES = (
+    ("keying", "Keying"),
+    ("flood_fill", "Apagar região"),
+    ("export.frames", "Frames"),
+    ("export", "Exportação"),
+    ("export.compose", "  montagem"),
+    ("export.save", "  gravação"),
+)
+
+_MEMORY = (
+    ("mem.source", "Imagem (numpy)"),
+    ("mem.background", "Pixmap exibido"),
+    ("mem.scaled", "Pixmap com zoom"),
+    ("mem.item_cache", "Cache de itens"),
+    ("mem.erase_mask", "Máscara apagada"),
+    ("mem.content_index", "Imagem integral"),
+    ("mem.history", "Histórico"),
+)
+
+
+def _format_ms(value):
+    return "—" if value is None else f"{value:.1f} ms"
+
+
+def _format_mb(value):
+    return f"{value / (1024 * 1024):.1f} MB"
+
+
+class PerformanceHud(QWidget):
+    """
+    Painel sobreposto ao canvas com tempos de pintura, FPS, etapas e memória.
+    Enquanto está oculto o registro de métricas fica desativado e o timer parado.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        # Opaco: atualizar o HUD não força repintar o canvas embaixo (nem infla o FPS)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.hud_font = QFont("Monospace", 9)
+        self.hud_font.setStyleHint(QFont.TypeWriter)
+        self.lines = []
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(250)
+        self.timer.timeout.connect(self.refresh)
+        self.hide()
+
+    def toggle(self):
+        self.setVisible(not self.isVisible())
+
+    def showEvent(self, event):
+        metrics.enabled = True
+        self.timer.start()
+        self.refresh()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        metrics.enabled = False
+        metrics.clear_samples()
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        lines = [
+            f"Pintura   média {_format_ms(metrics.average('paint'))}  última {_format_ms(metrics.last('paint'))}",
+            f"FPS       {metrics.rate('paint'):.0f}",
+            ""
+        ]
+        lines += [f"{label:<16}{_format_ms(metrics.last(name))}" for name, label in _STAGES]
+        lines.append("")
+
+        gauges = metrics.gauges()
+        total = 0
+        for name, label in _MEMORY:
+            value = gauges.get(name)
+            if value:
+                total += value
+                lines.append(f"{label:<16}{_format_mb(value)}")
+        lines.append(f"{'Memória total':<16}{_format_mb(total)}")
+        self.lines = lines
+
+        fm = QFontMetrics(self.hud_font)
+        width = max(fm.horizontalAdvance(line) for line in lines) + 16
+        self.setGeometry(8, 8, width, fm.height() * len(lines) + 12)
+        self.raise_()
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(20, 20, 20))
+        painter.setPen(QColor(120, 255, 120))
+        painter.setFont(self.hud_font)
+
+        fm = painter.fontMetrics()
+        for i, line in enumerate(self.lines):
+            painter.drawText(8, 6 + fm.ascent() + i * fm.height(), line)
+        painter.end()
@@ -2,7 +2,7 @@
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QSpinBox, QPushButton,
-    QCheckBox, QColorDialog, QHBoxLayout
+    QCheckBox, QColorDialog, QHBoxLayout, QComboBox
 )
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont, QColor
@@ -73,16 +73,64 @@ class Sidebar(QWidget):
         self.bg_color_button.clicked.connect(self.choose_bg_color)
         self.bg_color_button.setStyleSheet("background-color: green;")
         self.bg_color = QColor(Qt.GlobalColor.green)
+        self.auto_bg_button = QPushButton("🪄")
+        self.auto_bg_button.setFixedSize(30, 25)
+        self.auto_bg_button.setToolTip("Detectar cor de fundo automaticamente")
+        self.auto_bg_button.clicked.connect(self.auto_detect_bg_color)
         remove_bg_layout.addWidget(self.remove_bg_checkbox)
         remove_bg_layout.addWidget(self.bg_color_button)
+        remove_bg_layout.addWidget(self.auto_bg_button)
         layout.addLayout(remove_bg_layout)
 
+        # Apagar por preenchimento (clique direito)
+        self.fill_erase_checkbox = QCheckBox("🪣 Apagar Região")
+        self.fill_erase_checkbox.setStyleSheet("color: white;")
+        self.fill_erase_checkbox.setToolTip("Clique direito apaga só a área contígua ao pixel")
+        self.fill_erase_checkbox.toggled.connect(self.toggle_fill_erase)
+        layout.addWidget(self.fill_erase_checkbox)
+
+        fill_options_layout = QHBoxLayout()
+        tolerance_label = QLabel("Tol.:")
+        tolerance_label.setStyleSheet("color: white;")
+        self.spin_tolerance = QSpinBox()
+        self.spin_tolerance.setRange(0, 255)
+        self.spin_tolerance.valueChanged.connect(self.on_fill_tolerance_changed)
+        self.apply_style(self.spin_tolerance)
+        self.connectivity_combo = QComboBox()
+        self.connectivity_combo.addItems(["4", "8"])
+        self.connectivity_combo.setToolTip("Conectividade (vizinhos)")
+        self.connectivity_combo.currentTextChanged.connect(self.on_fill_connectivity_changed)
+        self.apply_style(self.connectivity_combo)
+        fill_options_layout.addWidget(tolerance_label)
+        fill_options_layout.addWidget(self.spin_tolerance)
+        fill_options_layout.addWidget(self.connectivity_combo)
+        layout.addLayout(fill_options_layout)
+
+        restore_button = QPushButton("🧽 Restaurar Regiões")
+        restore_button.clicked.connect(self.restore_erased_regions)
+        self.apply_style(restore_button)
+        layout.addWidget(restore_button)
+
+        # Ajuste da seleção ao conteúdo
+        self.snap_checkbox = QCheckBox("🎯 Ajustar ao Conteúdo")
+        self.snap_checkbox.setStyleSheet("color: white;")
+        self.snap_checkbox.setToolTip("Remove as margens transparentes de cada nova seleção")
+        self.snap_checkbox.setChecked(True)
+        self.snap_checkbox.toggled.connect(self.toggle_snap_to_content)
+        layout.addWidget(self.snap_checkbox)
+
         # Botão alinhamento
         align_button = QPushButton("🧱 Ajustar Alinhamento")
         align_button.clicked.connect(self.open_alignment_dialog)
         self.apply_style(align_button)
         layout.addWidget(align_button)
 
+        # Botão fatiar em grade
+        grid_button = QPushButton("🔲 Fatiar em Grade")
+        grid_button.clicked.connect(self.open_grid_dialog)
+        self.apply_style(grid_button)
+        layout.addWidget(grid_button)
+
         # Botão limpar seleção
         clear_button = QPushButton("🗑 Limpar Seleção")
         clear_button.clicked.connect(self.clear_selections)
@@ -102,8 +150,30 @@ class Sidebar(QWidget):
     def toggle_remove_bg(self, checked):
         print(f"🧼 [AÇÃO] Remover fundo {'ativado' if checked else 'desativado'}")
         if self.canvas:
-            self.canvas.remove_background = checked
-            self.canvas.update()
+            self.canvas.set_remove_background(checked)
+
+    def toggle_snap_to_content(self, checked):
+        print(f"🎯 [AÇÃO] Ajuste ao conteúdo {'ativado' if checked else 'desativado'}")
+        if self.canvas:
+            self.canvas.snap_to_content = checked
+
+    def toggle_fill_erase(self, checked):
+        print(f"🪣 [AÇÃO] Apagar região {'ativado' if checked else 'desativado'}")
+        if self.canvas:
+            self.canvas.fill_erase_mode = checked
+
+    def on_fill_tolerance_changed(self, value):
+        if self.canvas:
+            self.canvas.fill_tolerance = value
+
+    def on_fill_connectivity_changed(self, text):
+        if self.canvas:
+            self.canvas.fill_connectivity = int(text)
+
+    def restore_erased_regions(self):
+        print("🧽 Restaurando regiões apagadas...")
+        if self.canvas:
+            self.canvas.clear_erase_mask()
 
     def choose_bg_color(self):
         color = QColorDialog.getColor(self.bg_color, self, "Escolha a cor do fundo")
@@ -111,10 +181,25 @@ class Sidebar(QWidget):
             self.bg_color = color
             self.bg_color_button.setStyleSheet(f"background-color: {color.name()};")
             if self.canvas:
-                self.canvas.bg_color = color
-                self.canvas.update()
+                self.canvas.set_bg_color(color)
             print(f"🌈 Cor do fundo definida: {color.name()}")
 
+    def auto_detect_bg_color(self):
+        print("🪄 [AÇÃO] Detectando cor de fundo...")
+        if not self.canvas:
+            return
+
+        candidates = self.canvas.auto_detect_bg_color()
+        if not candidates:
+            print("⚠️ Nenhuma cor de fundo detectada.")
+            return
+
+        proposals = ", ".join(
+            f"{QColor(*rgb).name()} ({fraction:.0%})" for rgb, fraction in candidates
+        )
+        self.auto_bg_button.setToolTip(f"Cores propostas: {proposals}")
+        print(f"🪄 Cores propostas: {proposals}")
+
     def update_bg_button_color(self, color):
         self.bg_color = color
         self.bg_color_button.setStyleSheet(f"background-color: {color.name()};")
@@ -123,12 +208,26 @@ class Sidebar(QWidget):
             self.canvas.update()
         print(f"🎨 Cor atualizada via clique na imagem: {color.name()}")
 
+    def sync_keying(self, remove_background, color):
+        """Reflete nos controles o recorte restaurado de um projeto"""
+        self.remove_bg_checkbox.blockSignals(True)
+        self.remove_bg_checkbox.setChecked(remove_background)
+        self.remove_bg_checkbox.blockSignals(False)
+        self.bg_color = color
+        self.bg_color_button.setStyleSheet(f"background-color: {color.name()};")
+
     def on_frame_count_changed(self, value):
         print(f"🔢 Número de frames alterado para: {value}")
         if self.canvas:
             self.canvas.set_max_frames(value)
         self.update_status()
 
+    def sync_frame_limit(self, value):
+        """Ajusta o campo de frames quando o Canvas amplia o limite sozinho"""
+        if value > self.spin_frames.maximum():
+            self.spin_frames.setMaximum(value)
+        self.spin_frames.setValue(value)
+
     def update_status(self):
         total = len(self.canvas.selected_rects) if self.canvas else 0
         max_frames = self.spin_frames.value()
@@ -146,8 +245,10 @@ class Sidebar(QWidget):
             self.canvas.show_info("Nenhum frame foi selecionado.")
             return
 
+        before = self.canvas.selection_snapshot()
         dialog = AlignmentDialog(self.canvas)
         if dialog.exec():
+            self.canvas.record_selections("Alinhamento individual", before)
             all_configs = dialog.get_all_configs()
             for i, config in enumerate(all_configs):
                 if i < len(self.canvas.selected_rects):
@@ -155,3 +256,21 @@ class Sidebar(QWidget):
                     # Guarda a configuração no Canvas ou em outro lugar se necessário
             self.canvas.update()
             print("✅ Alinhamento individual aplicado aos frames")
+
+    def open_grid_dialog(self):
+        from .grid_dialog import GridDialog
+        if not self.canvas or not self.canvas.background:
+            print("⚠️ Nenhuma imagem carregada para fatiar.")
+            return
+
+        dialog = GridDialog(self)
+        if dialog.exec():
+            try:
+                count = self.canvas.apply_grid_slice(
+                    dialog.get_grid_params(),
+                    skip_empty=dialog.skip_empty(),
+                    replace=dialog.replace_selections()
+                )
+                print(f"🔲 Grade aplicada: {count} frames gerados")
+            except ValueError as e:
+                print(f"⚠️ {e}")